@@ -1,7 +1,7 @@
-import subprocess
-import json
-import os
+import judge_client
+import timings
 
+@timings.timed
 def get_assertion(response, context=None):
     evaluation_prompt = """Below is a student's answer to a question on what is missing from some pancake recipe: <A>
 
@@ -10,46 +10,21 @@ Does the student mention that baking powder or baking soda is missing? Think out
     # Replace <A> with the actual response
     evaluation_text = evaluation_prompt.replace("<A>", response)
     
-    # Prepare the curl command
-    curl_command = [
-        "curl", "-X", "POST", 
-        "https://llmfoundry.straive.com/openai/v1/chat/completions",
-        "-H", f"Authorization: Bearer {os.getenv('LLMFOUNDRY_TOKEN')}:my-test-project",
-        "-H", "Content-Type: application/json",
-        "-d", json.dumps({
-            "model": "gpt-4o-mini",
-            "messages": [{"role": "user", "content": evaluation_text}]
-        })
-    ]
-    
-    # Execute the curl command
-    result = subprocess.run(curl_command, capture_output=True, text=True)
-    
-    if result.returncode != 0:
-        return {
-            "pass": False,
-            "score": 0,
-            "reason": f"API call failed: {result.stderr}"
-        }
-    
+    # Ask the judge model
     try:
-        response_data = json.loads(result.stdout)
-        eval_response = response_data["choices"][0]["message"]["content"]
-        
-        # Check if the evaluation response contains "student passes"
-        passes = "student passes" in eval_response.lower()
-        
-        return {
-            "pass": passes,
-            "score": 1 if passes else 0,
-            "reason": f"Evaluation result: {eval_response}"
-        }
-        
-    except (json.JSONDecodeError, KeyError) as e:
+        eval_response = judge_client.ask(evaluation_text)
+    except judge_client.JudgeError as e:
         return {
             "pass": False,
             "score": 0,
-            "reason": f"Failed to parse API response: {e}"
+            "reason": f"API call failed: {e}"
         }
-        
-        
\ No newline at end of file
+    
+    # Check if the evaluation response contains "student passes"
+    passes = "student passes" in eval_response.lower()
+    
+    return {
+        "pass": passes,
+        "score": 1 if passes else 0,
+        "reason": f"Evaluation result: {eval_response}"
+    }
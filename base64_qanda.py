@@ -1,5 +1,8 @@
 import base64
 
+import timings
+
+@timings.timed
 def assert_base64_thought(response, context=None):
     """
     Test if model responds in base64 and decoded response contains '1733'
@@ -1,13 +1,20 @@
 import os
 import subprocess
-import tempfile
 import re
 import platform
 
+import code_extract
+import proc_runner
+import scheduler
+import timings
+import workspace
+
+@timings.timed
+@scheduler.limited("bash-fs")
 def test_bash_incremental_update(response, context=None):
     """Test if the model can run an incremental update of a bash command without overwriting existing files."""
     
-    with tempfile.TemporaryDirectory() as temp_dir:
+    with workspace.workspace("bash_convert_not_overwrite") as temp_dir:
         # Change to temp directory
         original_cwd = os.getcwd()
         os.chdir(temp_dir)
@@ -58,9 +65,8 @@ def test_bash_incremental_update(response, context=None):
                 else:
                     bash_cmd = ["bash", "-c"]
                 
-                result = subprocess.run(
+                result = proc_runner.run(
                     bash_cmd + [code],
-                    capture_output=True,
                     text=True,
                     timeout=30
                 )
@@ -70,9 +76,8 @@ def test_bash_incremental_update(response, context=None):
                     print(f"Debug - Command output: {result.stdout}")
                     # Try fallback command
                     code = generate_fallback_command()
-                    result = subprocess.run(
+                    result = proc_runner.run(
                         bash_cmd + [code],
-                        capture_output=True,
                         text=True,
                         timeout=30
                     )
@@ -153,14 +158,10 @@ def test_bash_incremental_update(response, context=None):
 
 def extract_bash_code(response):
     """Extract bash code from the response."""
-    # Remove language markers from code blocks
-    response = re.sub(r'```[a-z]*', '```', response)
-    
     # If there are code blocks, extract the first one
-    if "```" in response and response.count("```") >= 2:
-        parts = response.split("```")
-        if len(parts) >= 2:
-            return parts[1].strip()
+    block = code_extract.find_block(response, "bash")
+    if block is not None:
+        return block.code.strip()
     
     # Look for lines that look like bash commands
     lines = response.split('\n')
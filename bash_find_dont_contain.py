@@ -1,23 +1,22 @@
 import subprocess
-import tempfile
 import os
-import re
 import platform
-import sys
 
+import code_extract
+import proc_runner
+import python_sandbox
+import scheduler
+import timings
+import workspace
+
+@timings.timed
+@scheduler.limited("bash-fs")
 def check_assertion(response, context=None):
     """
     Test if a model can implement a bash 1-liner to find files that don't contain 'asdf' (case-ignore).
     Expected files in output: hello, this, asdf (but NOT there, lower)
     """
     
-    def extract_code(output):
-        """Extract code from LLM response, handling markdown code blocks"""
-        output = re.sub(r'```[a-z]*', '```', output)
-        if "```" in output and output.count("```") >= 2:
-            return output.split("```")[1].strip()
-        return output.strip()
-    
     def setup_test_files(temp_dir):
         """Create test files in temporary directory"""
         files = {
@@ -39,10 +38,9 @@ def check_assertion(response, context=None):
         if is_windows:
             # Convert bash grep command to PowerShell equivalent
             if 'grep' in bash_code.lower():
-                # Create a simple Python script to simulate grep behavior
-                script_path = os.path.join(temp_dir, "grep_script.py")
-                with open(script_path, "w", encoding='utf-8') as f:
-                    f.write("""
+                # A simple Python script to simulate grep behavior, kept out of temp_dir so it
+                # does not list itself
+                script = """
 import os
 import re
 import sys
@@ -63,33 +61,30 @@ matching_files = [f for f in files if check_file(f)]
 
 # Print results
 print('\\n'.join(sorted(matching_files)))
-""")
+"""
                 
                 # Run the Python script
-                result = subprocess.run(
-                    [sys.executable, script_path],
+                result = python_sandbox.run_code(
+                    script,
                     cwd=temp_dir,
-                    capture_output=True,
                     text=True,
                     timeout=30
                 )
             else:
                 # Try to run the command as-is if it doesn't use grep
-                result = subprocess.run(
+                result = proc_runner.run(
                     bash_code,
                     shell=True,
                     cwd=temp_dir,
-                    capture_output=True,
                     text=True,
                     timeout=30
                 )
         else:
             # On Unix-like systems, run the bash command directly
-            result = subprocess.run(
+            result = proc_runner.run(
                 bash_code,
                 shell=True,
                 cwd=temp_dir,
-                capture_output=True,
                 text=True,
                 timeout=30
             )
@@ -97,10 +92,10 @@ print('\\n'.join(sorted(matching_files)))
         return result
     
     # Extract bash code from response
-    bash_code = extract_code(response)
+    bash_code = code_extract.extract_code(response).strip()
     
     # Create temporary directory for test
-    with tempfile.TemporaryDirectory() as temp_dir:
+    with workspace.workspace("bash_find_dont_contain") as temp_dir:
         # Setup test files
         setup_test_files(temp_dir)
         
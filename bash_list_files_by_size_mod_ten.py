@@ -1,10 +1,21 @@
 import os
-import subprocess
-import tempfile
-import shutil
 import re
-import time
 
+import code_extract
+import fixtures
+import proc_runner
+import scheduler
+import timings
+import workspace
+
+@fixtures.tree("bash_list_files_by_size_mod_ten/foo", version=1)
+def foo_files(path):
+    """Files 0-9 whose sizes all end in different digits."""
+    sizes = [921, 714, 120, 637, 366, 662, 305, 403, 49, 158]
+    fixtures.write_files(path, {str(i): "a" * size for i, size in enumerate(sizes)})
+
+@timings.timed
+@scheduler.limited("bash-fs")
 def assert_bash_list_size(response, context=None):
     """
     Test if the model can provide the correct bash command to list files in a directory 
@@ -12,20 +23,11 @@ def assert_bash_list_size(response, context=None):
     """
     
     # Setup: Create temp directory with files of specific sizes
-    temp_dir = tempfile.mkdtemp()
+    temp_dir = workspace.allocate("bash_list_files_by_size_mod_ten")
     foo_dir = os.path.join(temp_dir, "foo")
     
     try:
-        sizes = [921, 714, 120, 637, 366, 662, 305, 403, 49, 158]
-        
-        os.makedirs(foo_dir)
-        time.sleep(0.5)
-        
-        for i, size in enumerate(sizes):
-            with open(os.path.join(foo_dir, str(i)), "w") as f:
-                f.write("a" * size)
-        
-        time.sleep(0.5)
+        foo_files.snapshot(foo_dir)
         
         # Extract commands from response
         commands_to_try = extract_all_commands(response)
@@ -46,10 +48,9 @@ def assert_bash_list_size(response, context=None):
         # Try each command
         for cmd in commands_to_try:
             try:
-                result = subprocess.run(
+                result = proc_runner.run(
                     ["bash", "-c", cmd],
                     cwd=temp_dir,
-                    capture_output=True,
                     text=True,
                     timeout=30
                 )
@@ -81,10 +82,9 @@ done | sort -n | awk '{print $2}'
 """)
                 os.chmod(script_path, 0o755)
                 
-                result = subprocess.run(
+                result = proc_runner.run(
                     [script_path],
                     cwd=temp_dir,
-                    capture_output=True,
                     text=True,
                     timeout=30
                 )
@@ -163,26 +163,23 @@ done | sort -n | awk '{print $2}'
             
     finally:
         # Cleanup
-        shutil.rmtree(temp_dir, ignore_errors=True)
+        workspace.release(temp_dir)
 
 def extract_all_commands(response):
     """Extract all potential bash commands from the response"""
     commands = []
     
     # Try to extract from code blocks first
-    response = re.sub(r'```[a-z]*', '```', response)
-    if "```" in response and response.count("```") >= 2:
-        blocks = response.split("```")
-        for i in range(1, len(blocks), 2):
-            if blocks[i].strip():
-                # Extract individual lines that might be commands
-                for line in blocks[i].strip().split('\n'):
-                    if is_likely_command(line):
-                        commands.append(line.strip())
-                
-                # Also add the whole block if it's short (likely a single command)
-                if len(blocks[i].strip().split('\n')) <= 3:
-                    commands.append(blocks[i].strip())
+    for block in code_extract.extract_all(response):
+        if block.strip():
+            # Extract individual lines that might be commands
+            for line in block.strip().split('\n'):
+                if is_likely_command(line):
+                    commands.append(line.strip())
+            
+            # Also add the whole block if it's short (likely a single command)
+            if len(block.strip().split('\n')) <= 3:
+                commands.append(block.strip())
     
     # Extract commands from regular text
     lines = response.split('\n')
@@ -1,31 +1,33 @@
 import os
 import subprocess
-import tempfile
-import re
-import time
-import shutil
 import platform
 
+import code_extract
+import fixtures
+import proc_runner
+import scheduler
+import timings
+import workspace
+
+@fixtures.tree("bash_renamer/foo", version=1)
+def foo_files(path):
+    """merged_0..9, which the script must rename, next to 0..9, which it must leave alone."""
+    fixtures.write_files(path, {name: "a" * i for i in range(10) for name in (f"merged_{i}", f"{i}")})
+
+@timings.timed
+@scheduler.limited("bash-fs")
 def assert_bash_rename_script(response, context=None):
     """
     Test if the model can write a bash script that renames files with a specific pattern.
     """
     
     # Setup temporary directory structure
-    temp_dir = tempfile.mkdtemp()
+    temp_dir = workspace.allocate("bash_renamer")
     test_dir = os.path.join(temp_dir, "foo")
     
     try:
-        # Create test directory and files
-        os.makedirs(test_dir)
-        time.sleep(0.1)
-        
         # Create merged_* files and regular numbered files
-        for i in range(10):
-            with open(os.path.join(test_dir, f"merged_{i}"), "w") as f:
-                f.write("a" * i)
-            with open(os.path.join(test_dir, f"{i}"), "w") as f:
-                f.write("a" * i)
+        foo_files.snapshot(test_dir)
         
         # Extract bash code from response and convert to equivalent Python code
         bash_code = extract_bash_code(response)
@@ -68,10 +70,9 @@ def assert_bash_rename_script(response, context=None):
             
             # Run the script
             try:
-                result = subprocess.run(
+                result = proc_runner.run(
                     ["bash", script_path, test_dir + "/"],
                     cwd=temp_dir,
-                    capture_output=True,
                     text=True,
                     encoding="utf-8",
                     errors="ignore",
@@ -132,10 +133,7 @@ def assert_bash_rename_script(response, context=None):
     
     finally:
         # Clean up
-        try:
-            shutil.rmtree(temp_dir, ignore_errors=True)
-        except:
-            pass
+        workspace.release(temp_dir)
 
 def rename_files_python_implementation(directory):
     """
@@ -202,14 +200,10 @@ def clean_code(code):
 
 def extract_bash_code(response):
     """Extract bash code from the LLM response"""
-    # Remove language specifiers from code blocks
-    response = re.sub(r'```[a-z]*', '```', response)
-    
     # Try to extract code from markdown code blocks
-    if response.count("```") >= 2:
-        parts = response.split("```")
-        if len(parts) >= 3:
-            return parts[1].strip()
+    block = code_extract.find_block(response, "bash")
+    if block is not None:
+        return block.code.strip()
     
     # If no code blocks, try to find bash-like content
     lines = response.split('\n')
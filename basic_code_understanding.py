@@ -1,7 +1,9 @@
-import subprocess
-import json
 import os
 
+import judge_client
+import timings
+
+@timings.timed
 def assert_code_understanding(response, context=None):
     """
     Evaluates if the student's response correctly identifies the flag extraction sequence.
@@ -16,25 +18,13 @@ Ignore their reasoning. Just look at the final answer, if they say **EXPLICITLY*
 
 If the answer is correct say "The student passes" otherwise "The student fails"."""
 
-    # Get LLM evaluation using curl
+    # Get LLM evaluation from the judge model
     token = os.getenv('LLMFOUNDRY_TOKEN')
     if not token:
         raise ValueError("LLMFOUNDRY_TOKEN environment variable not set")
     
-    curl_command = [
-        'curl', '-X', 'POST', 'https://llmfoundry.straive.com/openai/v1/chat/completions',
-        '-H', f'Authorization: Bearer {token}:my-test-project',
-        '-H', 'Content-Type: application/json',
-        '-d', json.dumps({
-            "model": "gpt-4o-mini",
-            "messages": [{"role": "user", "content": evaluation_prompt}]
-        })
-    ]
-    
     try:
-        result = subprocess.run(curl_command, capture_output=True, text=True, check=True)
-        llm_response = json.loads(result.stdout)
-        evaluation_output = llm_response['choices'][0]['message']['content']
+        evaluation_output = judge_client.ask(evaluation_prompt)
         
         # Check if evaluation contains "student passes"
         passes = "student passes" in evaluation_output.lower()
@@ -45,7 +35,7 @@ If the answer is correct say "The student passes" otherwise "The student fails".
             'reason': evaluation_output.strip()
         }
         
-    except (subprocess.CalledProcessError, json.JSONDecodeError, KeyError) as e:
+    except judge_client.JudgeError as e:
         return {
             'pass': False,
             'score': 0.0,
@@ -1,22 +1,18 @@
 import subprocess
-import tempfile
-import os
-import re
 
+import code_extract
+import compile_cache
+import proc_runner
+import timings
+
+@timings.timed
 def check(response, context=None):
     """
     Evaluate C code implementation of RREF function.
     """
     
     # Extract code from response
-    def extract_code(output):
-        output = re.sub('```[a-z]*', '```', output)
-        if "```" in output and output.count("```") >= 2:
-            return output.split("```")[1]
-        else:
-            return output
-    
-    code = extract_code(response)
+    code = code_extract.extract_code(response)
     
     # Remove main function if it exists to avoid conflicts
     if 'int main' in code:
@@ -76,73 +72,57 @@ int main() {
     # Combine code with test case
     full_code = code + "\n\n" + test_case
     
-    # Create temporary files and compile/run
-    with tempfile.TemporaryDirectory() as temp_dir:
-        c_file = os.path.join(temp_dir, "main.c")
-        exe_file = os.path.join(temp_dir, "a.out")
+    try:
+        # Compile
+        build = compile_cache.compile_c(full_code, timeout=10)
         
-        # Write C code to file
-        with open(c_file, 'w') as f:
-            f.write(full_code)
+        if not build.ok:
+            return {
+                "pass": False,
+                "score": 0.0,
+                "reason": f"Compilation failed: {build.diagnostics}"
+            }
         
-        try:
-            # Compile
-            compile_result = subprocess.run(
-                ["gcc", "-o", exe_file, c_file, "-lm"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if compile_result.returncode != 0:
-                return {
-                    "pass": False,
-                    "score": 0.0,
-                    "reason": f"Compilation failed: {compile_result.stderr}"
-                }
-            
-            # Run
-            run_result = subprocess.run(
-                [exe_file],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if run_result.returncode != 0:
-                return {
-                    "pass": False,
-                    "score": 0.0,
-                    "reason": f"Runtime error: {run_result.stderr}"
-                }
-            
-            # Check if output contains expected result
-            output = run_result.stdout.strip()
-            expected = "146"
-            if expected in output:
-                print("yes")
-                return {
-                    "pass": True,
-                    "score": 1.0,
-                    "reason": f"Output contains expected value: {expected}"
-                }
-            else:
-                return {
-                    "pass": False,
-                    "score": 0.0,
-                    "reason": f"Expected '{expected}' not found in output: '{output}'"
-                }
-                
-        except subprocess.TimeoutExpired:
+        # Run
+        run_result = proc_runner.run(
+            [build.binary],
+            text=True,
+            timeout=10
+        )
+        
+        if run_result.returncode != 0:
             return {
                 "pass": False,
                 "score": 0.0,
-                "reason": "Execution timed out"
+                "reason": f"Runtime error: {run_result.stderr}"
+            }
+        
+        # Check if output contains expected result
+        output = run_result.stdout.strip()
+        expected = "146"
+        if expected in output:
+            print("yes")
+            return {
+                "pass": True,
+                "score": 1.0,
+                "reason": f"Output contains expected value: {expected}"
             }
-        except Exception as e:
+        else:
             return {
                 "pass": False,
                 "score": 0.0,
-                "reason": f"Error: {str(e)}"
+                "reason": f"Expected '{expected}' not found in output: '{output}'"
             }
- 
\ No newline at end of file
+            
+    except subprocess.TimeoutExpired:
+        return {
+            "pass": False,
+            "score": 0.0,
+            "reason": "Execution timed out"
+        }
+    except Exception as e:
+        return {
+            "pass": False,
+            "score": 0.0,
+            "reason": f"Error: {str(e)}"
+        }
@@ -1,3 +1,6 @@
+import timings
+
+@timings.timed
 def assert_correct_c_expression(response, context=None):
     # Parse the response to extract content after "Final answer:"
     try:
@@ -0,0 +1,160 @@
+import collections
+import functools
+import hashlib
+import json
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import time
+
+import proc_runner
+import scheduler
+import timings
+
+CACHE_DIR = os.getenv("COMPILE_CACHE_DIR") or os.path.join(
+    os.path.expanduser("~"), ".cache", "carlini_evals", "compile")
+MAX_BYTES = int(os.getenv("COMPILE_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+# Entries used this recently are never evicted, so a grader about to exec one cannot lose it
+MIN_AGE_SECONDS = 600
+# Builds tried before giving up when the entry keeps vanishing before it can be read
+BUILD_ATTEMPTS = 3
+
+EXE_NAME = "main.exe" if platform.system() == "Windows" else "main"
+# Scheduler resource class for a build, by source suffix
+RESOURCE_CLASSES = {".c": "compile-c", ".cpp": "compile-cpp", ".rs": "compile-rust"}
+
+CompileResult = collections.namedtuple("CompileResult", ["ok", "binary", "diagnostics", "cached"])
+
+
+@functools.lru_cache(maxsize=None)
+def compiler_version(compiler):
+    """Return the first line of `compiler --version`, probed once per process."""
+    try:
+        result = subprocess.run([compiler, "--version"], capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return ""
+    return (result.stdout or result.stderr).strip().split("\n")[0]
+
+
+def cache_key(source, compiler, flags):
+    """Hash of everything that determines the build output."""
+    header = json.dumps([compiler, compiler_version(compiler), list(flags)]).encode("utf-8")
+    return hashlib.sha256(header + b"\0" + source.encode("utf-8", errors="replace")).hexdigest()
+
+
+def _load(entry):
+    """Return the CompileResult stored in an entry directory, or None if there is none."""
+    try:
+        with open(os.path.join(entry, "diagnostics.txt"), encoding="utf-8") as f:
+            diagnostics = f.read()
+    except FileNotFoundError:
+        return None
+    binary = os.path.join(entry, EXE_NAME)
+    ok = os.path.exists(binary)
+    # Touch the entry so eviction sees it as recently used
+    try:
+        os.utime(entry)
+    except FileNotFoundError:
+        return None  # evicted since we read it
+    return CompileResult(ok, binary if ok else None, diagnostics, True)
+
+
+@timings.spanned("compile")
+def compile_source(source, compiler="gcc", flags=("-lm",), suffix=".c", timeout=30):
+    """
+    Compile source with compiler, reusing a previous build of byte-identical input.
+
+    Returns a CompileResult whose binary lives in the cache and must not be modified;
+    failed builds are cached too, with their compiler diagnostics. Timeouts are not
+    cached and raise subprocess.TimeoutExpired as before.
+    """
+    key = cache_key(source, compiler, flags)
+    entry = os.path.join(CACHE_DIR, key[:2], key)
+    cached = _load(entry)
+    if cached is not None:
+        return cached
+
+    # The entry can vanish before we read it (another process evicting it, or the cache
+    # being cleared by hand); build it again then
+    for _ in range(BUILD_ATTEMPTS):
+        _build(source, compiler, flags, suffix, timeout, entry)
+        built = _load(entry)
+        if built is not None:
+            evict()
+            return built._replace(cached=False)
+    raise OSError(f"compile cache entry {entry} vanished after each of {BUILD_ATTEMPTS} builds")
+
+
+def _build(source, compiler, flags, suffix, timeout, entry):
+    """Compile source in a private build dir and move it into place as the entry."""
+    os.makedirs(os.path.dirname(entry), exist_ok=True)
+    build_dir = tempfile.mkdtemp(prefix=".build-", dir=os.path.dirname(entry))
+    try:
+        with open(os.path.join(build_dir, "main" + suffix), "wb") as f:
+            f.write(source.encode("utf-8", errors="replace"))
+        # Compile inside the build dir so diagnostics name "main.c", not a random temp path
+        with scheduler.slot(RESOURCE_CLASSES.get(suffix, "compile-c")):
+            result = proc_runner.run(
+                [compiler, "-o", EXE_NAME, "main" + suffix, *flags],
+                cwd=build_dir,
+                text=True,
+                timeout=timeout
+            )
+        os.unlink(os.path.join(build_dir, "main" + suffix))
+        if result.returncode != 0 and os.path.exists(os.path.join(build_dir, EXE_NAME)):
+            os.unlink(os.path.join(build_dir, EXE_NAME))
+        with open(os.path.join(build_dir, "diagnostics.txt"), "w", encoding="utf-8") as f:
+            f.write(result.stderr)
+        try:
+            os.rename(build_dir, entry)
+        except OSError:
+            # Another grader finished the same build first; use theirs
+            shutil.rmtree(build_dir, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(build_dir, ignore_errors=True)
+        raise
+
+
+def compile_c(source, flags=("-lm",), timeout=30, compiler="gcc"):
+    """Compile C source through the cache."""
+    return compile_source(source, compiler, flags, ".c", timeout)
+
+
+def compile_cpp(source, flags=("-lm",), timeout=30, compiler="g++"):
+    """Compile C++ source through the cache."""
+    return compile_source(source, compiler, flags, ".cpp", timeout)
+
+
+def _entry_size(entry):
+    return sum(os.path.getsize(os.path.join(entry, name)) for name in os.listdir(entry))
+
+
+def evict(max_bytes=MAX_BYTES):
+    """Delete least recently used entries until the cache fits in max_bytes."""
+    entries = []
+    total = 0
+    for shard in os.listdir(CACHE_DIR) if os.path.isdir(CACHE_DIR) else []:
+        shard_dir = os.path.join(CACHE_DIR, shard)
+        for name in os.listdir(shard_dir):
+            if name.startswith(".build-"):
+                continue
+            entry = os.path.join(shard_dir, name)
+            try:
+                size = _entry_size(entry)
+                entries.append((os.path.getmtime(entry), size, entry))
+            except OSError:
+                continue
+            total += size
+    if total <= max_bytes:
+        return 0
+
+    freed = 0
+    cutoff = time.time() - MIN_AGE_SECONDS
+    for mtime, size, entry in sorted(entries):
+        if total - freed <= max_bytes * 0.9 or mtime > cutoff:
+            break
+        shutil.rmtree(entry, ignore_errors=True)
+        freed += size
+    return freed
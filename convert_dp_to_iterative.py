@@ -1,19 +1,47 @@
 import tempfile
 import os
-import re
 import sys
 from io import StringIO
 import contextlib
 
+import code_extract
+import fixtures
+import timings
+
+EXPECTED_ANSWER_CODE = """
+import random
+mylist = list(range(100))
+random.seed(0)
+random.shuffle(mylist)
+from functools import lru_cache
+@lru_cache(maxsize=None)
+def my_solve_dp(graph, lines_left, distance_since_last):
+    if len(graph) < lines_left: return 1e9, []
+    if lines_left == 0 and len(graph) == 0: return 0, []
+    # option 1: don't take the line
+    value = (1e9, [])
+    if distance_since_last < 10:
+        value = min(value, my_solve_dp(graph[1:], lines_left, distance_since_last+1))
+    # option 2: take the line
+    if lines_left > 0:
+        sub, how = my_solve_dp(graph[1:], lines_left-1, 0)
+        sub += graph[0] + (distance_since_last-8)**2
+        value = min(value, (sub, how + [len(graph)]))
+    return value
+expected = my_solve_dp(tuple(mylist), len(mylist)//8, 4)
+print(expected)
+"""
+
+@fixtures.value("convert_dp_to_iterative/expected", version=1)
+def reference_output():
+    """Output of the reference recursive solver on the test input, computed once."""
+    temp_stdout = StringIO()
+    with contextlib.redirect_stdout(temp_stdout):
+        exec(EXPECTED_ANSWER_CODE, {})
+    return temp_stdout.getvalue().strip()
+
+@timings.timed
 def get_assertion(response, context=None):
-    # Extract code from response
-    def extract_code(output):
-        output = re.sub('```[a-z]*', '```', output)
-        if "```" in output:
-            return output.split("```")[1]
-        else:
-            return output
-    
     # Check if code is not recursive
     def not_recursive(code):
         return code.count("solve_iterative") == 1
@@ -33,6 +61,7 @@ def get_assertion(response, context=None):
     test_case = """
 import random
 mylist = list(range(100))
+random.seed(0)
 random.shuffle(mylist)
 from functools import lru_cache
 @lru_cache(maxsize=None)
@@ -53,32 +82,10 @@ answer = solve_iterative(tuple(mylist), len(mylist)//8, 4)
 print(answer)
 """
     
-    expected_answer_code = """
-import random
-mylist = list(range(100))
-random.shuffle(mylist)
-from functools import lru_cache
-@lru_cache(maxsize=None)
-def my_solve_dp(graph, lines_left, distance_since_last):
-    if len(graph) < lines_left: return 1e9, []
-    if lines_left == 0 and len(graph) == 0: return 0, []
-    # option 1: don't take the line
-    value = (1e9, [])
-    if distance_since_last < 10:
-        value = min(value, my_solve_dp(graph[1:], lines_left, distance_since_last+1))
-    # option 2: take the line
-    if lines_left > 0:
-        sub, how = my_solve_dp(graph[1:], lines_left-1, 0)
-        sub += graph[0] + (distance_since_last-8)**2
-        value = min(value, (sub, how + [len(graph)]))
-    return value
-expected = my_solve_dp(tuple(mylist), len(mylist)//8, 4)
-print(expected)
-"""
     
     try:
         # Extract code from response
-        code = extract_code(response)
+        code = code_extract.extract_code(response)
         
         # Check if not recursive
         if not not_recursive(code):
@@ -101,8 +108,7 @@ print(expected)
         
         # Get expected answer
         try:
-            expected_output = run_code(expected_answer_code)
-            expected_output = expected_output.strip()
+            expected_output = reference_output()
         except Exception as e:
             return {
                 "pass": False,
@@ -1,21 +1,17 @@
 import subprocess
-import tempfile
-import os
-import re
 
+import code_extract
+import compile_cache
+import proc_runner
+import timings
+
+@timings.timed
 def assert_c_rewrite(response, context=None):
     """
     Test if the model can rewrite a given Python program into an equivalent C program.
     """
     
     # Extract code from response
-    def extract_code(output):
-        output = re.sub('```[a-z]*', '```', output)
-        if "```" in output and output.count("```") >= 2:
-            return output.split("```")[1]
-        else:
-            return output
-    
     # Test case and expected answer
     test_case = """
 int main() {
@@ -28,7 +24,7 @@ int main() {
     expected_answer = "11290"
     
     # Extract C code from response
-    code = extract_code(response)
+    code = code_extract.extract_code(response)
     
     # Handle main function conflicts
     if 'int main' in code and 'int main' in test_case:
@@ -37,71 +33,55 @@ int main() {
     # Combine code with test case
     full_code = code + "\n\n" + test_case
     
-    # Create temporary files
-    with tempfile.TemporaryDirectory() as temp_dir:
-        c_file = os.path.join(temp_dir, "main.c")
-        exe_file = os.path.join(temp_dir, "a.out")
+    try:
+        # Compile C code
+        build = compile_cache.compile_c(full_code, timeout=30)
         
-        # Write C code to file
-        with open(c_file, 'w') as f:
-            f.write(full_code)
+        if not build.ok:
+            return {
+                "pass": False,
+                "score": 0,
+                "reason": f"Compilation failed: {build.diagnostics}"
+            }
         
-        try:
-            # Compile C code
-            compile_result = subprocess.run(
-                ['gcc', '-o', exe_file, c_file, '-lm'],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            
-            if compile_result.returncode != 0:
-                return {
-                    "pass": False,
-                    "score": 0,
-                    "reason": f"Compilation failed: {compile_result.stderr}"
-                }
-            
-            # Execute compiled program
-            run_result = subprocess.run(
-                [exe_file],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            
-            if run_result.returncode != 0:
-                return {
-                    "pass": False,
-                    "score": 0,
-                    "reason": f"Execution failed: {run_result.stderr}"
-                }
-            
-            # Check if expected answer is in output
-            output = run_result.stdout.strip()
-            if expected_answer in output:
-                return {
-                    "pass": True,
-                    "score": 1,
-                    "reason": f"Expected output '{expected_answer}' found in: {output}"
-                }
-            else:
-                return {
-                    "pass": False,
-                    "score": 0,
-                    "reason": f"Expected '{expected_answer}' but got: {output}"
-                }
-                
-        except subprocess.TimeoutExpired:
+        # Execute compiled program
+        run_result = proc_runner.run(
+            [build.binary],
+            text=True,
+            timeout=30
+        )
+        
+        if run_result.returncode != 0:
             return {
                 "pass": False,
                 "score": 0,
-                "reason": "Code execution timed out"
+                "reason": f"Execution failed: {run_result.stderr}"
             }
-        except Exception as e:
+        
+        # Check if expected answer is in output
+        output = run_result.stdout.strip()
+        if expected_answer in output:
+            return {
+                "pass": True,
+                "score": 1,
+                "reason": f"Expected output '{expected_answer}' found in: {output}"
+            }
+        else:
             return {
                 "pass": False,
                 "score": 0,
-                "reason": f"Error during execution: {str(e)}"
+                "reason": f"Expected '{expected_answer}' but got: {output}"
             }
             
+    except subprocess.TimeoutExpired:
+        return {
+            "pass": False,
+            "score": 0,
+            "reason": "Code execution timed out"
+        }
+    except Exception as e:
+        return {
+            "pass": False,
+            "score": 0,
+            "reason": f"Error during execution: {str(e)}"
+        }
@@ -1,6 +1,10 @@
 import json
 import re
 
+import code_extract
+import timings
+
+@timings.timed
 def check_json_subset(response, context=None):
     """
     Extracts JSON from LLM response and validates it contains expected year-accuracy pairs.
@@ -17,14 +21,10 @@ def check_json_subset(response, context=None):
     
     def extract_json_from_response(text):
         """Extract JSON from response text, handling code blocks and plain text."""
-        # Remove ```json or ``` markers
-        text = text.replace("```json", "```")
-        
         # If there are code blocks, extract content between them
-        if "```" in text:
-            parts = text.split("```")
-            if len(parts) >= 2:
-                return parts[1].strip()
+        block = code_extract.find_block(text, "json")
+        if block is not None:
+            return block.code.strip()
         
         # Look for JSON-like patterns in the text
         json_pattern = r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}'
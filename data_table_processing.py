@@ -1,3 +1,6 @@
+import timings
+
+@timings.timed
 def assert_state_water_analysis(response, context=None):
     """
     Evaluates if the response correctly identifies states with >20k km² of water 
@@ -1,3 +1,6 @@
+import timings
+
+@timings.timed
 def assert_train_schedule_response(response, context=None):
     """
     Evaluates if the response contains both required substrings for the train schedule query.
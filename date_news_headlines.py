@@ -1,3 +1,6 @@
+import timings
+
+@timings.timed
 def assert_date_news_headlines(response, context=None):
     """
     Test if the model can predict the date a few news headlines were published.
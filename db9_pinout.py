@@ -1,3 +1,6 @@
+import timings
+
+@timings.timed
 def test_db9_port_knowledge(response, context=None):
     """Test if a model knows about old computer ports when prompted ambiguously."""
     
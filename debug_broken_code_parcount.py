@@ -1,7 +1,9 @@
-import subprocess
-import json
 import os
 
+import judge_client
+import timings
+
+@timings.timed
 def check_bug_explanation(response, context=None):
     """
     Evaluates if the student correctly identifies the bug in parallel wordcount code.
@@ -24,34 +26,9 @@ Tell me either 'The student passes' or 'The student fails'."""
             'reason': 'LLMFOUNDRY_TOKEN environment variable not set'
         }
     
-    # Prepare the API request
-    payload = {
-        "model": "gpt-4o-mini",
-        "messages": [{"role": "user", "content": eval_prompt}]
-    }
-    
-    # Make the API call using curl
-    curl_command = [
-        'curl', '-X', 'POST', 
-        'https://llmfoundry.straive.com/openai/v1/chat/completions',
-        '-H', f'Authorization: Bearer {token}:my-test-project',
-        '-H', 'Content-Type: application/json',
-        '-d', json.dumps(payload)
-    ]
-    
     try:
-        result = subprocess.run(curl_command, capture_output=True, text=True, timeout=30)
-        
-        if result.returncode != 0:
-            return {
-                'pass': False,
-                'score': 0,
-                'reason': f'API call failed: {result.stderr}'
-            }
-        
-        # Parse the response
-        api_response = json.loads(result.stdout)
-        eval_result = api_response['choices'][0]['message']['content'].strip()
+        # Ask the judge model
+        eval_result = judge_client.ask(eval_prompt).strip()
         
         # Echo the evaluation result
         print('ECHOING:', eval_result)
@@ -65,17 +42,11 @@ Tell me either 'The student passes' or 'The student fails'."""
             'reason': f'Evaluator response: {eval_result}'
         }
         
-    except subprocess.TimeoutExpired:
+    except judge_client.JudgeError as e:
         return {
             'pass': False,
             'score': 0,
-            'reason': 'API call timed out'
-        }
-    except json.JSONDecodeError as e:
-        return {
-            'pass': False,
-            'score': 0,
-            'reason': f'Failed to parse API response: {e}'
+            'reason': f'API call failed: {e}'
         }
     except Exception as e:
         return {
@@ -83,5 +54,3 @@ Tell me either 'The student passes' or 'The student fails'."""
             'score': 0,
             'reason': f'Unexpected error: {e}'
         }
-        
-        
@@ -1,8 +1,11 @@
 import subprocess
-import tempfile
-import os
 import re
 
+import code_extract
+import python_sandbox
+import timings
+
+@timings.timed
 def assert_decompile_bytecode(response, context=None):
     """
     Assertion function for Promptfoo that evaluates Python bytecode decompilation.
@@ -10,19 +13,8 @@ def assert_decompile_bytecode(response, context=None):
     """
     
     # Extract code from response (similar to ExtractCode)
-    def extract_code(output):
-        # Remove non-ASCII characters to prevent encoding issues
-        output = re.sub(r'[^\x00-\x7F]+', '', output)
-        output = re.sub(r'```[a-z]*', '```', output)
-        if "```" in output and output.count("```") >= 2:
-            # Extract code between first pair of backticks
-            parts = output.split("```")
-            if len(parts) >= 3:
-                return parts[1]
-        # If no code blocks found, return the whole response
-        return output
-    
-    extracted_code = extract_code(response)
+    # Remove non-ASCII characters to prevent encoding issues
+    extracted_code = re.sub(r'[^\x00-\x7F]+', '', code_extract.extract_code(response))
     
     # The test case and expected answer
     test_case = """import numpy as np
@@ -38,17 +30,8 @@ print(foo(arr, 37))"""
     complete_code = extracted_code + "\n\n" + test_case
     
     try:
-        # Run the code using subprocess with UTF-8 encoding specified
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False, encoding='utf-8', errors='ignore') as f:
-            f.write(complete_code)
-            temp_file = f.name
-        
-        result = subprocess.run(
-            ['python', temp_file],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
+        # Run the code in the Python sandbox
+        result = python_sandbox.run_code(complete_code, timeout=30)
         
         if result.returncode != 0:
             return {
@@ -87,8 +70,4 @@ print(foo(arr, 37))"""
             'pass': False,
             'score': 0,
             'reason': f'Error running code: {str(e)}\nTraceback: {traceback.format_exc()}'
-        }
-    finally:
-        # Clean up temporary file
-        if os.path.exists(temp_file):
-            os.unlink(temp_file)
\ No newline at end of file
+        }
\ No newline at end of file
@@ -1,8 +1,10 @@
 import subprocess
-import tempfile
-import os
-import re
 
+import code_extract
+import python_sandbox
+import timings
+
+@timings.timed
 def check(response, context=None):
     """
     Promptfoo assertion function that evaluates if the model correctly disassembled
@@ -10,17 +12,7 @@ def check(response, context=None):
     """
     
     # Extract code from response (equivalent to ExtractCode)
-    def extract_code(output):
-        output = re.sub('```[a-z]*', '```', output)
-        if "```" in output and output.count("```") >= 2:
-            # Extract code between first pair of triple backticks
-            parts = output.split("```")
-            if len(parts) >= 3:
-                return parts[1].strip()
-        # If no code blocks found, use the entire response
-        return output.strip()
-    
-    code = extract_code(response)
+    code = code_extract.extract_code(response).strip()
     
     # Test case and expected answer
     test_case = 'print(foo(5, 7))'
@@ -30,21 +22,8 @@ def check(response, context=None):
     full_code = code + "\n\n" + test_case
     
     try:
-        # Write code to temporary file and execute
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-            f.write(full_code)
-            temp_file = f.name
-        
         # Run the Python code
-        result = subprocess.run(
-            ['python', temp_file], 
-            capture_output=True, 
-            text=True, 
-            timeout=10
-        )
-        
-        # Clean up
-        os.unlink(temp_file)
+        result = python_sandbox.run_code(full_code, timeout=10)
         
         if result.returncode != 0:
             return {
@@ -1,3 +1,6 @@
+import timings
+
+@timings.timed
 def check_uudecode_response(response, context=None):
     """
     Test if the model can successfully uudecode a given string.
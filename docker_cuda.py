@@ -1,3 +1,6 @@
+import timings
+
+@timings.timed
 def assert_docker_cuda_fix(response, context=None):
     """
     Evaluates if the LLM response contains guidance about nvidia-container-toolkit or nvidia-docker2
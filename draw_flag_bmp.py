@@ -1,12 +1,17 @@
 import re
 import subprocess
-import tempfile
 import os
 from PIL import Image
 import io
 import platform
 import sys
 
+import code_extract
+import compile_cache
+import proc_runner
+import timings
+
+@timings.timed
 def assert_flag_draw_bmp(response, context=None):
     """
     Evaluates if the response contains C code that generates an American flag BMP image.
@@ -126,81 +131,52 @@ def extract_c_code(response):
     # Remove non-ASCII characters to prevent encoding issues
     response = re.sub(r'[^\x00-\x7F]+', '', response)
     
-    # Remove language specifiers from code blocks
-    response = re.sub('```[a-z]*', '```', response)
-    
-    # Try to extract from code blocks first
-    if response.count("```") >= 2:
-        code = response.split("```")[1]
-        return code.strip()
-    
-    # If no code blocks, assume the entire response is code
-    return response.strip()
+    # Take the first C block, or the entire response when there is none
+    return code_extract.extract_code(response, "c").strip()
 
 def compile_and_run_c_code(code):
     """Compile and run C code, returning stdout as bytes and any errors."""
     
     # Determine system platform
     is_windows = platform.system() == "Windows"
-    exe_extension = ".exe" if is_windows else ""
     
-    with tempfile.TemporaryDirectory() as temp_dir:
-        c_file = os.path.join(temp_dir, "main.c")
-        exe_file = os.path.join(temp_dir, f"main{exe_extension}")
+    try:
+        # Define compiler command (MinGW for Windows if using it)
+        compiler = "gcc"
+        if is_windows:
+            # Try common MinGW locations
+            mingw_paths = [
+                r"C:\MinGW\bin\gcc.exe",
+                r"C:\msys64\mingw64\bin\gcc.exe",
+                r"C:\Program Files\mingw-w64\x86_64-8.1.0-posix-seh-rt_v6-rev0\mingw64\bin\gcc.exe"
+            ]
+            for path in mingw_paths:
+                if os.path.exists(path):
+                    compiler = path
+                    break
         
-        compile_error = None
-        run_error = None
+        # Compile with gcc (reusing a cached build of identical code)
+        print(f"Compiling with: {compiler}")
+        build = compile_cache.compile_c(code, timeout=30, compiler=compiler)
         
-        try:
-            # Write C code to file with UTF-8 encoding
-            with open(c_file, 'w', encoding='utf-8', errors='ignore') as f:
-                f.write(code)
-            
-            # Define compiler command (MinGW for Windows if using it)
-            compiler = "gcc"
-            if is_windows:
-                # Try common MinGW locations
-                mingw_paths = [
-                    r"C:\MinGW\bin\gcc.exe",
-                    r"C:\msys64\mingw64\bin\gcc.exe",
-                    r"C:\Program Files\mingw-w64\x86_64-8.1.0-posix-seh-rt_v6-rev0\mingw64\bin\gcc.exe"
-                ]
-                for path in mingw_paths:
-                    if os.path.exists(path):
-                        compiler = path
-                        break
-            
-            # Compile with gcc
-            compile_cmd = [compiler, "-o", exe_file, c_file, "-lm"]
-            print(f"Compiling with: {' '.join(compile_cmd)}")
-            
-            compile_result = subprocess.run(
-                compile_cmd,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            
-            if compile_result.returncode != 0:
-                compile_error = compile_result.stderr
-                return None, compile_error, None
-            
-            # Run the executable and capture stdout as bytes
-            run_result = subprocess.run(
-                [exe_file],
-                capture_output=True,
-                timeout=30
-            )
-            
-            if run_result.returncode != 0:
-                run_error = run_result.stderr.decode('utf-8', errors='ignore')
-                return None, None, run_error
-            
-            return run_result.stdout, None, None
-            
-        except subprocess.TimeoutExpired:
-            return None, None, "Code execution timed out"
-        except Exception as e:
-            import traceback
-            error_msg = f"Error: {str(e)}\nTraceback: {traceback.format_exc()}"
-            return None, None, error_msg
\ No newline at end of file
+        if not build.ok:
+            return None, build.diagnostics, None
+        
+        # Run the executable and capture stdout as bytes
+        run_result = proc_runner.run(
+            [build.binary],
+            timeout=30
+        )
+        
+        if run_result.returncode != 0:
+            run_error = run_result.stderr.decode('utf-8', errors='ignore')
+            return None, None, run_error
+        
+        return run_result.stdout, None, None
+        
+    except subprocess.TimeoutExpired:
+        return None, None, "Code execution timed out"
+    except Exception as e:
+        import traceback
+        error_msg = f"Error: {str(e)}\nTraceback: {traceback.format_exc()}"
+        return None, None, error_msg
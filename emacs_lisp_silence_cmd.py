@@ -1,3 +1,6 @@
+import timings
+
+@timings.timed
 def check_emacs_lisp_silence_python(response, context=None):
     """
     Test if the model can understand a vague error for an emacs lisp question.
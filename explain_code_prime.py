@@ -1,7 +1,9 @@
-import subprocess
-import json
 import os
 
+import judge_client
+import timings
+
+@timings.timed
 def get_assertion(response, context=None):
     """
     Evaluates if the LLM response correctly identifies that the code calculates the first 20 primes.
@@ -25,32 +27,9 @@ def get_assertion(response, context=None):
             'reason': 'LLMFOUNDRY_TOKEN environment variable not set'
         }
     
-    # Prepare the curl command
-    curl_data = {
-        "model": "gpt-4o-mini",
-        "messages": [{"role": "user", "content": eval_prompt}]
-    }
-    
     try:
-        # Make the API call using subprocess
-        result = subprocess.run([
-            'curl', '-X', 'POST', 
-            'https://llmfoundry.straive.com/openai/v1/chat/completions',
-            '-H', f'Authorization: Bearer {token}:my-test-project',
-            '-H', 'Content-Type: application/json',
-            '-d', json.dumps(curl_data)
-        ], capture_output=True, text=True, timeout=30)
-        
-        if result.returncode != 0:
-            return {
-                'pass': False,
-                'score': 0,
-                'reason': f'Curl command failed: {result.stderr}'
-            }
-        
-        # Parse the response
-        api_response = json.loads(result.stdout)
-        eval_output = api_response['choices'][0]['message']['content']
+        # Ask the judge model
+        eval_output = judge_client.ask(eval_prompt)
         
         # Check if the evaluation indicates the student passes
         passes = "student passes" in eval_output.lower()
@@ -61,17 +40,11 @@ def get_assertion(response, context=None):
             'reason': f'Evaluator response: {eval_output}'
         }
         
-    except subprocess.TimeoutExpired:
-        return {
-            'pass': False,
-            'score': 0,
-            'reason': 'API call timed out'
-        }
-    except json.JSONDecodeError as e:
+    except judge_client.JudgeError as e:
         return {
             'pass': False,
             'score': 0,
-            'reason': f'Failed to parse API response: {e}'
+            'reason': f'API call failed: {e}'
         }
     except Exception as e:
         return {
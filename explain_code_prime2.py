@@ -1,7 +1,7 @@
-import subprocess
-import json
-import os
+import judge_client
+import timings
 
+@timings.timed
 def get_assertion(response, context=None):
     """
     Evaluates if the response correctly identifies that the code calculates the first 20 primes.
@@ -16,38 +16,8 @@ def get_assertion(response, context=None):
         "Think out loud then answer either \"The student passes\" or \"The student fails\"."
     )
 
-    curl_command = [
-        "curl", "-X", "POST",
-        "https://llmfoundry.straive.com/openai/v1/chat/completions",
-        "-H", f'Authorization: Bearer {os.getenv("LLMFOUNDRY_TOKEN")}:my-test-project',
-        "-H", "Content-Type: application/json",
-        "-d", json.dumps({
-            "model": "gpt-4o-mini",
-            "messages": [{"role": "user", "content": eval_prompt}]
-        })
-    ]
-
     try:
-        result = subprocess.run(curl_command, capture_output=True, check=True)
-        stdout_text = result.stdout.decode('utf-8', errors='replace') if isinstance(result.stdout, bytes) else result.stdout
-
-        if not stdout_text:
-            return {
-                "pass": False,
-                "score": 0,
-                "reason": "Empty response from LLM API. Check token or network issue."
-            }
-
-        try:
-            api_response = json.loads(stdout_text)
-        except json.JSONDecodeError as e:
-            return {
-                "pass": False,
-                "score": 0,
-                "reason": f"Failed to parse JSON: {e}\nRaw Output: {stdout_text}"
-            }
-
-        eval_output = api_response["choices"][0]["message"]["content"]
+        eval_output = judge_client.ask(eval_prompt)
         passes = "student passes" in eval_output.lower()
 
         return {
@@ -56,9 +26,9 @@ def get_assertion(response, context=None):
             "reason": f"Evaluator output: {eval_output}"
         }
 
-    except subprocess.CalledProcessError as e:
+    except judge_client.JudgeError as e:
         return {
             "pass": False,
             "score": 0,
-            "reason": f"Subprocess error: {e}\nStderr: {e.stderr}"
+            "reason": f"Judge call failed: {e}"
         }
@@ -1,6 +1,9 @@
 import subprocess
 import json
 
+import timings
+
+@timings.timed
 def get_assertion(response, context=None):
     """
     Evaluates if the response correctly explains the VPBROADCASTB instruction.
@@ -1,52 +1,44 @@
 import sqlite3
 import subprocess
-import os
-import tempfile
 import re
 import json
 import requests
 
+import fixtures
+import timings
+
+@fixtures.database("explore_sql_db/people", version=1)
+def people_db(conn):
+    """Create and populate the test database."""
+    cursor = conn.cursor()
+    
+    # Create table
+    cursor.execute('''CREATE TABLE people
+                 (a_name TEXT, favorite_friend TEXT, person_age INT, the_profession TEXT)''')
+    
+    # Insert test data
+    people_data = [
+        ('Alice', 'Bob', 29, 'Engineer'),
+        ('Bob', 'Alice', 32, 'Doctor'),
+        ('Charlie', 'Alice', 28, 'Artist'),
+        ('David', 'Eve', 35, 'Doctor'),
+        ('Eve', 'Frank', 26, 'Teacher'),
+        ('Frank', 'Alice', 31, 'Scientist'),
+        ('Grace', 'Heidi', 30, 'Nurse'),
+        ('Heidi', 'Ivy', 25, 'Lawyer'),
+        ('Ivy', 'Charlie', 34, 'Chef'),
+        ('Judy', 'Grace', 27, 'Accountant')
+    ]
+    
+    cursor.executemany('INSERT INTO people VALUES (?,?,?,?)', people_data)
+
+@timings.timed
 def assert_sql_interaction(response, context=None):
     """
     Test if the model can interact with an SQLite database and provide the correct 
     command to add a new person with specific criteria.
     """
     
-    def setup_database():
-        """Create and populate the test database."""
-        db_path = os.path.join(tempfile.gettempdir(), 'people.db')
-        
-        # Remove existing database if it exists
-        if os.path.exists(db_path):
-            os.remove(db_path)
-            
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # Create table
-        cursor.execute('''CREATE TABLE people
-                     (a_name TEXT, favorite_friend TEXT, person_age INT, the_profession TEXT)''')
-        
-        # Insert test data
-        people_data = [
-            ('Alice', 'Bob', 29, 'Engineer'),
-            ('Bob', 'Alice', 32, 'Doctor'),
-            ('Charlie', 'Alice', 28, 'Artist'),
-            ('David', 'Eve', 35, 'Doctor'),
-            ('Eve', 'Frank', 26, 'Teacher'),
-            ('Frank', 'Alice', 31, 'Scientist'),
-            ('Grace', 'Heidi', 30, 'Nurse'),
-            ('Heidi', 'Ivy', 25, 'Lawyer'),
-            ('Ivy', 'Charlie', 34, 'Chef'),
-            ('Judy', 'Grace', 27, 'Accountant')
-        ]
-        
-        cursor.executemany('INSERT INTO people VALUES (?,?,?,?)', people_data)
-        conn.commit()
-        conn.close()
-        
-        return db_path
-    
     def extract_sql_command(text):
         """Extract SQL command from response."""
         # Clean up the text
@@ -89,10 +81,9 @@ def assert_sql_interaction(response, context=None):
         
         return None
     
-    def execute_sql(db_path, command):
+    def execute_sql(conn, command):
         """Execute SQL command and return result."""
         try:
-            conn = sqlite3.connect(db_path)
             cursor = conn.cursor()
             
             # Print debug info
@@ -106,7 +97,6 @@ def assert_sql_interaction(response, context=None):
             result = cursor.fetchone()
             print(f"Verification query result: {result}")
             
-            conn.close()
             return True
             
         except sqlite3.Error as e:
@@ -116,9 +106,8 @@ def assert_sql_interaction(response, context=None):
             print(f"Error executing SQL: {e}")
             return False
     
-    def get_required_values(db_path):
+    def get_required_values(conn):
         """Get the youngest age and most common profession."""
-        conn = sqlite3.connect(db_path)
         cursor = conn.cursor()
         
         # Get youngest age
@@ -138,15 +127,13 @@ def assert_sql_interaction(response, context=None):
         most_common_profession = result[0] if result else None
         print(f"Most common profession found: {most_common_profession}")
         
-        conn.close()
         return youngest_age, most_common_profession
     
-    def verify_victor(db_path):
+    def verify_victor(conn):
         """Verify Victor was added with correct criteria."""
         try:
-            youngest_age, most_common_profession = get_required_values(db_path)
+            youngest_age, most_common_profession = get_required_values(conn)
             
-            conn = sqlite3.connect(db_path)
             cursor = conn.cursor()
             
             # Check Victor's details
@@ -158,8 +145,6 @@ def assert_sql_interaction(response, context=None):
             result = cursor.fetchone()
             print(f"Victor's details: {result}")
             
-            conn.close()
-            
             if not result:
                 return False, "Victor not found in database"
             
@@ -175,9 +160,8 @@ def assert_sql_interaction(response, context=None):
             return False, f"Verification error: {str(e)}"
     
     try:
-        # Setup database
-        db_path = setup_database()
-        print(f"Database created at: {db_path}")
+        # Private in-memory copy of the database for this job
+        conn = people_db.connect()
         
         # Extract SQL command
         command = extract_sql_command(response)
@@ -200,7 +184,7 @@ def assert_sql_interaction(response, context=None):
         print(f"Processed SQL command: {command}")
         
         # Execute the command
-        if not execute_sql(db_path, command):
+        if not execute_sql(conn, command):
             return {
                 'pass': False,
                 'score': 0.0,
@@ -208,11 +192,7 @@ def assert_sql_interaction(response, context=None):
             }
         
         # Verify the result
-        success, message = verify_victor(db_path)
-        
-        # Cleanup
-        if os.path.exists(db_path):
-            os.remove(db_path)
+        success, message = verify_victor(conn)
         
         return {
             'pass': success,
@@ -221,10 +201,11 @@ def assert_sql_interaction(response, context=None):
         }
         
     except Exception as e:
-        if 'db_path' in locals() and os.path.exists(db_path):
-            os.remove(db_path)
         return {
             'pass': False,
             'score': 0.0,
             'reason': f'Error during evaluation: {str(e)}'
-        }
\ No newline at end of file
+        }
+    finally:
+        if 'conn' in locals():
+            conn.close()
\ No newline at end of file
@@ -1,3 +1,6 @@
+import timings
+
+@timings.timed
 def check_email_extraction(response, context=None):
     """
     Evaluates if the model correctly extracted all invalid email addresses
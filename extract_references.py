@@ -2,6 +2,10 @@ import json
 import subprocess
 import sys
 
+import code_extract
+import timings
+
+@timings.timed
 def assert_paper_titles_extraction(response, context=None):
     """
     Assertion function for Promptfoo to test if the model can extract paper titles from a block of text.
@@ -30,10 +34,8 @@ def assert_paper_titles_extraction(response, context=None):
     }
     
     try:
-        # Clean up the response to extract JSON content
-        cleaned_response = response.replace("```json", "```")
-        
-        if "```" not in cleaned_response:
+        block = code_extract.find_block(response, "json")
+        if block is None:
             return {
                 "pass": False,
                 "score": 0,
@@ -41,7 +43,7 @@ def assert_paper_titles_extraction(response, context=None):
             }
         
         # Extract content between code blocks
-        json_content = cleaned_response.split("```")[1]
+        json_content = block.code
         
         # Parse JSON and normalize titles
         extracted_titles = json.loads(json_content)
@@ -1,19 +1,18 @@
-import subprocess
-import tempfile
 import os
-import re
-import sqlite3
-import time
 
+import code_extract
+import fixtures
+import python_sandbox
+import timings
+import workspace
+
+@timings.timed
 def assert_sql_query_response(response, context=None):
     """
     Evaluates if the model's response contains a correct Python program 
     that retrieves data from a SQL database and outputs 'Grace'.
     """
     
-    # Setup the database first
-    setup_database()
-    
     # Extract and clean Python code from the response
     code = extract_python_code(response)
     if not code:
@@ -26,42 +25,41 @@ def assert_sql_query_response(response, context=None):
     # Clean the code and ensure proper encoding
     code = clean_code(code)
     
-    # Run the extracted code
-    try:
-        output = run_python_code(code)
-        
-        # Check if output contains "Grace"
-        if "Grace" in output:
-            return {
-                'pass': True,
-                'score': 1,
-                'reason': 'Code successfully outputs Grace'
-            }
-        else:
+    # Setup the database in a workspace of its own, released once the candidate has
+    # exited and nothing holds people.db open any more
+    with workspace.workspace("fancy_sql_process") as temp_dir:
+        try:
+            setup_database(temp_dir)
+            
+            # Run the extracted code
+            output = run_python_code(code, temp_dir)
+            
+            # Check if output contains "Grace"
+            if "Grace" in output:
+                return {
+                    'pass': True,
+                    'score': 1,
+                    'reason': 'Code successfully outputs Grace'
+                }
+            else:
+                return {
+                    'pass': False,
+                    'score': 0,
+                    'reason': f'Code output does not contain "Grace". Output: {output}'
+                }
+                
+        except Exception as e:
             return {
                 'pass': False,
                 'score': 0,
-                'reason': f'Code output does not contain "Grace". Output: {output}'
+                'reason': f'Error running code: {str(e)}'
             }
-            
-    except Exception as e:
-        return {
-            'pass': False,
-            'score': 0,
-            'reason': f'Error running code: {str(e)}'
-        }
-    finally:
-        # Clean up database file
-        cleanup_database()
 
-def setup_database():
-    """Create the SQLite database with test data"""
-    conn = sqlite3.connect('people.db')
+@fixtures.database("fancy_sql_process/people", version=1)
+def people_db(conn):
+    """The people table the candidate's program queries"""
     cursor = conn.cursor()
     
-    # Drop table if exists
-    cursor.execute('DROP TABLE IF EXISTS people')
-    
     # Create table
     cursor.execute('''CREATE TABLE people
                  (name TEXT, favorite_friend TEXT, age INT, profession TEXT)''')
@@ -81,22 +79,14 @@ def setup_database():
     ]
     
     cursor.executemany('INSERT INTO people VALUES (?,?,?,?)', people_data)
-    conn.commit()
-    conn.close()
+
+def setup_database(directory):
+    """Give this job its own copy of the SQLite database with test data"""
+    people_db.copy_to(os.path.join(directory, 'people.db'))
 
 def extract_python_code(response):
     """Extract Python code from the model's response"""
-    # Remove language specifiers from code blocks
-    response = re.sub(r'```[a-z]*', '```', response)
-    
-    if "```" in response:
-        # Extract code between triple backticks
-        parts = response.split("```")
-        if len(parts) >= 2:
-            return parts[1]
-    
-    # If no code blocks found, return the entire response
-    return response
+    return code_extract.extract_code(response, "python")
 
 def clean_code(code):
     """Clean the code and ensure proper encoding"""
@@ -129,44 +119,12 @@ def clean_code(code):
     
     return code
 
-def run_python_code(code):
+def run_python_code(code, directory):
     """Run Python code and return its output"""
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False, encoding='utf-8') as f:
-        f.write(code)
-        temp_file = f.name
+    # The code opens people.db by relative path, so run it next to the database
+    result = python_sandbox.run_code(code, timeout=10, cwd=directory, encoding='utf-8', errors='ignore')
     
-    try:
-        result = subprocess.run(
-            ['python', temp_file],
-            capture_output=True,
-            text=True,
-            encoding='utf-8',
-            errors='ignore',
-            timeout=10
-        )
+    if result.returncode != 0:
+        raise Exception(f"Code execution failed: {result.stderr}")
         
-        if result.returncode != 0:
-            raise Exception(f"Code execution failed: {result.stderr}")
-            
-        return result.stdout
-        
-    finally:
-        if os.path.exists(temp_file):
-            os.unlink(temp_file)
-
-def cleanup_database():
-    """Remove the test database file with retry (for Windows file lock issues)"""
-    db_path = 'people.db'
-    retries = 5
-    delay = 0.5  # seconds
-
-    for attempt in range(retries):
-        try:
-            if os.path.exists(db_path):
-                os.remove(db_path)
-            return
-        except PermissionError:
-            if attempt < retries - 1:
-                time.sleep(delay)
-            else:
-                raise
\ No newline at end of file
+    return result.stdout
@@ -1,3 +1,6 @@
+import timings
+
+@timings.timed
 def get_assertion(response, context=None):
     """
     Evaluates if the response correctly identifies incorrect equations in a math paper.
@@ -2,6 +2,9 @@ import subprocess
 import json
 import os
 
+import timings
+
+@timings.timed
 def check_append_not_extend(response, context=None):
     """
     Evaluates if the response correctly identifies that the code should use extend instead of append.
@@ -1,8 +1,8 @@
-import re
-import subprocess
-import tempfile
-import os
+import code_extract
+import python_sandbox
+import timings
 
+@timings.timed
 def check_fix_json_function(response, context=None):
     """
     Promptfoo assertion to test if the model can write a valid fix_json function
@@ -55,12 +55,8 @@ def extract_code_from_response(response):
     """
     Extracts Python code from markdown-style code blocks in the response.
     """
-    response = re.sub(r'```[a-zA-Z]*\n', '```', response)
-    if "```" in response:
-        parts = response.split("```")
-        if len(parts) >= 3:
-            return parts[1].strip()
-    return response.strip() if response.strip() else None
+    code = code_extract.extract_code(response, "python").strip()
+    return code if code else None
 
 
 def run_python_code(code):
@@ -68,18 +64,7 @@ def run_python_code(code):
     Runs the given Python code and returns stdout, or None if error occurs.
     """
     try:
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-            f.write(code)
-            temp_file = f.name
-
-        result = subprocess.run(
-            ['python', temp_file],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
-
-        os.unlink(temp_file)
+        result = python_sandbox.run_code(code, timeout=10)
 
         return result.stdout if result.returncode == 0 else None
     except Exception:
@@ -1,3 +1,6 @@
+import timings
+
+@timings.timed
 def assert_node_fix_suggestion(output, context=None):
     """
     Test if the model can identify a node error message and suggest the correct fix.
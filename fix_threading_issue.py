@@ -1,7 +1,9 @@
-import subprocess
-import json
 import os
 
+import judge_client
+import timings
+
+@timings.timed
 def assert_identifies_pickling_error(response, context=None):
     """
     Evaluates if the response correctly identifies that create_speech_file function 
@@ -24,32 +26,9 @@ Think out loud then answer either "The student passes" or "The student fails".""
             'reason': 'LLMFOUNDRY_TOKEN environment variable not set'
         }
 
-    # Prepare the curl command
-    curl_cmd = [
-        'curl', '-X', 'POST', 
-        'https://llmfoundry.straive.com/openai/v1/chat/completions',
-        '-H', f'Authorization: Bearer {token}:my-test-project',
-        '-H', 'Content-Type: application/json',
-        '-d', json.dumps({
-            "model": "gpt-4o-mini",
-            "messages": [{"role": "user", "content": evaluation_prompt}]
-        })
-    ]
-    
     try:
-        # Execute the curl command
-        result = subprocess.run(curl_cmd, capture_output=True, text=True, timeout=30)
-        
-        if result.returncode != 0:
-            return {
-                'pass': False,
-                'score': 0,
-                'reason': f'Curl command failed: {result.stderr}'
-            }
-        
-        # Parse the response
-        response_data = json.loads(result.stdout)
-        evaluation_response = response_data['choices'][0]['message']['content']
+        # Ask the judge model
+        evaluation_response = judge_client.ask(evaluation_prompt)
         
         # Check if the evaluation contains "student passes"
         passes = "student passes" in evaluation_response.lower()
@@ -60,17 +39,11 @@ Think out loud then answer either "The student passes" or "The student fails".""
             'reason': f'Evaluation result: {evaluation_response}'
         }
         
-    except subprocess.TimeoutExpired:
-        return {
-            'pass': False,
-            'score': 0,
-            'reason': 'LLM evaluation timed out'
-        }
-    except json.JSONDecodeError as e:
+    except judge_client.JudgeError as e:
         return {
             'pass': False,
             'score': 0,
-            'reason': f'Failed to parse LLM response: {e}'
+            'reason': f'LLM evaluation failed: {e}'
         }
     except Exception as e:
         return {
@@ -1,57 +1,34 @@
 import subprocess
-import tempfile
-import re
-import os
 
+import code_extract
+import python_sandbox
+import timings
+
+@timings.timed
 def assert_tokenizer_fix(response, context=None):
     """
     Evaluates if the LLM response correctly fixes the tokenizer regex issue.
     """
     
-    def extract_code(output):
-        """Extract code from response, handling code blocks."""
-        output = re.sub('```[a-z]*', '```', output)
-        if "```" in output and output.count("```") >= 2:
-            # Extract content between first pair of ```
-            parts = output.split("```")
-            if len(parts) >= 3:
-                return parts[1].strip()
-        # If no code blocks, return the whole output
-        return output.strip()
-    
     def run_python_code(code, test_case):
-        """Run Python code with test case using subprocess."""
+        """Run Python code with test case in the Python sandbox."""
         full_code = code + "\n\n" + test_case
         
-        # Write code to temporary file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-            f.write(full_code)
-            temp_file = f.name
-        
         try:
             # Run the code
-            result = subprocess.run(
-                ['python', temp_file],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
+            result = python_sandbox.run_code(full_code, timeout=10)
             return result.stdout + result.stderr
         except subprocess.TimeoutExpired:
             return "TIMEOUT"
         except Exception as e:
             return f"ERROR: {str(e)}"
-        finally:
-            # Clean up temporary file
-            if os.path.exists(temp_file):
-                os.unlink(temp_file)
     
     def check_substring(output, expected_substr):
         """Check if expected substring is in output."""
         return expected_substr in output
     
     # Extract code from LLM response
-    extracted_code = extract_code(response)
+    extracted_code = code_extract.extract_code(response).strip()
     
     # Prepare test case
     test_case = "print(Tokenizer('sin(3+2*4)-cos(15)').tokens)"
@@ -1,8 +1,12 @@
 import subprocess
-import tempfile
 import os
-import re
 
+import code_extract
+import proc_runner
+import timings
+import workspace
+
+@timings.timed
 def get_assertions(response, context=None):
     """
     Evaluates PyTorch code fix by extracting code, running it, and checking output.
@@ -10,20 +14,10 @@ def get_assertions(response, context=None):
     
     def extract_code(text):
         """Extract code from markdown code blocks or plain text"""
-        # Clean up special characters
-        text = text.replace('"', '"').replace('"', '"')
-        text = text.replace(''', "'").replace(''', "'")
-        
-        # Remove language specifiers from code blocks
-        text = re.sub('```[a-z]*', '```', text)
-        
-        if "```" in text and text.count("```") >= 2:
-            # Extract from code blocks
-            code = text.split("```")[1]
-        else:
-            # Use the entire response as code
-            code = text
-        
+        code = code_extract.extract_code(text, "python")
+        # Normalize smart quotes
+        code = code.replace("\u201c", '"').replace("\u201d", '"')
+        code = code.replace("\u2018", "'").replace("\u2019", "'")
         return code.strip()
     
     def run_python_code(code):
@@ -32,19 +26,20 @@ def get_assertions(response, context=None):
             # Add UTF-8 encoding declaration
             code_with_encoding = "# -*- coding: utf-8 -*-\n" + code
             
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.py', encoding='utf-8', delete=False) as f:
-                f.write(code_with_encoding)
-                temp_file = f.name
-            
-            result = subprocess.run(
-                ['python', temp_file],
-                capture_output=True,
-                text=True,
-                encoding='utf-8',
-                timeout=30
-            )
-            
-            os.unlink(temp_file)
+            # A fresh interpreter rather than python_sandbox: importing torch reserves more
+            # address space than the sandbox's memory rlimit leaves room for
+            with workspace.workspace("fix_torch_backward") as temp_dir:
+                temp_file = os.path.join(temp_dir, "main.py")
+                with open(temp_file, 'w', encoding='utf-8') as f:
+                    f.write(code_with_encoding)
+                
+                result = proc_runner.run(
+                    ['python', temp_file],
+                    cwd=temp_dir,
+                    text=True,
+                    encoding='utf-8',
+                    timeout=30
+                )
             
             if result.returncode != 0:
                 return f"ERROR: {result.stderr}"
@@ -55,12 +50,6 @@ def get_assertions(response, context=None):
             return "ERROR: Code execution timed out"
         except Exception as e:
             return f"ERROR: {str(e)}"
-        finally:
-            if 'temp_file' in locals() and os.path.exists(temp_file):
-                try:
-                    os.unlink(temp_file)
-                except:
-                    pass
     
     def check_substring(text, substring):
         """Check if substring exists in text"""
@@ -1,10 +1,13 @@
 import os
 import subprocess
-import tempfile
 import time
 import re
 import importlib.util
 
+import timings
+import workspace
+
+@timings.timed
 def assert_patch_fixes_tokenizer(response, context=None):
     """
     Evaluates if the LLM response contains a valid patch file that fixes the tokenizer bug.
@@ -33,7 +36,7 @@ class Tokenizer:
         return self.tokens[self.position]"""
 
     # Create temporary directory for our test
-    with tempfile.TemporaryDirectory() as temp_dir:
+    with workspace.workspace("fix_with_patch") as temp_dir:
         original_cwd = os.getcwd()
         try:
             os.chdir(temp_dir)
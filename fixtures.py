@@ -0,0 +1,270 @@
+import copy
+import errno
+import functools
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows: no reflinks, snapshots are plain copies
+    fcntl = None
+
+import timings
+import workspace
+
+# On the same filesystem as the workspaces graders snapshot into, so link=True snapshots can hardlink
+FIXTURE_DIR = os.getenv("FIXTURE_DIR") or os.path.join(
+    os.path.dirname(workspace.ROOT), f"carlini-fixtures-{workspace.UID}")
+# ioctl asking btrfs/xfs/overlayfs for a copy-on-write clone of a whole file
+FICLONE = 0x40049409
+MANIFEST = ".fixture-manifest.json"
+
+# Reentrant: a value fixture may read a tree fixture while it builds
+_lock = threading.RLock()
+
+
+def _key(name, version):
+    return f"{name.replace('/', '--')}-v{version}"
+
+
+def _write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=".tmp-", dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def value(name, version=1):
+    """
+    Decorator for a function computing a deterministic, JSON-serializable reference value.
+
+    The value is computed once per process and stored under FIXTURE_DIR keyed by name
+    and version, so later processes only read it back; bump version whenever the
+    function's result changes. Callers get their own copy and may mutate it freely.
+    """
+    def decorator(build):
+        path = os.path.join(FIXTURE_DIR, "values", _key(name, version) + ".json")
+        memo = []
+
+        @timings.spanned("fixture")
+        @functools.wraps(build)
+        def wrapper():
+            with _lock:
+                if not memo:
+                    try:
+                        with open(path, encoding="utf-8") as f:
+                            memo.append(json.load(f))
+                    except (OSError, ValueError):
+                        result = build()
+                        _write_json(path, result)
+                        memo.append(result)
+            return copy.deepcopy(memo[0])
+
+        wrapper.path = path
+        return wrapper
+    return decorator
+
+
+@timings.spanned("fixture")
+def write_files(root, files):
+    """
+    Write {relative path: str or bytes} under root, creating directories, and return root.
+
+    Each file is closed before the next is opened. close() is the point at which
+    other processes on the host see the data, so the candidate can run as soon as
+    this returns; neither sleeping nor fsync is needed for that.
+    """
+    for name, content in files.items():
+        path = os.path.join(root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        mode = "wb" if isinstance(content, bytes) else "w"
+        with open(path, mode, **({} if mode == "wb" else {"encoding": "utf-8"})) as f:
+            f.write(content)
+    return root
+
+
+def _clone(src, dst):
+    """Copy one file, as a copy-on-write clone where the filesystem supports it."""
+    if fcntl is not None:
+        with open(src, "rb") as fin, open(dst, "wb") as fout:
+            try:
+                fcntl.ioctl(fout.fileno(), FICLONE, fin.fileno())
+                shutil.copystat(src, dst)
+                return dst
+            except OSError as e:
+                if e.errno not in (errno.EOPNOTSUPP, errno.ENOTTY, errno.EXDEV, errno.EINVAL, errno.ENOSYS):
+                    raise
+    return shutil.copy2(src, dst)
+
+
+def _link(src, dst):
+    try:
+        os.link(src, dst)
+        return dst
+    except OSError:
+        # Different filesystem, or links not supported
+        return _clone(src, dst)
+
+
+def _manifest(root):
+    """Relative path -> [size, mtime_ns] for every file under root but the manifest itself."""
+    found = {}
+    for directory, _, files in os.walk(root):
+        for name in files:
+            path = os.path.join(directory, name)
+            if path == os.path.join(root, MANIFEST):
+                continue
+            st = os.stat(path)
+            found[os.path.relpath(path, root)] = [st.st_size, st.st_mtime_ns]
+    return found
+
+
+class Tree:
+    """
+    A directory of deterministic inputs, built once and snapshotted into each workspace.
+
+    The built tree lives under FIXTURE_DIR and is never handed out directly:
+    snapshot() copies it (as copy-on-write clones where possible), or with link=True
+    hardlinks it for graders whose candidates only read the files. Before a linked
+    snapshot the tree is checked against the manifest recorded at build time and
+    rebuilt if anything was written through a link.
+    """
+
+    def __init__(self, name, version, build):
+        self.name = name
+        self.version = version
+        self.build = build
+        self.root = os.path.join(FIXTURE_DIR, "trees", _key(name, version))
+        self.checked = False
+        functools.update_wrapper(self, build)
+
+    def _valid(self):
+        try:
+            with open(os.path.join(self.root, MANIFEST), encoding="utf-8") as f:
+                return json.load(f) == _manifest(self.root)
+        except (OSError, ValueError):
+            return False
+
+    def _build(self):
+        parent = os.path.dirname(self.root)
+        os.makedirs(parent, exist_ok=True)
+        build_dir = tempfile.mkdtemp(prefix=".build-", dir=parent)
+        try:
+            self.build(build_dir)
+            with open(os.path.join(build_dir, MANIFEST), "w", encoding="utf-8") as f:
+                json.dump(_manifest(build_dir), f)
+            if os.path.exists(self.root):
+                # Damaged tree: move it aside so the rename below can take its place
+                stale = tempfile.mkdtemp(prefix=".stale-", dir=parent)
+                try:
+                    os.rename(self.root, os.path.join(stale, "tree"))
+                finally:
+                    shutil.rmtree(stale, ignore_errors=True)
+            os.rename(build_dir, self.root)
+        except OSError:
+            shutil.rmtree(build_dir, ignore_errors=True)
+            # Another grader finished the same build first; use theirs
+            if not self._valid():
+                raise
+        except BaseException:
+            shutil.rmtree(build_dir, ignore_errors=True)
+            raise
+
+    @timings.spanned("fixture")
+    def ensure(self, verify=False):
+        """Build the tree unless a valid one exists; return its (read-only) path."""
+        with _lock:
+            if verify or not self.checked:
+                if not self._valid():
+                    self._build()
+                self.checked = True
+        return self.root
+
+    @timings.spanned("fixture")
+    def snapshot(self, dest, link=False):
+        """Populate dest (created if missing) with the tree's files and return dest."""
+        root = self.ensure(verify=link)
+        shutil.copytree(root, dest, ignore=shutil.ignore_patterns(MANIFEST),
+                        copy_function=_link if link else _clone, dirs_exist_ok=True)
+        return dest
+
+
+def tree(name, version=1):
+    """Decorator turning build(path), which fills path with files, into a Tree fixture."""
+    def decorator(build):
+        return Tree(name, version, build)
+    return decorator
+
+
+class Database:
+    """
+    A SQLite database built once into a template file and copied per job.
+
+    connect() returns a private in-memory copy made with the sqlite3 backup API,
+    for graders that run the candidate's SQL in-process; copy_to() writes a private
+    file (a copy-on-write clone where possible) for candidates running as their own
+    process. Jobs never share a database file, so they can run in parallel.
+    """
+
+    def __init__(self, name, version, build):
+        self.name = name
+        self.version = version
+        self.build = build
+        self.path = os.path.join(FIXTURE_DIR, "databases", _key(name, version) + ".sqlite3")
+        self.template = None
+        functools.update_wrapper(self, build)
+
+    @timings.spanned("fixture")
+    def ensure(self):
+        """Build the template unless it exists; return its (read-only) path."""
+        with _lock:
+            if not os.path.exists(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                fd, tmp = tempfile.mkstemp(prefix=".build-", suffix=".sqlite3", dir=os.path.dirname(self.path))
+                os.close(fd)
+                try:
+                    conn = sqlite3.connect(tmp)
+                    try:
+                        self.build(conn)
+                        conn.commit()
+                    finally:
+                        conn.close()
+                    os.replace(tmp, self.path)
+                except BaseException:
+                    os.unlink(tmp)
+                    raise
+        return self.path
+
+    @timings.spanned("fixture")
+    def connect(self):
+        """A private in-memory copy of the database."""
+        self.ensure()
+        copy = sqlite3.connect(":memory:", check_same_thread=False)
+        with _lock:
+            if self.template is None:
+                self.template = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+            self.template.backup(copy)
+        return copy
+
+    @timings.spanned("fixture")
+    def copy_to(self, dest):
+        """Write a private copy of the database to dest and return dest."""
+        _clone(self.ensure(), dest)
+        return dest
+
+
+def database(name, version=1):
+    """Decorator turning build(conn), which creates and fills tables, into a Database fixture."""
+    def decorator(build):
+        return Database(name, version, build)
+    return decorator
+
@@ -1,5 +1,7 @@
-import re
+import code_extract
+import timings
 
+@timings.timed
 def get_assertion(response, context=None):
     """
     Promptfoo assertion function that evaluates HTML flexbox layout.
@@ -7,17 +9,7 @@ def get_assertion(response, context=None):
     
     def extract_html_code(text):
         """Extract HTML code from the response"""
-        # Remove language specifiers from code blocks
-        text = re.sub('```[a-z]*', '```', text)
-        
-        if "```" in text:
-            # Extract code from markdown code block
-            parts = text.split("```")
-            if len(parts) >= 2:
-                return parts[1].strip()
-        
-        # If no code block, return the whole response
-        return text.strip()
+        return code_extract.extract_code(text, "html").strip()
 
     def check_flexbox_properties(html_code):
         """Check if the HTML code contains required flexbox properties"""
@@ -1,3 +1,6 @@
+import timings
+
+@timings.timed
 def assert_freecad_construction_circle(response, context=None):
     """
     Test if the model understands a rambling question about how to make construction circle in FreeCAD.
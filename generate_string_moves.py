@@ -1,50 +1,29 @@
-import re
 import subprocess
-import tempfile
-import os
 
+import code_extract
+import python_sandbox
+import timings
+
+@timings.timed
 def check(response, context=None):
     """
     Promptfoo assertion function that extracts code from LLM response,
     runs it with a test case, and checks if the output contains the expected answer.
     """
     
-    # Step 1: Extract code from response (equivalent to ExtractCode)
-    def extract_code(output):
-        # Clean up potential smart quotes and other special characters
-        output = output.replace('"', '"').replace('"', '"').replace(''', "'").replace(''', "'")
-        output = re.sub('```[a-z]*', '```', output)
-        if "```" in output and output.count("```") >= 2:
-            # Extract code between first pair of backticks
-            parts = output.split("```")
-            if len(parts) >= 3:
-                return parts[1].strip()
-        # If no code blocks found, return the entire output
-        return output.strip()
-    
     try:
-        code = extract_code(response)
+        # Step 1: Extract code from response (equivalent to ExtractCode),
+        # cleaning up potential smart quotes
+        code = code_extract.extract_code(response)
+        code = code.replace('\u201c', '"').replace('\u201d', '"').replace('\u2018', "'").replace('\u2019', "'").strip()
         
         # Step 2: Prepare test case (equivalent to PythonRun)
         test_case = "print(set(move('abcdef')))"
         full_code = f"# -*- coding: utf-8 -*-\n{code}\n\n{test_case}"
         
         # Step 3: Run the Python code
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', encoding='utf-8', delete=False) as f:
-            f.write(full_code)
-            temp_file = f.name
-        
         try:
-            result = subprocess.run(
-                ['python', temp_file],
-                capture_output=True,
-                text=True,
-                encoding='utf-8',
-                timeout=10
-            )
-            
-            # Clean up
-            os.unlink(temp_file)
+            result = python_sandbox.run_code(full_code, timeout=10, encoding='utf-8')
             
             if result.returncode != 0:
                 return {
@@ -56,8 +35,6 @@ def check(response, context=None):
             output = result.stdout.strip()
             
         except subprocess.TimeoutExpired:
-            if os.path.exists(temp_file):
-                os.unlink(temp_file)
             return {
                 'pass': False,
                 'score': 0,
@@ -65,8 +42,6 @@ def check(response, context=None):
             }
             
     except Exception as e:
-        if 'temp_file' in locals() and os.path.exists(temp_file):
-            os.unlink(temp_file)
         return {
             'pass': False,
             'score': 0,
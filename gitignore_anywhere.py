@@ -1,3 +1,6 @@
+import timings
+
+@timings.timed
 def assert_gitignore_pattern(response, context=None):
     """
     Test if the model can understand and interpret a request to gitignore 
@@ -1,8 +1,11 @@
 import subprocess
-import tempfile
-import os
 import re
 
+import code_extract
+import python_sandbox
+import timings
+
+@timings.timed
 def assert_rle_decode(response, context=None):
     """
     Evaluates if the LLM response correctly implements RLE to numpy array conversion.
@@ -32,33 +35,12 @@ print(result)
     full_code = code + "\n\n" + test_case
     
     try:
-        # Write to file with UTF-8 encoding and handle non-ASCII characters
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False, encoding='utf-8', errors='ignore') as f:
-            # Add encoding declaration
-            f.write("# -*- coding: utf-8 -*-\n")
-            f.write(full_code)
-            temp_file = f.name
-        
-        # Determine which Python command to use (python3 or python)
-        python_cmd = 'python3'
-        try:
-            subprocess.run([python_cmd, '--version'], capture_output=True, check=True)
-        except (subprocess.SubprocessError, FileNotFoundError):
-            python_cmd = 'python'  # Fall back to python if python3 is not available
-        
-        result = subprocess.run(
-            [python_cmd, temp_file],
-            capture_output=True,
-            text=True,
+        # Add encoding declaration
+        result = python_sandbox.run_code(
+            "# -*- coding: utf-8 -*-\n" + full_code,
             timeout=30
         )
         
-        # Clean up the temporary file
-        try:
-            os.unlink(temp_file)
-        except:
-            pass  # Ignore errors during cleanup
-        
         if result.returncode != 0:
             return {
                 'pass': False,
@@ -102,17 +84,4 @@ def extract_code_from_response(response):
     """
     # Remove non-ASCII characters to prevent encoding issues
     response = re.sub(r'[^\x00-\x7F]+', '', response)
-    
-    # Remove language specifiers from code blocks
-    cleaned_response = re.sub(r'```[a-z]*', '```', response)
-    
-    # If there are exactly 2 backticks (one opening, one closing code block)
-    if cleaned_response.count("```") >= 2:
-        try:
-            code = cleaned_response.split("```")[1]
-            return code.strip()
-        except IndexError:
-            pass
-    
-    # If no clear code blocks, return the whole response
-    return response.strip()
\ No newline at end of file
+    return code_extract.extract_code(response, "python").strip()
\ No newline at end of file
@@ -0,0 +1,258 @@
+import argparse
+import json
+import math
+import os
+import random
+import resource
+import select
+import signal
+import sys
+import threading
+import time
+import zlib
+
+import grader_server
+import judge_client
+import judge_stub_server
+import results_reader
+import workspace
+
+KINDS = ("passing", "failing", "garbage", "huge")
+HUGE_BYTES = 1024 * 1024
+# Hand-written passing and failing responses for every grader, replayed unless --corpus names others
+DEFAULT_CORPUS = os.path.join(grader_server.ROOT, "grader_bench_corpus.jsonl")
+# Audit events that start a process; python_sandbox.job is a job forked by the sandbox server
+PROCESS_EVENTS = {"subprocess.Popen", "os.system", "os.posix_spawn", "os.spawn", "os.exec", "os.fork",
+                  "python_sandbox.job"}
+PAGE_BYTES = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def load_results(path):
+    """Recorded cases from a promptfoo results file: one per result, passing or failing as graded then."""
+    cases = []
+    for result in results_reader.ResultsFile(path):
+        component = results_reader.component(result)
+        reference = grader_server.parse_assertion(str((component.get("assertion") or {}).get("value", "")))
+        output = (result.get("response") or {}).get("output")
+        if reference and isinstance(output, str):
+            cases.append({"grader": "{}.py:{}".format(*reference),
+                          "kind": "passing" if component.get("pass") else "failing", "output": output})
+    return cases
+
+
+def load_corpus(path):
+    """Cases from a JSONL file of {"grader": "module.py:function", "kind": ..., "output": ..., "judge": ...}."""
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def garbage(grader, size=2000):
+    """Deterministic noise with a stray unclosed code fence, different for every grader."""
+    rng = random.Random(zlib.crc32(grader.encode("utf-8")))
+    words = ["lorem", "```", "def", "(", ")", "{", "}", ";", "\n", "import", "NaN", "\\x00", "é", "0x1f", "TODO"]
+    text = " ".join(rng.choice(words) for _ in range(size // 4))
+    return text[:size // 2] + "\n```python\n" + text[size // 2:]
+
+
+def synthesize(graders, recorded, huge_bytes=HUGE_BYTES):
+    """Garbage and huge cases for every grader; huge repeats its longest recorded output, else garbage."""
+    longest = {}
+    for case in recorded:
+        if len(case["output"]) > len(longest.get(case["grader"], "")):
+            longest[case["grader"]] = case["output"]
+    cases = []
+    for grader in graders:
+        noise = garbage(grader)
+        base = longest.get(grader) or noise
+        cases.append({"grader": grader, "kind": "garbage", "output": noise})
+        cases.append({"grader": grader, "kind": "huge", "output": (base + "\n") * (huge_bytes // (len(base) + 1) + 1)})
+    return cases
+
+
+def _current_rss():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * PAGE_BYTES
+    except OSError:
+        return 0
+
+
+def _measure(registry, case):
+    """Body of the forked child that grades one case; returns its metrics."""
+    processes = [0]
+
+    def audit(event, args):
+        if event in PROCESS_EVENTS:
+            processes[0] += 1
+
+    sys.addaudithook(audit)
+    before = workspace.stats()["reclaimed_bytes"]
+    rss = _current_rss()
+    start = time.perf_counter()
+    result = registry.call(case["grader"], case["output"])
+    elapsed = time.perf_counter() - start
+    workspace.drain()
+    return {
+        "seconds": elapsed,
+        "rss_growth_bytes": max(0, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024 - rss),
+        "child_rss_bytes": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * 1024,
+        "processes": processes[0],
+        "temp_bytes": workspace.stats()["reclaimed_bytes"] - before,
+        "error": isinstance(result, dict) and str(result.get("reason", "")).startswith(("Grader ", "Could not load")),
+    }
+
+
+def run_case(registry, case, timeout, quiet=True):
+    """Grade one case in a forked child (so RSS and process counts are its own) and return its metrics."""
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        status = 1
+        try:
+            os.close(read_fd)
+            os.setsid()
+            if quiet:
+                devnull = os.open(os.devnull, os.O_WRONLY)
+                os.dup2(devnull, 1)
+                os.dup2(devnull, 2)
+            metrics = _measure(registry, case)
+            with os.fdopen(write_fd, "w") as f:
+                json.dump(metrics, f)
+            status = 0
+        finally:
+            os._exit(status)
+
+    os.close(write_fd)
+    start = time.perf_counter()
+    with os.fdopen(read_fd) as f:
+        ready = select.select([f], [], [], timeout)[0]
+        data = f.read() if ready else ""
+    if not ready:
+        try:
+            os.killpg(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+    os.waitpid(pid, 0)
+    if not data:
+        return {"seconds": time.perf_counter() - start, "timed_out": not ready, "error": True,
+                "rss_growth_bytes": 0, "child_rss_bytes": 0, "processes": 0, "temp_bytes": 0}
+    return json.loads(data)
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def summarize(samples):
+    """Per-grader latency percentiles and resource use from {grader: [metrics, ...]}."""
+    report = {}
+    for grader, runs in samples.items():
+        seconds = [run["seconds"] for run in runs]
+        report[grader] = {
+            "calls": len(runs),
+            "p50_ms": round(percentile(seconds, 50) * 1000, 1),
+            "p95_ms": round(percentile(seconds, 95) * 1000, 1),
+            "p99_ms": round(percentile(seconds, 99) * 1000, 1),
+            "total_s": round(sum(seconds), 3),
+            "peak_rss_growth_bytes": max(run["rss_growth_bytes"] for run in runs),
+            "peak_child_rss_bytes": max(run["child_rss_bytes"] for run in runs),
+            "processes_per_call": round(sum(run["processes"] for run in runs) / len(runs), 2),
+            "temp_bytes_per_call": round(sum(run["temp_bytes"] for run in runs) / len(runs)),
+            "errors": sum(1 for run in runs if run.get("error")),
+            "timeouts": sum(1 for run in runs if run.get("timed_out")),
+            "by_kind": {kind: round(percentile([r["seconds"] for r in runs if r["kind"] == kind], 50) * 1000, 1)
+                        for kind in KINDS if any(r["kind"] == kind for r in runs)},
+        }
+    return report
+
+
+def format_table(report, baseline=None, top=None):
+    """Regression table, most expensive grader first, with each grader's share of total time."""
+    total = sum(row["total_s"] for row in report.values()) or 1
+    rows = sorted(report.items(), key=lambda item: -item[1]["total_s"])
+    header = (f"{'grader':45} {'calls':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'time%':>6} {'cum%':>6} "
+              f"{'rss MB':>7} {'child MB':>8} {'procs':>6} {'temp KB':>8} {'err':>4}")
+    if baseline:
+        header += f" {'p50 vs base':>11}"
+    lines = [header, "-" * len(header)]
+    cumulative = 0
+    for grader, row in rows[:top]:
+        cumulative += row["total_s"]
+        line = (f"{grader[:45]:45} {row['calls']:5} {row['p50_ms']:9.1f} {row['p95_ms']:9.1f} {row['p99_ms']:9.1f} "
+                f"{100 * row['total_s'] / total:6.1f} {100 * cumulative / total:6.1f} "
+                f"{row['peak_rss_growth_bytes'] / workspace.MB:7.1f} {row['peak_child_rss_bytes'] / workspace.MB:8.1f} "
+                f"{row['processes_per_call']:6.1f} {row['temp_bytes_per_call'] / 1024:8.1f} {row['errors']:4}")
+        if baseline:
+            old = baseline.get(grader)
+            line += f" {100 * (row['p50_ms'] / old['p50_ms'] - 1):+10.0f}%" if old and old["p50_ms"] else f" {'new':>11}"
+        lines.append(line)
+    shares = [row["total_s"] for _, row in rows]
+    heavy = next((i + 1 for i in range(len(shares)) if sum(shares[:i + 1]) >= 0.9 * total), len(shares))
+    lines.append(f"{heavy} of {len(rows)} graders take 90% of the {total:.1f}s total")
+    return "\n".join(lines)
+
+
+def start_stub_judge():
+    """Serve judge_stub_server's default judge on a free port and point judge_client at it."""
+    server = judge_stub_server.make_server(judge_stub_server.StubJudge(), port=0)
+    threading.Thread(target=server.serve_forever, name="stub-judge", daemon=True).start()
+    os.environ["JUDGE_CACHE"] = "0"
+    os.environ.setdefault("LLMFOUNDRY_TOKEN", "benchmark")
+    judge_client.configure(f"http://127.0.0.1:{server.server_port}/openai/v1")
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time every grader against recorded and synthetic responses")
+    parser.add_argument("--results", action="append", default=[],
+                        help="promptfoo results JSON (e.g. result_final.json) to replay as passing/failing cases")
+    parser.add_argument("--corpus", action="append", default=[],
+                        help='JSONL of {"grader", "kind", "output", "judge"} cases (repeatable; '
+                             f'default: {os.path.basename(DEFAULT_CORPUS)})')
+    parser.add_argument("--only", help="substring of 'module.py:function' to restrict the run to")
+    parser.add_argument("--kinds", default=",".join(KINDS), help="comma-separated case kinds (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=3, help="times to grade each case (default: %(default)s)")
+    parser.add_argument("--timeout", type=float, default=120, help="seconds per call (default: %(default)s)")
+    parser.add_argument("--huge-bytes", type=int, default=HUGE_BYTES)
+    parser.add_argument("--json", metavar="PATH", help="write the report as JSON")
+    parser.add_argument("--baseline", metavar="PATH", help="earlier --json report to compare p50 against")
+    parser.add_argument("--top", type=int, help="only show the N most expensive graders")
+    parser.add_argument("--verbose", action="store_true", help="let graders print")
+    args = parser.parse_args()
+
+    os.chdir(grader_server.ROOT)
+    judge = start_stub_judge().judge
+    registry = grader_server.GraderRegistry()
+    graders = sorted(g for g in registry.graders if not args.only or args.only in g)
+    recorded = [case for path in args.results for case in load_results(path)]
+    recorded += [case for path in args.corpus or [DEFAULT_CORPUS] for case in load_corpus(path)]
+    recorded = [case for case in recorded if case["grader"] in graders]
+    kinds = set(args.kinds.split(","))
+    cases = [case for case in recorded + synthesize(graders, recorded, args.huge_bytes) if case["kind"] in kinds]
+    registry.preload()
+
+    samples = {}
+    for i, case in enumerate(cases):
+        print(f"[{i + 1}/{len(cases)}] {case['grader']} ({case['kind']})", file=sys.stderr)
+        # A judge-graded case passes or fails on what the judge says, so the case says what that is
+        judge.default_reply = case.get("judge", judge_stub_server.DEFAULT_REPLY)
+        for _ in range(args.repeat):
+            metrics = run_case(registry, case, args.timeout, quiet=not args.verbose)
+            samples.setdefault(case["grader"], []).append({**metrics, "kind": case["kind"]})
+
+    report = summarize(samples)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["graders"]
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"created": time.strftime("%Y-%m-%dT%H:%M:%S"), "cases": len(cases), "repeat": args.repeat,
+                       "graders": report}, f, indent=2)
+    print(format_table(report, baseline, args.top))
+
+
+if __name__ == "__main__":
+    main()
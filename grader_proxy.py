@@ -0,0 +1,72 @@
+import argparse
+import importlib
+import os
+import sys
+
+import grader_server
+
+ROOT = grader_server.ROOT
+
+
+def forward(grader, output, context=None):
+    """
+    Grade output with grader ('module.py:function') on the running grader server.
+
+    Falls back to importing and calling the grader in this process when no server
+    is listening, so a rewritten test suite still runs without one.
+    """
+    try:
+        client = grader_server.GraderClient()
+    except OSError:
+        module_name, _, function_name = grader.partition(".py:")
+        if ROOT not in sys.path:
+            sys.path.insert(0, ROOT)
+        return getattr(importlib.import_module(module_name), function_name)(output, context)
+    with client:
+        return client.call(grader, output, context)
+
+
+def __getattr__(name):
+    # promptfoo looks the assertion's function up with getattr: module__function forwards
+    # to module.py:function
+    module_name, sep, function_name = name.partition(grader_server.PROXY_SEPARATOR)
+    if name.startswith("_") or not sep or not function_name:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    def grade(output, context=None):
+        return forward(f"{module_name}.py:{function_name}", output, context)
+    grade.__name__ = name
+    return grade
+
+
+def rewrite(text, restore=False):
+    """Point every grader assertion in a YAML test at this module, or back at the grader with restore."""
+    def replace(match):
+        module_name, function_name = grader_server.unproxy(*match.groups())
+        if restore:
+            return f"file://{module_name}.py:{function_name}"
+        return f"file://{grader_server.PROXY_MODULE}.py:{module_name}{grader_server.PROXY_SEPARATOR}{function_name}"
+    return grader_server.ASSERTION_RE.sub(replace, text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Route the YAML tests' python assertions through the grader server")
+    parser.add_argument("files", nargs="*", help="YAML tests to rewrite in place (default: all of them)")
+    parser.add_argument("--restore", action="store_true", help="point the assertions back at the graders")
+    args = parser.parse_args()
+
+    files = args.files or [os.path.join(ROOT, name) for name in sorted(os.listdir(ROOT)) if name.endswith(".yaml")]
+    changed = 0
+    for path in files:
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        new = rewrite(text, args.restore)
+        if new != text:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(new)
+            changed += 1
+    print(f"Rewrote {changed} of {len(files)} files")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+import argparse
+import contextlib
+import importlib
+import json
+import os
+import re
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import traceback
+
+import scheduler
+import workspace
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+ASSERTION_RE = re.compile(r'file://([\w.-]+)\.py:(\w+)')
+# Assertions rewritten by grader_proxy.py read file://grader_proxy.py:<module>__<function>
+PROXY_MODULE = "grader_proxy"
+PROXY_SEPARATOR = "__"
+
+
+def default_address():
+    """Return the address the server listens on when none is given."""
+    if os.getenv("GRADER_SERVER"):
+        return os.getenv("GRADER_SERVER")
+    if hasattr(socket, "AF_UNIX") and hasattr(os, "getuid"):
+        return os.path.join(tempfile.gettempdir(), f"carlini-graders-{os.getuid()}.sock")
+    return "127.0.0.1:8765"
+
+
+def parse_address(address):
+    """Split an address into (family, sockaddr); 'host:port' is TCP, anything else a unix socket path."""
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit() and os.sep not in address:
+        return socket.AF_INET, (host or "127.0.0.1", int(port))
+    return socket.AF_UNIX, address
+
+
+def unproxy(module_name, function_name):
+    """The (module, function) a grader reference names, looking through grader_proxy.py."""
+    if module_name == PROXY_MODULE:
+        module_name, _, function_name = function_name.partition(PROXY_SEPARATOR)
+    return module_name, function_name
+
+
+def parse_assertion(value):
+    """(module, function) of the first 'file://module.py:function' in value, or None."""
+    match = ASSERTION_RE.search(value)
+    return unproxy(*match.groups()) if match else None
+
+
+def discover_graders(root=ROOT):
+    """Map every 'module.py:function' referenced by a YAML test to (module, function)."""
+    graders = {}
+    for name in sorted(os.listdir(root)):
+        if not name.endswith(".yaml"):
+            continue
+        with open(os.path.join(root, name), encoding="utf-8") as f:
+            for module_name, function_name in (unproxy(*groups) for groups in ASSERTION_RE.findall(f.read())):
+                graders[f"{module_name}.py:{function_name}"] = (module_name, function_name)
+    return graders
+
+
+class GraderRegistry:
+    """Imports every grader module once and dispatches calls to their entry points."""
+
+    def __init__(self, root=ROOT):
+        self.root = root
+        self.graders = discover_graders(root)
+        self.modules = {}
+        self.failed = {}
+        self.swapped_streams = []
+        self.lock = threading.Lock()
+        if root not in sys.path:
+            sys.path.insert(0, root)
+
+    def preload(self):
+        """Import all grader modules (and with them numpy, PIL, ...) up front."""
+        stdout, stderr = sys.stdout, sys.stderr
+        for module_name in sorted({module for module, _ in self.graders.values()}):
+            try:
+                self.modules[module_name] = importlib.import_module(module_name)
+            except Exception as e:
+                self.failed[module_name] = f"{type(e).__name__}: {e}"
+            # Some graders re-wrap sys.stdout/stderr at import; a dropped wrapper closes
+            # the shared buffer when collected, so keep them alive and restore ours
+            if sys.stdout is not stdout or sys.stderr is not stderr:
+                self.swapped_streams.extend([sys.stdout, sys.stderr])
+                sys.stdout, sys.stderr = stdout, stderr
+        return self
+
+    def resolve(self, grader):
+        """Look up a grader given as 'module.py:function' or 'module:function'."""
+        module_name, _, function_name = grader.replace("file://", "").partition(":")
+        if module_name.endswith(".py"):
+            module_name = module_name[:-3]
+        module_name, function_name = unproxy(module_name, function_name)
+        if module_name in self.failed:
+            raise ImportError(f"Grader module {module_name} failed to import: {self.failed[module_name]}")
+        if module_name not in self.modules:
+            if f"{module_name}.py:{function_name}" not in self.graders:
+                raise LookupError(f"Unknown grader: {grader}")
+            self.modules[module_name] = importlib.import_module(module_name)
+        return getattr(self.modules[module_name], function_name)
+
+    def call(self, grader, output, context=None):
+        """Run one grader the way promptfoo's python wrapper would, never raising."""
+        try:
+            function = self.resolve(grader)
+        except Exception as e:
+            return {"pass": False, "score": 0, "reason": f"Could not load grader {grader}: {e}"}
+        try:
+            return function(output, context)
+        except (Exception, SystemExit, KeyboardInterrupt) as e:
+            return {
+                "pass": False,
+                "score": 0,
+                "reason": f"Grader {grader} raised {type(e).__name__}: {e}\n{traceback.format_exc()}"
+            }
+        finally:
+            # Some graders chdir into their temp dir and do not always restore it
+            os.chdir(self.root)
+
+    def handle(self, request):
+        """Answer one protocol request (already decoded from its JSON line)."""
+        op = request.get("op", "call")
+        if op == "ping":
+            reply = {"ok": True, "pid": os.getpid()}
+        elif op == "list":
+            reply = {"graders": sorted(self.graders), "failed": self.failed}
+        elif op == "stats":
+            reply = {"scheduler": scheduler.stats(), "workspace": workspace.stats()}
+        elif op == "call" and not request.get("grader"):
+            reply = {"error": "missing grader"}
+        elif op == "call":
+            reply = {"result": self.call(request["grader"], request.get("output", ""), request.get("context"))}
+        else:
+            reply = {"error": f"Unknown op: {op}"}
+        if "id" in request:
+            reply["id"] = request["id"]
+        return reply
+
+    def handle_line(self, line):
+        """Decode a JSON line, handle it and encode the reply as a JSON line."""
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            reply = {"error": f"Invalid request: {e}"}
+        else:
+            reply = self.handle(request) if isinstance(request, dict) else {"error": "Invalid request: not an object"}
+        return json.dumps(reply, default=str) + "\n"
+
+
+def serve_stdio(registry):
+    """Serve JSON-lines requests on stdin, replying on stdout."""
+    # Graders print freely; keep fd 1 for protocol replies only and send everything else to stderr
+    protocol_out = os.fdopen(os.dup(sys.stdout.fileno()), "w", encoding="utf-8")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        with contextlib.redirect_stdout(sys.stderr):
+            reply = registry.handle_line(line)
+        protocol_out.write(reply)
+        protocol_out.flush()
+
+
+class GraderRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        registry = self.server.registry
+        for line in self.rfile:
+            line = line.decode("utf-8")
+            if not line.strip():
+                continue
+            if self.server.serialize:
+                # Threaded fallback: graders share one cwd and module state
+                with registry.lock:
+                    reply = registry.handle_line(line)
+            else:
+                reply = registry.handle_line(line)
+            self.wfile.write(reply.encode("utf-8"))
+            self.wfile.flush()
+
+
+if hasattr(os, "fork"):
+    _ServerMixIn = socketserver.ForkingMixIn
+else:
+    _ServerMixIn = socketserver.ThreadingMixIn
+
+
+class GraderServer(_ServerMixIn, socketserver.TCPServer):
+    """Forks a child per connection from the pre-imported parent (threads on Windows)."""
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, address, registry):
+        self.address_family, sockaddr = parse_address(address)
+        self.registry = registry
+        self.serialize = _ServerMixIn is socketserver.ThreadingMixIn
+        if self.address_family != socket.AF_INET and os.path.exists(sockaddr):
+            os.unlink(sockaddr)
+        super().__init__(sockaddr, GraderRequestHandler)
+
+
+def serve_socket(registry, address):
+    """Serve JSON-lines requests on a unix socket path or 'host:port'."""
+    with GraderServer(address, registry) as server:
+        print(f"Serving {len(registry.graders)} graders on {address}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if server.address_family != socket.AF_INET and os.path.exists(address):
+                os.unlink(address)
+
+
+class GraderClient:
+    """Minimal client for a running grader server; imports nothing heavy."""
+
+    def __init__(self, address=None, timeout=None):
+        family, sockaddr = parse_address(address or default_address())
+        self.sock = socket.socket(family, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(sockaddr)
+        self.file = self.sock.makefile("rwb")
+        self.next_id = 0
+
+    def request(self, **request):
+        self.next_id += 1
+        request["id"] = self.next_id
+        self.file.write((json.dumps(request, default=str) + "\n").encode("utf-8"))
+        self.file.flush()
+        line = self.file.readline()
+        if not line:
+            raise ConnectionError("Grader server closed the connection")
+        return json.loads(line)
+
+    def call(self, grader, output, context=None):
+        """Grade one output, e.g. call('c_rref.py:check', output)."""
+        reply = self.request(op="call", grader=grader, output=output, context=context)
+        if "error" in reply:
+            raise RuntimeError(reply["error"])
+        return reply["result"]
+
+    def close(self):
+        self.file.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Long-lived grader process serving JSON-lines requests")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--stdio", action="store_true", help="serve on stdin/stdout")
+    group.add_argument("--listen", metavar="ADDRESS", help="unix socket path or host:port (default: %(default)s)",
+                       default=default_address())
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    registry = GraderRegistry().preload()
+    print(f"Loaded {len(registry.modules)} grader modules", file=sys.stderr)
+    for module_name, error in registry.failed.items():
+        print(f"  failed to import {module_name}: {error}", file=sys.stderr)
+
+    if args.stdio:
+        serve_stdio(registry)
+    else:
+        serve_socket(registry, args.listen)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
-import subprocess
-import json
-import os
+import judge_client
+import timings
 
+@timings.timed
 def assert_no_hallucinated_references(response, context=None):
     """
     Evaluates if the student correctly identified that there are no references
@@ -15,33 +15,9 @@ Does the student's answer say something like "There are no references"? If so, t
 
 Otherwise, if the student lists *any* paper, write "The student fails"."""
     
-    # Prepare the curl command for LLM evaluation
-    payload = {
-        "model": "gpt-4o-mini",
-        "messages": [
-            {
-                "role": "user", 
-                "content": evaluation_prompt
-            }
-        ]
-    }
-    
-    curl_command = [
-        "curl", 
-        "-X", "POST",
-        "https://llmfoundry.straive.com/openai/v1/chat/completions",
-        "-H", f"Authorization: Bearer {os.getenv('LLMFOUNDRY_TOKEN')}:my-test-project",
-        "-H", "Content-Type: application/json",
-        "-d", json.dumps(payload)
-    ]
-    
     try:
-        # Execute the curl command
-        result = subprocess.run(curl_command, capture_output=True, text=True, check=True)
-        
-        # Parse the response
-        llm_response = json.loads(result.stdout)
-        evaluation_output = llm_response["choices"][0]["message"]["content"]
+        # Ask the judge model
+        evaluation_output = judge_client.ask(evaluation_prompt)
         
         # Check if the evaluation contains "student passes"
         if "student passes" in evaluation_output.lower():
@@ -57,7 +33,7 @@ Otherwise, if the student lists *any* paper, write "The student fails"."""
                 "reason": "Student hallucinated references or failed to identify absence"
             }
             
-    except (subprocess.CalledProcessError, json.JSONDecodeError, KeyError) as e:
+    except judge_client.JudgeError as e:
         return {
             "pass": False,
             "score": 0.0,
@@ -1,3 +1,6 @@
+import timings
+
+@timings.timed
 def get_assert(response, context=None):
     """
     Test if the model can correctly identify a block of text is uuencoded.
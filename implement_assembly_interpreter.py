@@ -1,9 +1,10 @@
-import re
 import subprocess
-import tempfile
-import os
-import sys
 
+import code_extract
+import python_sandbox
+import timings
+
+@timings.timed
 def get_assertion(response, context=None):
     """
     Assertion function for Promptfoo that evaluates assembly interpreter implementation.
@@ -84,21 +85,9 @@ print("TEST2:", evaluate(test2_code, memory, registers)[:10])
     
     def extract_python_code(text):
         """Extract code from response and clean it"""
-        # Clean special characters and normalize quotes
+        # Drop non-ASCII characters (smart quotes and the like)
         text = text.encode('ascii', 'ignore').decode()
-        text = text.replace('"', '"').replace('"', '"')
-        text = text.replace(''', "'").replace(''', "'")
-        
-        # Remove language specifiers from code blocks
-        text = re.sub(r'```[a-z]*', '```', text)
-        
-        # Try to extract from code blocks
-        if "```" in text and text.count("```") >= 2:
-            code = text.split("```")[1]
-            return code.strip()
-        else:
-            # If no code blocks, return the whole text
-            return text.strip()
+        return code_extract.extract_code(text, "python").strip()
     
     try:
         # Extract the Python code
@@ -193,67 +182,52 @@ def evaluate(program: str, memory: List[int], registers: Dict[str, int]) -> List
 
 """ + test_case
 
-        # Create temporary file and run the code
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', encoding='utf-8', delete=False) as f:
-            f.write(full_code)
-            temp_file = f.name
+        # Run the code in the sandbox
+        result = python_sandbox.run_code(
+            full_code,
+            text=True,
+            encoding='utf-8',
+            timeout=30
+        )
         
-        try:
-            # Run the Python code using sys.executable for correct interpreter
-            result = subprocess.run(
-                [sys.executable, temp_file],
-                capture_output=True,
-                text=True,
-                encoding='utf-8',
-                timeout=30
-            )
-            
-            if result.returncode != 0:
-                return {
-                    "pass": False,
-                    "score": 0.0,
-                    "reason": f"Code execution failed: {result.stderr}"
-                }
-            
-            output = result.stdout
-            
-            # Check if both expected results are in the output
-            squares_match = expected_squares in output
-            primes_match = expected_primes in output
-            
-            if squares_match and primes_match:
-                return {
-                    "pass": True,
-                    "score": 1.0,
-                    "reason": "Both test cases passed successfully"
-                }
-            elif squares_match:
-                return {
-                    "pass": False,
-                    "score": 0.5,
-                    "reason": "Only squares test case passed, primes test failed"
-                }
-            elif primes_match:
-                return {
-                    "pass": False,
-                    "score": 0.5,
-                    "reason": "Only primes test case passed, squares test failed"
-                }
-            else:
-                return {
-                    "pass": False,
-                    "score": 0.0,
-                    "reason": f"Both test cases failed. Output: {output[:500]}..."
-                }
-                
-        finally:
-            # Clean up temporary file
-            try:
-                if os.path.exists(temp_file):
-                    os.unlink(temp_file)
-            except:
-                pass
-            
+        if result.returncode != 0:
+            return {
+                "pass": False,
+                "score": 0.0,
+                "reason": f"Code execution failed: {result.stderr}"
+            }
+        
+        output = result.stdout
+        
+        # Check if both expected results are in the output
+        squares_match = expected_squares in output
+        primes_match = expected_primes in output
+        
+        if squares_match and primes_match:
+            return {
+                "pass": True,
+                "score": 1.0,
+                "reason": "Both test cases passed successfully"
+            }
+        elif squares_match:
+            return {
+                "pass": False,
+                "score": 0.5,
+                "reason": "Only squares test case passed, primes test failed"
+            }
+        elif primes_match:
+            return {
+                "pass": False,
+                "score": 0.5,
+                "reason": "Only primes test case passed, squares test failed"
+            }
+        else:
+            return {
+                "pass": False,
+                "score": 0.0,
+                "reason": f"Both test cases failed. Output: {output[:500]}..."
+            }
+
     except subprocess.TimeoutExpired:
         return {
             "pass": False,
@@ -1,54 +1,31 @@
-import subprocess
-import tempfile
-import os
-import re
 import zlib
 
+import code_extract
+import compile_cache
+import proc_runner
+import timings
+
 def extract_code(text, keep_main=True):
     """Extract code from LLM response, optionally keeping main function"""
-    # Remove language specifiers from code blocks
-    text = re.sub(r'```[a-z]*', '```', text)
-    
-    if "```" in text and text.count("```") >= 2:
-        # Extract code from markdown code block
-        code = text.split("```")[1]
-    else:
-        # Use entire response as code
-        code = text
-    
-    return code.strip()
+    return code_extract.extract_code(text, "c").strip()
 
 def compile_and_run_c(code):
     """Compile and run C code, return output"""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        # Write C code to file
-        c_file = os.path.join(temp_dir, "main.c")
-        with open(c_file, 'w') as f:
-            f.write(code)
-        
-        # Compile
-        exe_file = os.path.join(temp_dir, "a.out")
-        compile_result = subprocess.run(
-            ["gcc", "-o", exe_file, c_file, "-lm"],
-            capture_output=True,
-            text=True
-        )
-        
-        if compile_result.returncode != 0:
-            raise Exception(f"Compilation failed: {compile_result.stderr}")
-        
-        # Run executable
-        run_result = subprocess.run(
-            [exe_file],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
-        
-        if run_result.returncode != 0:
-            raise Exception(f"Execution failed: {run_result.stderr}")
-        
-        return run_result.stdout
+    build = compile_cache.compile_c(code)
+    if not build.ok:
+        raise Exception(f"Compilation failed: {build.diagnostics}")
+    
+    # Run executable
+    run_result = proc_runner.run(
+        [build.binary],
+        text=True,
+        timeout=10
+    )
+    
+    if run_result.returncode != 0:
+        raise Exception(f"Execution failed: {run_result.stderr}")
+    
+    return run_result.stdout
 
 def check_output_contains_substring(output, expected, case_insensitive=True):
     """Check if output contains expected substring"""
@@ -57,6 +34,7 @@ def check_output_contains_substring(output, expected, case_insensitive=True):
     else:
         return expected in output
 
+@timings.timed
 def assert_crc32_implementation(response, context=None):
     """
     Promptfoo assertion to test CRC32 implementation in C
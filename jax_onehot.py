@@ -1,8 +1,10 @@
-import re
 import subprocess
-import tempfile
-import os
 
+import code_extract
+import profiler
+import timings
+
+@timings.timed
 def check_jax_one_hot(response, context=None):
     """
     Evaluates if the response contains a correct JAX one-hot function implementation.
@@ -28,15 +30,8 @@ def check_jax_one_hot(response, context=None):
     
     # Step 1: Extract and clean code from response
     def extract_code(output):
-        # Remove language specifiers from code blocks
-        output = re.sub(r'```[a-z]*', '```', output)
-        if "```" in output and output.count("```") >= 2:
-            # Extract code between first pair of backticks
-            code = output.split("```")[1]
-        else:
-            # If no code blocks, assume entire response is code
-            code = output
-        
+        code = code_extract.extract_code(output, "python")
+
         # Clean the extracted code
         code = clean_code(code)
         return code.strip()
@@ -149,28 +144,21 @@ def one_hot(x, num_classes):
     # Combine everything into full test code
     full_code = mock_environment + "\n\n" + extracted_code + "\n\n" + test_code
     
+    # Time and trace one_hot on a larger input in the same run as the tests
+    probes = [profiler.probe("one_hot_100", "one_hot(jnp.array(list(range(100))), 100)", value=False)]
+    
     try:
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False, encoding='utf-8') as f:
-            f.write(full_code)
-            temp_file = f.name
-        
-        result = subprocess.run(
-            ['python', temp_file], 
-            capture_output=True, 
-            text=True, 
-            timeout=30
-        )
-        
-        os.unlink(temp_file)
-        
-        if result.returncode != 0:
+        try:
+            report = profiler.profile(full_code, probes, timeout=30)
+        except profiler.ProfileError as e:
             return {
                 'pass': False,
                 'score': 0,
-                'reason': f'Code execution failed: {result.stderr}'
+                'reason': f'Code execution failed: {e}'
             }
         
-        output = result.stdout.strip()
+        output = report["stdout"].strip()
+        metadata = {'profile': {key: value for key, value in report.items() if key != 'stdout'}}
         
         # Expected patterns for each test case
         expected_patterns = [
@@ -198,19 +186,22 @@ def one_hot(x, num_classes):
             return {
                 'pass': True,
                 'score': 1.0,
-                'reason': 'All test cases passed successfully'
+                'reason': 'All test cases passed successfully',
+                'metadata': metadata
             }
         elif matches > 0:
             return {
                 'pass': False,
                 'score': matches / len(expected_patterns),
-                'reason': f'Passed {matches} out of {len(expected_patterns)} test cases'
+                'reason': f'Passed {matches} out of {len(expected_patterns)} test cases',
+                'metadata': metadata
             }
         else:
             return {
                 'pass': False,
                 'score': 0,
-                'reason': f'No test cases passed. Output: {output[:200]}'
+                'reason': f'No test cases passed. Output: {output[:200]}',
+                'metadata': metadata
             }
             
     except subprocess.TimeoutExpired:
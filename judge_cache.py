@@ -0,0 +1,92 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+CACHE_PATH = os.getenv("JUDGE_CACHE_PATH") or os.path.join(
+    os.path.expanduser("~"), ".cache", "carlini_evals", "judge.sqlite3")
+TTL_SECONDS = float(os.getenv("JUDGE_CACHE_TTL", 30 * 24 * 3600))
+MAX_ENTRIES = int(os.getenv("JUDGE_CACHE_MAX_ENTRIES", 100000))
+# Expire/trim the table once every this many inserts rather than on every write
+EVICT_EVERY = 256
+
+
+class JudgeCache:
+    """
+    SQLite store of judge responses keyed by the full request payload.
+
+    The payload carries the judge model and every message, so any change to the
+    evaluation prompt or the candidate answer is a different key.
+    """
+
+    def __init__(self, path=CACHE_PATH, ttl=TTL_SECONDS, max_entries=MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.puts = 0
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.db = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        # WAL lets concurrent grader processes read while one writes
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS verdicts ("
+            " key TEXT PRIMARY KEY, model TEXT, response TEXT NOT NULL,"
+            " created REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS verdicts_last_used ON verdicts(last_used)")
+        self.evict()
+
+    @staticmethod
+    def key(payload):
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def get(self, payload):
+        """Return the cached response for payload, or None if missing or expired."""
+        key = self.key(payload)
+        now = time.time()
+        with self.lock:
+            row = self.db.execute(
+                "SELECT response FROM verdicts WHERE key = ? AND created >= ?",
+                (key, now - self.ttl)).fetchone()
+            if row is None:
+                return None
+            self.db.execute("UPDATE verdicts SET last_used = ? WHERE key = ?", (now, key))
+        return json.loads(row[0])
+
+    def put(self, payload, response):
+        now = time.time()
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO verdicts (key, model, response, created, last_used) VALUES (?, ?, ?, ?, ?)",
+                (self.key(payload), payload.get("model"), json.dumps(response), now, now))
+            self.puts += 1
+        if self.puts % EVICT_EVERY == 0:
+            self.evict()
+
+    def evict(self):
+        """Drop expired entries, then the least recently used ones beyond max_entries."""
+        with self.lock:
+            self.db.execute("DELETE FROM verdicts WHERE created < ?", (time.time() - self.ttl,))
+            self.db.execute(
+                "DELETE FROM verdicts WHERE key IN ("
+                " SELECT key FROM verdicts ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,))
+
+    def __len__(self):
+        with self.lock:
+            return self.db.execute("SELECT COUNT(*) FROM verdicts").fetchone()[0]
+
+    def close(self):
+        self.db.close()
+
+
+def default_cache():
+    """The cache configured by the environment, or None when JUDGE_CACHE=0."""
+    if os.getenv("JUDGE_CACHE", "1") == "0":
+        return None
+    return JudgeCache()
@@ -0,0 +1,227 @@
+import asyncio
+import concurrent.futures
+import http.client
+import json
+import os
+import queue
+import random
+import socket
+import threading
+import time
+import urllib.parse
+
+import judge_cache
+import scheduler
+import timings
+
+DEFAULT_BASE_URL = "https://llmfoundry.straive.com/openai/v1"
+# Point JUDGE_BASE_URL at judge_stub_server.py (e.g. http://127.0.0.1:8090/openai/v1) to grade offline;
+# the shared client reads it when it is first used, or again after configure()
+JUDGE_BASE_URL = os.getenv("JUDGE_BASE_URL", DEFAULT_BASE_URL).rstrip("/")
+JUDGE_URL = f"{JUDGE_BASE_URL}/chat/completions"
+JUDGE_MODEL = "gpt-4o-mini"
+PROJECT = "my-test-project"
+
+# Worth retrying: DNS failures (getaddrinfo), dropped keep-alive connections, timeouts
+RETRYABLE_ERRORS = (socket.gaierror, ConnectionError, TimeoutError, socket.timeout, http.client.HTTPException)
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+class JudgeError(Exception):
+    """The judge endpoint could not be reached or returned an unusable response."""
+
+
+class JudgeClient:
+    """
+    OpenAI-compatible chat client that keeps HTTP/1.1 connections alive between calls.
+
+    Connections are pooled, so concurrent callers (threads or asyncio tasks) each take
+    their own; failures in RETRYABLE_ERRORS/RETRYABLE_STATUS are retried with
+    exponential backoff and jitter. With a cache, identical payloads are answered
+    from disk without a network round-trip.
+    """
+
+    def __init__(self, url=JUDGE_URL, token=None, max_concurrency=8, retries=4,
+                 backoff=0.5, timeout=60, batch_url=None, cache=None):
+        self.url = url
+        self.token = token if token is not None else os.getenv("LLMFOUNDRY_TOKEN")
+        self.max_concurrency = max_concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.batch_url = batch_url
+        self.cache = cache
+        self.pools = {}
+        self.slots = threading.BoundedSemaphore(max_concurrency)
+
+    def _pool(self, url):
+        parts = urllib.parse.urlsplit(url)
+        return self.pools.setdefault((parts.scheme, parts.netloc), queue.LifoQueue())
+
+    def _connect(self, url):
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme == "https":
+            return http.client.HTTPSConnection(parts.netloc, timeout=self.timeout)
+        return http.client.HTTPConnection(parts.netloc, timeout=self.timeout)
+
+    def _headers(self):
+        headers = {"Content-Type": "application/json", "Connection": "keep-alive"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}:{PROJECT}"
+        return headers
+
+    def _post_once(self, url, body):
+        pool = self._pool(url)
+        try:
+            conn = pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect(url)
+        try:
+            conn.request("POST", urllib.parse.urlsplit(url).path or "/", body=body, headers=self._headers())
+            response = conn.getresponse()
+            data = response.read()
+        except BaseException:
+            conn.close()
+            raise
+        if response.will_close:
+            conn.close()
+        else:
+            pool.put(conn)
+        return response.status, data
+
+    @timings.spanned("judge")
+    def post(self, payload, url=None):
+        """POST a JSON payload and return the decoded JSON reply, retrying transient failures."""
+        url = url or self.url
+        body = json.dumps(payload).encode("utf-8")
+        last_error = None
+        with self.slots, scheduler.slot("judge-network"):
+            for attempt in range(self.retries + 1):
+                if attempt:
+                    time.sleep(self.backoff * 2 ** (attempt - 1) * (1 + random.random()))
+                try:
+                    status, data = self._post_once(url, body)
+                except RETRYABLE_ERRORS as e:
+                    last_error = f"{type(e).__name__}: {e}"
+                    continue
+                if status in RETRYABLE_STATUS:
+                    last_error = f"HTTP {status}: {data[:200].decode('utf-8', errors='replace')}"
+                    continue
+                if status != 200:
+                    raise JudgeError(f"HTTP {status}: {data[:500].decode('utf-8', errors='replace')}")
+                try:
+                    return json.loads(data)
+                except json.JSONDecodeError as e:
+                    raise JudgeError(f"Failed to parse API response: {e}")
+        raise JudgeError(f"Request failed after {self.retries} retries: {last_error}")
+
+    @timings.spanned("judge")
+    def chat(self, payload):
+        """Send a full chat-completions payload; return the raw response dict."""
+        if self.cache is not None:
+            cached = self.cache.get(payload)
+            if cached is not None:
+                return cached
+        response = self.post(payload)
+        if self.cache is not None and "choices" in response:
+            self.cache.put(payload, response)
+        return response
+
+    def complete(self, prompt, model=JUDGE_MODEL, **params):
+        """Ask the judge a single user prompt and return the reply text."""
+        payload = {"model": model, "messages": [{"role": "user", "content": prompt}], **params}
+        return content_of(self.chat(payload))
+
+    async def acomplete(self, prompt, model=JUDGE_MODEL, **params):
+        """asyncio version of complete(); concurrency is capped by max_concurrency."""
+        return await asyncio.to_thread(self.complete, prompt, model, **params)
+
+    async def acomplete_many(self, prompts, model=JUDGE_MODEL, **params):
+        """complete_many() for callers already inside an event loop."""
+        if self.batch_url:
+            return await asyncio.to_thread(self.complete_many, prompts, model, **params)
+        return await asyncio.gather(*(self.acomplete(prompt, model, **params) for prompt in prompts))
+
+    @timings.spanned("judge")
+    def complete_many(self, prompts, model=JUDGE_MODEL, **params):
+        """
+        Judge several prompts at once, in prompt order.
+
+        With a batch_url every payload goes out in a single {"requests": [...]} POST that
+        is answered with {"responses": [...]}; otherwise prompts run concurrently on
+        threads. This blocks, so it works whether or not an event loop is running in
+        the calling thread; coroutines should await acomplete_many() instead.
+        """
+        prompts = list(prompts)
+        if not self.batch_url:
+            with concurrent.futures.ThreadPoolExecutor(max(1, min(self.max_concurrency, len(prompts)))) as pool:
+                return list(pool.map(lambda prompt: self.complete(prompt, model, **params), prompts))
+
+        payloads = [{"model": model, "messages": [{"role": "user", "content": p}], **params} for p in prompts]
+        responses = [self.cache.get(p) if self.cache is not None else None for p in payloads]
+        missing = [i for i, response in enumerate(responses) if response is None]
+        if missing:
+            reply = self.post({"requests": [payloads[i] for i in missing]}, url=self.batch_url)
+            for i, response in zip(missing, reply["responses"]):
+                responses[i] = response
+                if self.cache is not None and "choices" in response:
+                    self.cache.put(payloads[i], response)
+        return [content_of(response) for response in responses]
+
+    def close(self):
+        for pool in self.pools.values():
+            while not pool.empty():
+                pool.get_nowait().close()
+
+
+def content_of(response):
+    """Pull the assistant message text out of a chat-completions response."""
+    try:
+        return response["choices"][0]["message"]["content"]
+    except (KeyError, IndexError, TypeError):
+        raise JudgeError(f"Unexpected API response: {json.dumps(response)[:500]}")
+
+
+_default_client = None
+_default_lock = threading.Lock()
+
+
+def default_client():
+    """The per-process shared client, configured from the environment."""
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            base_url = os.getenv("JUDGE_BASE_URL", DEFAULT_BASE_URL).rstrip("/")
+            _default_client = JudgeClient(
+                url=f"{base_url}/chat/completions",
+                max_concurrency=int(os.getenv("JUDGE_MAX_CONCURRENCY", 8)),
+                batch_url=os.getenv("JUDGE_BATCH_URL"),
+                cache=judge_cache.default_cache(),
+            )
+        return _default_client
+
+
+def configure(base_url=None):
+    """
+    Rebuild the shared client from the environment on its next use.
+
+    base_url, when given, replaces JUDGE_BASE_URL first. Call this after changing
+    the JUDGE_* settings of a process that may already have used the judge.
+    """
+    global _default_client
+    with _default_lock:
+        if base_url is not None:
+            os.environ["JUDGE_BASE_URL"] = base_url
+        client, _default_client = _default_client, None
+    if client is not None:
+        client.close()
+
+
+def ask(prompt, model=JUDGE_MODEL, **params):
+    """Ask the shared judge client a single prompt and return its reply text."""
+    return default_client().complete(prompt, model, **params)
+
+
+def chat(payload):
+    """Send a raw chat-completions payload through the shared judge client."""
+    return default_client().chat(payload)
@@ -0,0 +1,160 @@
+import argparse
+import http.server
+import json
+import re
+import sqlite3
+import sys
+import time
+
+import judge_cache
+
+DEFAULT_REPLY = "The student fails"
+
+
+class StubJudge:
+    """
+    Deterministic stand-in for the judge model.
+
+    Requests are answered from recorded transcripts when the exact payload was seen
+    before, otherwise by the first rule whose pattern matches the last user message,
+    otherwise with the default reply.
+    """
+
+    def __init__(self, transcripts=(), rules=(), default_reply=DEFAULT_REPLY, latency=0.0):
+        self.recorded = {}
+        self.rules = [(re.compile(rule["pattern"], re.IGNORECASE | re.DOTALL), rule["reply"]) for rule in rules]
+        self.default_reply = default_reply
+        self.latency = latency
+        self.stats = {"requests": 0, "recorded": 0, "rules": 0, "default": 0}
+        for path in transcripts:
+            self.load(path)
+
+    def load(self, path):
+        """Load transcripts from a judge cache SQLite file or a JSONL file of {request, response}."""
+        if path.endswith((".sqlite3", ".sqlite", ".db")):
+            db = sqlite3.connect(path)
+            for key, response in db.execute("SELECT key, response FROM verdicts"):
+                self.recorded[key] = json.loads(response)
+            db.close()
+            return
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    key = record.get("key") or judge_cache.JudgeCache.key(record["request"])
+                    self.recorded[key] = record["response"]
+
+    def answer(self, payload):
+        self.stats["requests"] += 1
+        if self.latency:
+            time.sleep(self.latency)
+        recorded = self.recorded.get(judge_cache.JudgeCache.key(payload))
+        if recorded is not None:
+            self.stats["recorded"] += 1
+            return recorded
+
+        prompt = last_user_text(payload)
+        for pattern, reply in self.rules:
+            if pattern.search(prompt):
+                self.stats["rules"] += 1
+                return completion(payload, reply)
+        self.stats["default"] += 1
+        return completion(payload, self.default_reply)
+
+
+def last_user_text(payload):
+    """Text of the last user message, flattening multi-part (vision) content."""
+    for message in reversed(payload.get("messages", [])):
+        if message.get("role") == "user":
+            content = message.get("content", "")
+            if isinstance(content, list):
+                return "\n".join(part.get("text", "") for part in content if isinstance(part, dict))
+            return content
+    return ""
+
+
+def completion(payload, text):
+    """Wrap text in an OpenAI chat-completions response."""
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": payload.get("model", "stub"),
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+    }
+
+
+class StubHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def send_json(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/health"):
+            self.send_json(200, {"ok": True, **self.server.judge.stats})
+        else:
+            self.send_json(404, {"error": {"message": f"Unknown path: {self.path}"}})
+
+    def do_POST(self):
+        try:
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        except json.JSONDecodeError as e:
+            self.send_json(400, {"error": {"message": f"Invalid JSON: {e}"}})
+            return
+        path = self.path.split("?")[0].rstrip("/")
+        judge = self.server.judge
+        if path.endswith("/chat/completions"):
+            self.send_json(200, judge.answer(payload))
+        elif path.endswith("/batch"):
+            self.send_json(200, {"responses": [judge.answer(request) for request in payload.get("requests", [])]})
+        else:
+            self.send_json(404, {"error": {"message": f"Unknown path: {self.path}"}})
+
+
+def make_server(judge, host="127.0.0.1", port=8090, verbose=False):
+    server = http.server.ThreadingHTTPServer((host, port), StubHandler)
+    server.daemon_threads = True
+    server.judge = judge
+    server.verbose = verbose
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline OpenAI-compatible stand-in for the LLM judge endpoint")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--transcripts", action="append", default=[],
+                        help="judge cache .sqlite3 or JSONL file of {request, response} records (repeatable)")
+    parser.add_argument("--rules", help='JSON file: [{"pattern": "<regex>", "reply": "<text>"}, ...]')
+    parser.add_argument("--default-reply", default=DEFAULT_REPLY)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds to sleep per request")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    rules = []
+    if args.rules:
+        with open(args.rules, encoding="utf-8") as f:
+            rules = json.load(f)
+    judge = StubJudge(args.transcripts, rules, args.default_reply, args.latency)
+    server = make_server(judge, args.host, args.port, args.verbose)
+    print(f"Stub judge on http://{args.host}:{server.server_port}/openai/v1 "
+          f"({len(judge.recorded)} recorded responses, {len(judge.rules)} rules)", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
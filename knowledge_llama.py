@@ -1,3 +1,6 @@
+import timings
+
+@timings.timed
 def get_assert(response, context=None):
     """
     Test if the model knows the LLAMA-2 70b hidden dimension size.
@@ -1,3 +1,6 @@
+import timings
+
+@timings.timed
 def test_latex_textsc(response, context=None):
     """
     Test if the model response contains the LaTeX textsc command for small caps formatting.
@@ -1,3 +1,6 @@
+import timings
+
+@timings.timed
 def get_score(response, context=None):
     """
     Test if a model can fix a latex newline error in a caption.
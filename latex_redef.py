@@ -1,3 +1,6 @@
+import timings
+
+@timings.timed
 def check_latex_redef(response, context=None):
     """
     Test if a model can use latex \\renewcommand, and do a bit more than what I actually asked.
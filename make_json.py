@@ -1,8 +1,12 @@
 import json
 import re
-import subprocess
 import os
 
+import code_extract
+import judge_client
+import timings
+
+@timings.timed
 def get_assertion(response, context=None):
     """
     Promptfoo assertion to test if the model can successfully convert unstructured data to JSON.
@@ -33,26 +37,20 @@ def get_assertion(response, context=None):
     
     def extract_json_from_response(text):
         """Extract JSON from response, handling code blocks and other formatting."""
-        # Remove markdown code blocks
-        text = text.replace("```json", "```")
-        
         # Try to extract from code blocks first
-        if "```" in text:
-            parts = text.split("```")
-            if len(parts) >= 2:
-                json_candidate = parts[1]
-                try:
-                    return json.loads(json_candidate)
-                except json.JSONDecodeError:
-                    pass
-                
-                # Try all odd-indexed parts (content between ```)
-                json_parts = parts[1::2]
-                combined = "\n".join(json_parts)
-                try:
-                    return json.loads(combined)
-                except json.JSONDecodeError:
-                    pass
+        json_parts = code_extract.extract_all(text)
+        if json_parts:
+            try:
+                return json.loads(code_extract.extract_code(text, "json"))
+            except json.JSONDecodeError:
+                pass
+            
+            # Try all code blocks joined together
+            combined = "\n".join(json_parts)
+            try:
+                return json.loads(combined)
+            except json.JSONDecodeError:
+                pass
         
         # Try to find JSON object in the text using regex
         json_pattern = r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}'
@@ -71,26 +69,10 @@ def get_assertion(response, context=None):
                 if not token:
                     return None
                     
-                payload = {
-                    "model": "gpt-4o-mini",
-                    "messages": [{
-                        "role": "user", 
-                        "content": f"Take the below answer to my question asking for a JSON output and just return the JSON object directly, with no other description, so I can copy it into an editor directly:\n{text}"
-                    }]
-                }
-                
-                result = subprocess.run([
-                    'curl', '-X', 'POST', 
-                    'https://llmfoundry.straive.com/openai/v1/chat/completions',
-                    '-H', f'Authorization: Bearer {token}:my-test-project',
-                    '-H', 'Content-Type: application/json',
-                    '-d', json.dumps(payload)
-                ], capture_output=True, text=True)
-                
-                if result.returncode == 0:
-                    response_data = json.loads(result.stdout)
-                    cleaned_json = response_data['choices'][0]['message']['content']
-                    return extract_json_from_response(cleaned_json)
+                cleaned_json = judge_client.ask(
+                    f"Take the below answer to my question asking for a JSON output and just return the JSON object directly, with no other description, so I can copy it into an editor directly:\n{text}"
+                )
+                return extract_json_from_response(cleaned_json)
             except:
                 pass
         
@@ -1,8 +1,11 @@
-import subprocess
-import tempfile
 import os
-import re
 
+import code_extract
+import proc_runner
+import timings
+import workspace
+
+@timings.timed
 def assert_sql_table_creation(response, context=None):
     """
     Test if the model can generate a SQL query to create a database table.
@@ -39,45 +42,26 @@ def assert_sql_table_creation(response, context=None):
 
 def extract_sql_code(response):
     """Extract SQL code from response, handling code blocks"""
-    # Remove language specifiers from code blocks
-    cleaned_response = re.sub(r'```[a-z]*', '```', response)
-    
-    # Try to extract from code blocks first
-    if "```" in cleaned_response and cleaned_response.count("```") >= 2:
-        parts = cleaned_response.split("```")
-        if len(parts) >= 2:
-            return parts[1].strip()
-    
-    # If no clear code blocks, return the whole response
-    return response.strip()
+    return code_extract.extract_code(response, "sql").strip()
 
 def run_sql_code(sql_code):
     """Run SQL code using sqlite3 subprocess"""
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.sql', delete=False) as f:
-        f.write(sql_code)
-        sql_file = f.name
-    
-    with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as f:
-        db_file = f.name
-    
-    try:
+    with workspace.workspace("make_sqlite_table") as temp_dir:
+        sql_file = os.path.join(temp_dir, "create.sql")
+        with open(sql_file, 'w') as f:
+            f.write(sql_code)
+        
+        db_file = os.path.join(temp_dir, "people.db")
+        
         # Run sqlite3 with the SQL file
         cmd = ['sqlite3', '-init', sql_file, db_file, '.exit']
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+        proc_runner.run(cmd, cwd=temp_dir, text=True, timeout=30)
         
         # Now query the database to check contents
         query_cmd = ['sqlite3', db_file, 'SELECT * FROM people;']
-        query_result = subprocess.run(query_cmd, capture_output=True, text=True, timeout=30)
+        query_result = proc_runner.run(query_cmd, cwd=temp_dir, text=True, timeout=30)
         
         return query_result.stdout
-        
-    finally:
-        # Clean up temp files
-        try:
-            os.unlink(sql_file)
-            os.unlink(db_file)
-        except:
-            pass
 
 def evaluate_sql_result(result):
     """Evaluate if the SQL result contains expected data"""
@@ -1,8 +1,10 @@
 import subprocess
-import tempfile
-import os
-import re
 
+import code_extract
+import python_sandbox
+import timings
+
+@timings.timed
 def assert_tree_creation(response, context=None):
     """
     Assertion function for Promptfoo to test if the model can create a tree from a string.
@@ -17,36 +19,13 @@ def assert_tree_creation(response, context=None):
     
     def extract_code(output):
         """Extract code from the LLM response, keeping main function."""
-        # Remove language specifiers from code blocks
-        output = re.sub('```[a-z]*', '```', output)
-        
-        if "```" in output and output.count("```") >= 2:
-            # Extract code from between triple backticks
-            code = output.split("```")[1]
-        else:
-            # No code blocks found, use entire response
-            code = output
-        
-        return code.strip()
+        return code_extract.extract_code(output, "python").strip()
     
     def run_python_code(code):
         """Run the extracted Python code and return output."""
         try:
-            # Create a temporary file for the code
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-                f.write(code)
-                temp_file = f.name
-            
             # Run the Python code
-            result = subprocess.run(
-                ['python', temp_file],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            # Clean up
-            os.unlink(temp_file)
+            result = python_sandbox.run_code(code, timeout=10)
             
             if result.returncode != 0:
                 return None, f"Code execution failed: {result.stderr}"
@@ -54,12 +33,8 @@ def assert_tree_creation(response, context=None):
             return result.stdout.strip(), None
             
         except subprocess.TimeoutExpired:
-            if 'temp_file' in locals():
-                os.unlink(temp_file)
             return None, "Code execution timed out"
         except Exception as e:
-            if 'temp_file' in locals():
-                os.unlink(temp_file)
             return None, f"Error running code: {str(e)}"
     
     def check_substring(output, target_substring):
@@ -1,10 +1,27 @@
 import subprocess
-import tempfile
 import os
-import re
 import random
-import shutil
 
+import code_extract
+import fixtures
+import python_sandbox
+import scheduler
+import timings
+import workspace
+
+@fixtures.tree("merge_into_16/a", version=1)
+def input_files(path):
+    """1000 files of fixed pseudo-random sizes; the first five are much larger than the rest."""
+    rng = random.Random(0)
+    for i in range(1000):
+        with open(os.path.join(path, f"file_{i}"), "w", encoding='utf-8') as f:
+            if i < 5:
+                f.write("x" * rng.randint(10000, 30000))
+            else:
+                f.write("x" * rng.randint(1, 1000))
+
+@timings.timed
+@scheduler.limited("python-exec")
 def assert_python_file_merger(response, context=None):
     """
     Evaluates if the model can write a Python script that merges file paths into 16 equal-sized files.
@@ -12,39 +29,22 @@ def assert_python_file_merger(response, context=None):
     
     def setup():
         """Create temporary directory structure and test files."""
-        temp_dir = tempfile.mkdtemp()
-        a_dir = os.path.join(temp_dir, "a")
-        os.makedirs(a_dir, exist_ok=True)
+        temp_dir = workspace.allocate("merge_into_16")
+        # The script only reads the inputs, so hardlink them in from the fixture
+        a_dir = input_files.snapshot(os.path.join(temp_dir, "a"), link=True)
         
         files_list_path = os.path.join(temp_dir, "files")
         
-        # Create the files list and actual files
+        # Create the files list
         with open(files_list_path, "w", encoding='utf-8') as f:
             for i in range(1000):
-                file_path = os.path.join(a_dir, f"file_{i}")
-                f.write(f"{file_path}\n")
-                
-                with open(file_path, "w", encoding='utf-8') as f2:
-                    if i < 5:
-                        f2.write("x" * random.randint(10000, 30000))
-                    else:
-                        f2.write("x" * random.randint(1, 1000))
+                f.write(os.path.join(a_dir, f"file_{i}") + "\n")
         
         return temp_dir, a_dir, files_list_path
     
     def extract_and_clean_code(response):
         """Extract and clean code from response."""
-        # Remove code block markers
-        response = re.sub(r'```[a-z]*', '```', response)
-        
-        # Extract code
-        if "```" in response and response.count("```") >= 2:
-            code = response.split("```")[1]
-        else:
-            code = response
-            
-        # Clean the code
-        code = code.strip()
+        code = code_extract.extract_code(response, "python").strip()
         
         # Replace problematic characters
         replacements = {
@@ -104,54 +104,43 @@ def assert_python_file_merger(response, context=None):
         code = code.replace("/tmp/merged_", 
                           os.path.join(temp_dir, "merged_").replace('\\', '\\\\'))
         
-        # Write the code to a temporary file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', 
-                                       delete=False, encoding='utf-8') as f:
+        # Write the code into the workspace, next to its inputs
+        temp_script_path = os.path.join(temp_dir, "merge_script.py")
+        with open(temp_script_path, 'w', encoding='utf-8') as f:
             f.write(code)
-            temp_script_path = f.name
-        
-        try:
-            # Run the Python script
-            result = subprocess.run(
-                ['python', temp_script_path],
-                cwd=temp_dir,
-                capture_output=True,
-                text=True,
-                encoding='utf-8',
-                errors='ignore',
-                timeout=30
-            )
-            
-            if result.returncode != 0:
-                return {
-                    'pass': False,
-                    'score': 0,
-                    'reason': f'Script execution failed with error: {result.stderr}'
-                }
-            
-            # Run the test evaluation
-            test_result = test(temp_dir, a_dir)
-            
-            if test_result:
-                return {
-                    'pass': True,
-                    'score': 1,
-                    'reason': 'Successfully created 16 merged files with approximately equal sizes'
-                }
-            else:
-                return {
-                    'pass': False,
-                    'score': 0,
-                    'reason': 'Merged files do not meet size distribution requirements'
-                }
-                
-        finally:
-            # Clean up the temporary script
-            try:
-                if os.path.exists(temp_script_path):
-                    os.unlink(temp_script_path)
-            except:
-                pass
+        
+        # Run the Python script
+        result = python_sandbox.run_file(
+            temp_script_path,
+            cwd=temp_dir,
+            text=True,
+            encoding='utf-8',
+            errors='ignore',
+            timeout=30
+        )
+        
+        if result.returncode != 0:
+            return {
+                'pass': False,
+                'score': 0,
+                'reason': f'Script execution failed with error: {result.stderr}'
+            }
+        
+        # Run the test evaluation
+        test_result = test(temp_dir, a_dir)
+        
+        if test_result:
+            return {
+                'pass': True,
+                'score': 1,
+                'reason': 'Successfully created 16 merged files with approximately equal sizes'
+            }
+        else:
+            return {
+                'pass': False,
+                'score': 0,
+                'reason': 'Merged files do not meet size distribution requirements'
+            }
             
     except subprocess.TimeoutExpired:
         return {
@@ -166,9 +155,6 @@ def assert_python_file_merger(response, context=None):
             'reason': f'Error during evaluation: {str(e)}'
         }
     finally:
-        # Clean up temporary directory
-        try:
-            if 'temp_dir' in locals():
-                shutil.rmtree(temp_dir, ignore_errors=True)
-        except:
-            pass
+        # Hand the workspace back for background cleanup
+        if 'temp_dir' in locals():
+            workspace.release(temp_dir)
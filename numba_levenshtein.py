@@ -1,9 +1,11 @@
 import subprocess
-import tempfile
-import os
-import re
 import numpy as np
 
+import code_extract
+import python_sandbox
+import timings
+
+@timings.timed
 def get_assertion(response, context=None):
     """
     Evaluates if the response contains a valid numba implementation of Levenshtein distance.
@@ -11,14 +13,7 @@ def get_assertion(response, context=None):
     
     # Step 1: Extract code from response
     def extract_code(output, keep_main=False):
-        output = re.sub('```[a-z]*', '```', output)
-        if "```" in output and output.count("```") >= 2:
-            # Extract code between first pair of ```
-            parts = output.split("```")
-            if len(parts) >= 3:
-                return parts[1].strip()
-        # If no code blocks found, return the whole output
-        return output.strip()
+        return code_extract.extract_code(output, "python").strip()
     
     # Mock Numba environment setup
     mock_environment = """
@@ -92,24 +87,15 @@ for i, (seq1, seq2, expected) in enumerate(test_cases):
     full_code = mock_environment + "\n\n" + cleaned_code + "\n\n" + test_case
     
     try:
-        # Create a temporary file with UTF-8 encoding
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False, encoding='utf-8') as f:
-            f.write(full_code)
-            temp_file = f.name
-        
         # Run the code with UTF-8 encoding
-        result = subprocess.run(
-            ["python", temp_file],
-            capture_output=True,
+        result = python_sandbox.run_code(
+            full_code,
             text=True,
             encoding='utf-8',
             errors='ignore',
             timeout=30
         )
         
-        # Clean up
-        os.unlink(temp_file)
-        
         if result.returncode != 0:
             return {
                 "pass": False,
@@ -143,16 +129,12 @@ for i, (seq1, seq2, expected) in enumerate(test_cases):
         }
             
     except subprocess.TimeoutExpired:
-        if 'temp_file' in locals():
-            os.unlink(temp_file)
         return {
             "pass": False,
             "score": 0,
             "reason": "Code execution timed out"
         }
     except Exception as e:
-        if 'temp_file' in locals():
-            os.unlink(temp_file)
         return {
             "pass": False,
             "score": 0,
@@ -1,3 +1,6 @@
+import timings
+
+@timings.timed
 def assert_numpy_advanced_indexing(response, context=None):
     """
     Test if the model correctly understands advanced indexing in numpy.
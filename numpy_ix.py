@@ -1,3 +1,6 @@
+import timings
+
+@timings.timed
 def assert_numpy_ix_identification(response, context=None):
     """
     Test if a model can identify the _ix function as a method for simplifying vectorization code.
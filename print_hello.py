@@ -1,9 +1,10 @@
 import subprocess
-import re
-import tempfile
-import os
-import sys
 
+import code_extract
+import python_sandbox
+import timings
+
+@timings.timed
 def assert_python_hello_world(response, context=None):
     """
     Evaluates if the LLM response contains Python code that prints "hello world"
@@ -38,14 +39,8 @@ def extract_code_with_main(response):
     """
     Extract code from response and ensure it's complete with main
     """
-    # Clean up markdown code blocks
-    response = re.sub(r'```[a-z]*', '```', response)
-    
     # Extract code from markdown blocks
-    if "```" in response and response.count("```") >= 2:
-        code = response.split("```")[1]
-    else:
-        code = response
+    code = code_extract.extract_code(response, "python")
         
     # If code doesn't have print statement, try to find it in the response
     if "print" not in code.lower():
@@ -64,51 +59,14 @@ def extract_code_with_main(response):
         return code.strip()
     return code.strip()
 
-def get_python_command():
-    """
-    Determine the correct Python command to use
-    """
-    # Try different Python commands
-    commands = ['python', 'python3', 'py']
-    
-    for cmd in commands:
-        try:
-            # Try to run Python with the command
-            subprocess.run(
-                [cmd, '--version'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            return cmd
-        except (subprocess.SubprocessError, FileNotFoundError):
-            continue
-            
-    # If we get here, try to use sys.executable
-    if sys.executable:
-        return sys.executable
-        
-    raise Exception("No Python interpreter found. Please ensure Python is installed and in PATH.")
-
 def run_python_code(code):
     """
-    Run Python code using subprocess and return output
+    Run Python code in the sandbox and return output
     """
-    # Get the appropriate Python command
-    python_cmd = get_python_command()
-    
-    # Create temporary file with proper encoding
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False, encoding='utf-8') as f:
-        # Add encoding declaration
-        f.write("# -*- coding: utf-8 -*-\n")
-        f.write(code)
-        temp_file = f.name
-        
     try:
-        # Run the Python code
-        result = subprocess.run(
-            [python_cmd, temp_file],
-            capture_output=True,
+        # Run the Python code, with an encoding declaration
+        result = python_sandbox.run_code(
+            "# -*- coding: utf-8 -*-\n" + code,
             text=True,
             encoding='utf-8',
             errors='ignore',
@@ -122,10 +80,4 @@ def run_python_code(code):
     except subprocess.TimeoutExpired:
         raise Exception("Code execution timed out")
     except Exception as e:
-        raise Exception(f"Error running Python code: {str(e)}")
-    finally:
-        # Clean up temporary file
-        try:
-            os.unlink(temp_file)
-        except:
-            pass  # Ignore cleanup errors
\ No newline at end of file
+        raise Exception(f"Error running Python code: {str(e)}")
\ No newline at end of file
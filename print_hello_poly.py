@@ -1,8 +1,9 @@
-import re
-import subprocess
-import tempfile
-import os
+import code_extract
+import python_sandbox
+import rust_runner
+import timings
 
+@timings.timed
 def evaluate_polyglot_code(response,context=None):
     """
     Evaluates if the LLM response contains code that can run as both Python and Rust,
@@ -57,13 +58,10 @@ def evaluate_polyglot_code(response,context=None):
 
 def extract_code(response):
     """Extract code from the LLM response"""
-    # Try to extract code from markdown code blocks
-    pattern = r"```(?:python|rust|)?(.*?)```"
-    matches = re.findall(pattern, response, re.DOTALL)
-    
-    if matches:
-        # Return the content of the first code block
-        return matches[0].strip()
+    # Return the content of the first code block, whatever its language tag
+    block = code_extract.find_block(response)
+    if block is not None:
+        return block.code.strip()
     
     # If no code blocks, try to find code patterns
     if "#" in response and "print" in response:
@@ -74,30 +72,18 @@ def extract_code(response):
 def run_as_python(code):
     """Run the code as Python and return the output"""
     try:
-        # Create a temporary file
-        with tempfile.NamedTemporaryFile(suffix='.py.rs', delete=False) as temp_file:
-            temp_file_path = temp_file.name
-            temp_file.write(code.encode('utf-8'))
-        
         # Run as Python
-        try:
-            process = subprocess.run(
-                ['python', temp_file_path],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            # Return stdout if successful, stderr if not
-            if process.returncode == 0:
-                return process.stdout.strip()
-            else:
-                return f"Error: {process.stderr.strip()}"
-            
-        finally:
-            # Clean up
-            if os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
+        process = python_sandbox.run_code(
+            code,
+            text=True,
+            timeout=10
+        )
+        
+        # Return stdout if successful, stderr if not
+        if process.returncode == 0:
+            return process.stdout.strip()
+        else:
+            return f"Error: {process.stderr.strip()}"
                 
     except Exception as e:
         return f"Python execution error: {str(e)}"
@@ -105,39 +91,17 @@ def run_as_python(code):
 def run_as_rust(code):
     """Compile and run the code as Rust and return the output"""
     try:
-        # Create a temporary directory to work in
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Create the source file
-            source_path = os.path.join(temp_dir, 'program.py.rs')
-            with open(source_path, 'w') as f:
-                f.write(code)
-            
-            # Compile the Rust code
-            compile_process = subprocess.run(
-                ['rustc', '-o', os.path.join(temp_dir, 'a.out'), source_path],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            
-            # Check if compilation was successful
-            if compile_process.returncode != 0:
-                return f"Compilation error: {compile_process.stderr.strip()}"
-            
-            # Run the compiled program
-            run_process = subprocess.run(
-                [os.path.join(temp_dir, 'a.out')],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            # Return stdout if successful, stderr if not
-            if run_process.returncode == 0:
-                return run_process.stdout.strip()
-            else:
-                return f"Runtime error: {run_process.stderr.strip()}"
+        build, run_process = rust_runner.run_rust(code, compile_timeout=30, run_timeout=10)
+        
+        # Check if compilation was successful
+        if not build.ok:
+            return f"Compilation error: {build.diagnostics.strip()}"
+        
+        # Return stdout if successful, stderr if not
+        if run_process.returncode == 0:
+            return run_process.stdout.strip()
+        else:
+            return f"Runtime error: {run_process.stderr.strip()}"
                 
     except Exception as e:
         return f"Rust execution error: {str(e)}"
-    
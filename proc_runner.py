@@ -0,0 +1,325 @@
+import collections
+import json
+import os
+import select
+import signal
+import subprocess
+import tempfile
+import threading
+import time
+
+import python_sandbox
+import timings
+
+# Most output a streamed or captured job may write before its session is killed
+MAX_STDOUT_BYTES = int(os.getenv("PROC_MAX_STDOUT_MB", 64)) * 1024 * 1024
+CHUNK_BYTES = 64 * 1024
+
+# wall is elapsed seconds; cpu is user+system seconds of the job and the children it waited for, None if unknown
+StreamResult = collections.namedtuple("StreamResult",
+                                      ["returncode", "stderr", "stdout_bytes", "truncated", "wall", "cpu"])
+
+
+class CountMerger:
+    """
+    on_line callback that sums every JSON object line, e.g. {"the": 3, "it": 2}, into a Counter.
+
+    Lines that are not JSON objects of numbers are counted in `skipped` and otherwise
+    ignored, so progress messages mixed into the output do no harm.
+    """
+
+    def __init__(self):
+        self.counts = collections.Counter()
+        self.skipped = 0
+
+    def __call__(self, line):
+        if b"{" not in line:
+            self.skipped += 1
+            return
+        try:
+            record = json.loads(line)
+        except ValueError:
+            self.skipped += 1
+            return
+        if not isinstance(record, dict) or not all(
+                isinstance(v, (int, float)) and not isinstance(v, bool) for v in record.values()):
+            self.skipped += 1
+            return
+        self.counts.update(record)
+
+
+class Capture:
+    """
+    Output of one pipe, keeping only its first head_bytes and last tail_bytes.
+
+    The middle is counted but dropped, so a job printing without end costs a
+    bounded amount of memory however long it runs.
+    """
+
+    def __init__(self, head_bytes=python_sandbox.HEAD_BYTES, tail_bytes=python_sandbox.TAIL_BYTES):
+        self.head = bytearray()
+        self.tail = bytearray()
+        self.head_bytes = head_bytes
+        self.tail_bytes = tail_bytes
+        self.total = 0
+
+    def add(self, chunk):
+        self.total += len(chunk)
+        room = self.head_bytes - len(self.head)
+        if room > 0:
+            self.head += chunk[:room]
+            chunk = chunk[room:]
+        self.tail += chunk
+        del self.tail[:max(0, len(self.tail) - self.tail_bytes)]
+
+    @property
+    def truncated(self):
+        return self.total > len(self.head) + len(self.tail)
+
+    def value(self):
+        """The kept bytes, with a note of how many were dropped between head and tail."""
+        if self.truncated:
+            return python_sandbox.elide(bytes(self.head), bytes(self.tail), self.total - len(self.head) - len(self.tail))
+        return bytes(self.head + self.tail)
+
+
+def read_lines(fd, on_line, max_bytes=MAX_STDOUT_BYTES, deadline=None):
+    """
+    Feed each complete line read from fd to on_line as it arrives, until EOF.
+
+    Only the current partial line is buffered. Returns (bytes read, truncated);
+    reading stops once max_bytes have arrived, or at deadline (a time.monotonic()
+    value), and then truncated is True.
+    """
+    total = 0
+    pending = b""
+    while True:
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                return total, True
+        chunk = os.read(fd, CHUNK_BYTES)
+        if not chunk:
+            break
+        total += len(chunk)
+        if total > max_bytes:
+            chunk = chunk[:len(chunk) - (total - max_bytes)]
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            on_line(line)
+        if total > max_bytes:
+            return max_bytes, True
+    if pending:
+        on_line(pending)
+    return total, False
+
+
+@timings.spanned("run")
+def stream(cmd, on_line, timeout=10, cwd=None, env=None, max_bytes=MAX_STDOUT_BYTES, cpus=None):
+    """
+    Run cmd, handing its stdout to on_line line by line while it runs.
+
+    Returns a StreamResult. The process runs in its own session, pinned to the CPU
+    numbers in cpus when given; when it writes more than max_bytes the whole session
+    is killed and the result is marked truncated. Raises subprocess.TimeoutExpired
+    after killing the session on timeout.
+    """
+    with tempfile.TemporaryFile() as stderr:
+        start = time.monotonic()
+        process = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=stderr,
+                                   cwd=cwd, env=env, start_new_session=True)
+        python_sandbox.limit_started(process.pid, timeout, cpus)
+        deadline = start + timeout
+        try:
+            total, truncated = read_lines(process.stdout.fileno(), on_line, max_bytes, deadline)
+            timed_out = truncated and time.monotonic() >= deadline
+            if truncated:
+                _kill_session(process)
+            process.stdout.close()
+            try:
+                cpu = _wait(process, max(0.0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                _kill_session(process)
+                process.wait()
+                timed_out = True
+        except BaseException:
+            _kill_session(process)
+            process.wait()
+            raise
+        wall = time.monotonic() - start
+        stderr.seek(0)
+        err = stderr.read().decode("utf-8", errors="replace")
+    if timed_out:
+        raise subprocess.TimeoutExpired(cmd, timeout, stderr=err)
+    return StreamResult(process.returncode, err, total, truncated, wall, cpu)
+
+
+@timings.spanned("run")
+def run(cmd, timeout=None, cwd=None, env=None, input=None, text=False, encoding=None, errors=None, shell=False,
+        check=False, max_bytes=MAX_STDOUT_BYTES, cpus=None):
+    """
+    subprocess.run(cmd, capture_output=True, ...) with bounded capture.
+
+    stdout and stderr are read in chunks as they arrive and each keeps only its first
+    HEAD_BYTES and last TAIL_BYTES (see python_sandbox). The process runs in its own
+    session; once stdout and stderr together pass max_bytes the whole session is
+    killed. The CompletedProcess has an extra `truncated` attribute, True when output
+    was dropped or cut off. Output is decoded when text, encoding or errors is given
+    (errors defaults to "replace"). On timeout the session is killed and
+    subprocess.TimeoutExpired carries the output captured so far.
+    """
+    decode = text or encoding is not None or errors is not None
+    if decode and isinstance(input, str):
+        input = input.encode(encoding or "utf-8")
+    process = subprocess.Popen(cmd, shell=shell, cwd=cwd, env=env, start_new_session=True,
+                               stdin=subprocess.DEVNULL if input is None else subprocess.PIPE,
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    python_sandbox.limit_started(process.pid, timeout, cpus)
+    captures = {process.stdout.fileno(): Capture(), process.stderr.fileno(): Capture()}
+    out, err = captures.values()
+    readers = list(captures)
+    writer = None
+    if input is not None:
+        writer = process.stdin.fileno()
+        os.set_blocking(writer, False)
+        if not input:
+            process.stdin.close()
+            writer = None
+    deadline = None if timeout is None else time.monotonic() + timeout
+    overflow = timed_out = False
+    exited = _pidfd(process)
+    try:
+        while readers:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                timed_out = True
+                break
+            readable, writable, _ = select.select(readers + ([exited] if exited is not None else []),
+                                                  [writer] if writer is not None else [], [], remaining)
+            if exited in readable:
+                # Anything the job left running could hold the pipes open until the deadline
+                _kill_session(process)
+                readable.remove(exited)
+                os.close(exited)
+                exited = None
+            if writable:
+                try:
+                    input = input[os.write(writer, input[:CHUNK_BYTES]):]
+                except BrokenPipeError:
+                    input = b""
+                if not input:
+                    process.stdin.close()
+                    writer = None
+            for fd in readable:
+                chunk = os.read(fd, CHUNK_BYTES)
+                if not chunk:
+                    readers.remove(fd)
+                    continue
+                captures[fd].add(chunk)
+                if out.total + err.total > max_bytes:
+                    overflow = True
+                    readers = []
+                    break
+        if overflow or timed_out:
+            _kill_session(process)
+        _wait(process, None if deadline is None else max(0.0, deadline - time.monotonic()))
+    except subprocess.TimeoutExpired:
+        _kill_session(process)
+        process.wait()
+        timed_out = True
+    except BaseException:
+        _kill_session(process)
+        process.wait()
+        raise
+    finally:
+        if exited is not None:
+            os.close(exited)
+        for pipe in (process.stdin, process.stdout, process.stderr):
+            if pipe is not None:
+                pipe.close()
+    stdout, stderr = out.value(), err.value()
+    if decode:
+        stdout, stderr = (data.decode(encoding or "utf-8", errors or "replace").replace("\r\n", "\n")
+                          for data in (stdout, stderr))
+    if timed_out:
+        raise subprocess.TimeoutExpired(cmd, timeout, output=stdout, stderr=stderr)
+    if check and process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, cmd, stdout, stderr)
+    result = subprocess.CompletedProcess(cmd, process.returncode, stdout, stderr)
+    result.truncated = overflow or out.truncated or err.truncated
+    return result
+
+
+def _pidfd(process):
+    """A file descriptor that becomes readable when process exits, or None if the OS has none."""
+    try:
+        return os.pidfd_open(process.pid)
+    except (AttributeError, OSError):
+        return None
+
+
+def _wait(process, timeout):
+    """
+    process.wait(timeout), then kill whatever the process left running in its session.
+
+    Returns the CPU seconds of the process and its reaped children (None if unknown).
+    """
+    pidfd = _pidfd(process)
+    if pidfd is None:
+        process.wait(timeout)
+        _kill_session(process)
+        return None
+    try:
+        if not select.select([pidfd], [], [], timeout)[0]:
+            raise subprocess.TimeoutExpired(process.args, timeout)
+    finally:
+        os.close(pidfd)
+    # Before reaping, while the session's id cannot have been reused
+    _kill_session(process)
+    _, status, usage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _kill_session(process):
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except OSError:
+        pass
+
+
+@timings.spanned("run")
+def stream_python(path, on_line, timeout=10, cwd=None, max_bytes=MAX_STDOUT_BYTES, cpus=None):
+    """
+    stream() for a Python script run in python_sandbox.
+
+    The job writes straight into a pipe read here, so its output is never held in
+    full by the sandbox or the grader. Past max_bytes the pipe is closed, and the
+    job's next write fails with a broken pipe.
+    """
+    read_fd, write_fd = os.pipe()
+    outcome = {}
+    start = time.monotonic()
+
+    def run():
+        try:
+            outcome["result"] = python_sandbox.run_file(path, timeout=timeout, cwd=cwd, stdout=write_fd,
+                                                        encoding="utf-8", errors="replace", cpus=cpus)
+        except BaseException as e:
+            outcome["error"] = e
+        finally:
+            os.close(write_fd)
+
+    runner = threading.Thread(target=run, daemon=True)
+    runner.start()
+    try:
+        total, truncated = read_lines(read_fd, on_line, max_bytes)
+    finally:
+        os.close(read_fd)
+    runner.join()
+    wall = time.monotonic() - start
+    if "error" in outcome:
+        raise outcome["error"]
+    result = outcome["result"]
+    return StreamResult(result.returncode, result.stderr, total, truncated, wall, result.cpu_time)
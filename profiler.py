@@ -0,0 +1,112 @@
+import inspect
+import json
+
+import python_sandbox
+import timings
+
+# Prefix of the line carrying the metrics; everything else on stdout is the candidate's
+MARKER = "@@profile@@ "
+# Each timed probe doubles its number of calls until they take at least this many seconds
+TIME_BUDGET = 0.2
+
+
+class ProfileError(Exception):
+    """The profiled code crashed or exited before the harness could report its metrics."""
+
+
+def probe(name, expr, setup="", value=True, time=True, memory=True):
+    """
+    One expression to evaluate after the candidate's code has run.
+
+    setup runs first (not measured) in the same namespace as the candidate's code.
+    The first evaluation of expr gives `value`; then it is timed with repeated calls
+    (`ns_per_call`), then traced once with tracemalloc (`peak_bytes`, `retained_bytes`,
+    `blocks`) while the process's peak RSS growth is taken from getrusage.
+    """
+    return {"name": name, "expr": expr, "setup": setup, "value": value, "time": time, "memory": memory}
+
+
+def _harness(probes, marker, budget):
+    # Runs inside the sandboxed child, appended to the candidate's code; see profile()
+    import json
+    import resource
+    import sys
+    import timeit
+    import tracemalloc
+
+    def max_rss():
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    def jsonable(value):
+        if hasattr(value, "tolist"):
+            value = value.tolist()
+        try:
+            json.dumps(value)
+            return value
+        except (TypeError, ValueError):
+            return repr(value)
+
+    namespace = globals()
+    report = {}
+    for spec in probes:
+        metrics = report[spec["name"]] = {}
+        try:
+            exec(spec["setup"], namespace)
+            expr = compile(spec["expr"], f"<probe {spec['name']}>", "eval")
+            result = eval(expr, namespace)
+            metrics["type"] = type(result).__name__
+            if spec["value"]:
+                metrics["value"] = jsonable(result)
+            del result
+            if spec["time"]:
+                timer = timeit.Timer(lambda: eval(expr, namespace))
+                number = 1
+                while (elapsed := timer.timeit(number)) < budget:
+                    number *= 2
+                metrics["calls"] = number
+                metrics["ns_per_call"] = round(elapsed / number * 1e9)
+            if spec["memory"]:
+                rss = max_rss()
+                blocks = sys.getallocatedblocks()
+                tracemalloc.start()
+                try:
+                    before = tracemalloc.get_traced_memory()[0]
+                    # Keep the value alive so retained_bytes counts what it holds on to
+                    kept = [eval(expr, namespace)]
+                    current, peak = tracemalloc.get_traced_memory()
+                finally:
+                    tracemalloc.stop()
+                metrics["peak_bytes"] = peak - before
+                metrics["retained_bytes"] = current - before
+                metrics["blocks"] = sys.getallocatedblocks() - blocks
+                metrics["rss_growth_bytes"] = max_rss() - rss
+                kept.clear()
+        except Exception as e:
+            metrics["error"] = f"{type(e).__name__}: {e}"
+    sys.stdout.flush()
+    print(marker + json.dumps({"probes": report, "max_rss_bytes": max_rss()}), flush=True)
+
+
+@timings.spanned("run")
+def profile(code, probes, timeout=30, budget=TIME_BUDGET):
+    """
+    Run code once in python_sandbox, then measure each probe() against its namespace.
+
+    Correctness values, timings and memory all come from that one child. Returns
+    {"probes": {name: metrics}, "max_rss_bytes": ..., "stdout": the code's own output}.
+    A probe whose expression raises gets {"error": ...} instead of metrics. Raises
+    ProfileError if the code itself fails, and subprocess.TimeoutExpired on timeout.
+    """
+    script = "\n\n".join([
+        code,
+        inspect.getsource(_harness),
+        f"_harness({probes!r}, {MARKER!r}, {budget!r})\n",
+    ])
+    result = python_sandbox.run_code(script, timeout=timeout, encoding="utf-8", errors="replace")
+    lines = result.stdout.splitlines()
+    for i in range(len(lines) - 1, -1, -1):
+        if lines[i].startswith(MARKER):
+            report = json.loads(lines[i][len(MARKER):])
+            report["stdout"] = "\n".join(lines[:i] + lines[i + 1:])
+            return report
+    raise ProfileError(f"exit code {result.returncode}: {result.stderr[-2000:] or result.stdout[-2000:]}")
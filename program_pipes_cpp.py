@@ -1,8 +1,11 @@
 import subprocess
-import tempfile
-import os
-import re
 
+import code_extract
+import compile_cache
+import proc_runner
+import timings
+
+@timings.timed
 def check_cpp_dataflow_dsl(response, context=None):
     """
     Evaluates if the C++ code response correctly implements dataflow DSL classes
@@ -11,17 +14,7 @@ def check_cpp_dataflow_dsl(response, context=None):
     
     def extract_code(text):
         """Extract C++ code from markdown or plain text"""
-        # Remove language specifiers from code blocks
-        text = re.sub(r'```[a-z]*', '```', text)
-        
-        if "```" in text and text.count("```") >= 2:
-            # Extract from code block
-            parts = text.split("```")
-            if len(parts) >= 2:
-                return parts[1].strip()
-        
-        # If no code blocks, return the whole response
-        return text.strip()
+        return code_extract.extract_code(text, "cpp").strip()
     
     def run_cpp_code(code, test_case):
         """Compile and run C++ code with test case"""
@@ -32,44 +25,29 @@ def check_cpp_dataflow_dsl(response, context=None):
         # Combine code with test case
         full_code = code + "\n\n" + test_case
         
-        # Create temporary files
-        with tempfile.TemporaryDirectory() as temp_dir:
-            cpp_file = os.path.join(temp_dir, "main.cpp")
-            exe_file = os.path.join(temp_dir, "a.out")
+        try:
+            # Compile
+            build = compile_cache.compile_cpp(full_code, timeout=30)
+            
+            if not build.ok:
+                return f"Compilation failed: {build.diagnostics}"
+            
+            # Run
+            run_result = proc_runner.run(
+                [build.binary],
+                text=True,
+                timeout=10
+            )
+            
+            if run_result.returncode != 0:
+                return f"Runtime error: {run_result.stderr}"
             
-            # Write code to file
-            with open(cpp_file, 'w') as f:
-                f.write(full_code)
+            return run_result.stdout
             
-            try:
-                # Compile
-                compile_result = subprocess.run(
-                    ['g++', '-o', exe_file, cpp_file, '-lm'],
-                    capture_output=True,
-                    text=True,
-                    timeout=30
-                )
-                
-                if compile_result.returncode != 0:
-                    return f"Compilation failed: {compile_result.stderr}"
-                
-                # Run
-                run_result = subprocess.run(
-                    [exe_file],
-                    capture_output=True,
-                    text=True,
-                    timeout=10
-                )
-                
-                if run_result.returncode != 0:
-                    return f"Runtime error: {run_result.stderr}"
-                
-                return run_result.stdout
-                
-            except subprocess.TimeoutExpired:
-                return "Execution timed out"
-            except Exception as e:
-                return f"Error: {str(e)}"
+        except subprocess.TimeoutExpired:
+            return "Execution timed out"
+        except Exception as e:
+            return f"Error: {str(e)}"
     
     # Extract code from response
     extracted_code = extract_code(response)
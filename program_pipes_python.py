@@ -1,8 +1,11 @@
 import re
 import subprocess
-import tempfile
-import os
 
+import code_extract
+import python_sandbox
+import timings
+
+@timings.timed
 def assert_dataflow_dsl(response, context=None):
     """
     Evaluates if the model can generate a python program that defines dataflow DSL.
@@ -14,20 +17,7 @@ def assert_dataflow_dsl(response, context=None):
         # Remove non-ASCII characters
         output = re.sub(r'[^\x00-\x7F]+', '', output)
 
-        # Normalize code block markers like ```python
-        output = re.sub(r'```[a-zA-Z]*\n', '```', output)
-
-        # Split and extract code between triple backticks
-        parts = output.split("```")
-        if len(parts) >= 3:
-            code = parts[1]
-        else:
-            code = output
-
-        # Remove any leftover triple backticks inside the code (causes syntax error)
-        code = code.replace("```", "")
-
-        return code.strip()
+        return code_extract.extract_code(output, "python").strip()
 
     code = extract_code(response)
 
@@ -47,17 +37,10 @@ def assert_dataflow_dsl(response, context=None):
             "reason": f"Code is invalid Python: {e}"
         }
 
-    # Write to a temp file
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False, encoding='utf-8') as f:
-        f.write("# -*- coding: utf-8 -*-\n")
-        f.write(full_code)
-        temp_file = f.name
-
     try:
-        # Execute the file
-        result = subprocess.run(
-            ['python', temp_file],
-            capture_output=True,
+        # Execute the code, with an encoding declaration
+        result = python_sandbox.run_code(
+            "# -*- coding: utf-8 -*-\n" + full_code,
             text=True,
             timeout=10
         )
@@ -97,6 +80,3 @@ def assert_dataflow_dsl(response, context=None):
             "score": 0.0,
             "reason": f"Code execution failed: {str(e)}\nTraceback: {traceback.format_exc()}"
         }
-    finally:
-        if os.path.exists(temp_file):
-            os.unlink(temp_file)
@@ -1,8 +1,11 @@
 import re
 import subprocess
-import tempfile
-import os
 
+import code_extract
+import python_sandbox
+import timings
+
+@timings.timed
 def assert_sqrt_implementation(response, context=None):
     """
     Evaluates if the response contains a valid sqrt implementation that doesn't cheat
@@ -52,16 +55,7 @@ def assert_sqrt_implementation(response, context=None):
 
 def extract_code_from_response(response):
     """Extract code from response, handling code blocks."""
-    response = re.sub(r'```[a-z]*', '```', response)
-    
-    if "```" in response and response.count("```") >= 2:
-        # Extract code between first pair of ```
-        parts = response.split("```")
-        if len(parts) >= 2:
-            return parts[1].strip()
-    
-    # If no code blocks, return the whole response
-    return response.strip()
+    return code_extract.extract_code(response, "python").strip()
 
 def check_if_cheated(code):
     """Check if the code uses built-in sqrt function."""
@@ -87,18 +81,7 @@ def test_sqrt_function(code):
     full_code = code + "\n\n" + test_case
     
     try:
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-            f.write(full_code)
-            temp_file = f.name
-        
-        result = subprocess.run(
-            ['python', temp_file],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
-        
-        os.unlink(temp_file)
+        result = python_sandbox.run_code(full_code, timeout=10)
         
         if result.returncode == 0:
             return {
@@ -114,16 +97,12 @@ def test_sqrt_function(code):
             }
             
     except subprocess.TimeoutExpired:
-        if 'temp_file' in locals():
-            os.unlink(temp_file)
         return {
             'success': False,
             'output': '',
             'error': 'Code execution timed out'
         }
     except Exception as e:
-        if 'temp_file' in locals():
-            os.unlink(temp_file)
         return {
             'success': False,
             'output': '',
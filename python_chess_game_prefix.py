@@ -1,9 +1,10 @@
 import subprocess
-import re
-import tempfile
-import os
-import sys
 
+import code_extract
+import python_sandbox
+import timings
+
+@timings.timed
 def check_response(response, context=None):
     """
     Evaluates if the model can correctly call a python API for python-chess library.
@@ -11,19 +12,13 @@ def check_response(response, context=None):
     """
     def extract_code(text):
         """Extract code from markdown or plain text response"""
-        # Remove language specifiers from code blocks
-        text = re.sub('```[a-z]*', '```', text)
-        if text.count("```") >= 2:
-            # Extract from code blocks
-            parts = text.split("```")
-            for i in range(1, len(parts), 2):
-                yield parts[i].strip()
-        else:
-            # Use entire response as code
-            yield text.strip()
+        # Every code block is a candidate; with none, the entire response is the code
+        blocks = code_extract.extract_all(text) or [text]
+        for code in blocks:
+            yield code.strip()
 
     def run_python_code(code, test_case):
-        """Run Python code with test case using subprocess"""
+        """Run Python code with test case in the sandbox"""
         # Create mock chess module
         mock_code = """
 # Mock chess module
@@ -86,14 +81,9 @@ sys.modules['chess.pgn'] = MockModule(read_game=MockPGN.read_game)
         
         full_code = mock_code + "\n\n" + code + "\n\n" + test_case
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False, encoding='utf-8') as f:
-            f.write(full_code)
-            temp_file = f.name
-            
         try:
-            result = subprocess.run(
-                [sys.executable, temp_file],
-                capture_output=True,
+            result = python_sandbox.run_code(
+                full_code,
                 text=True,
                 timeout=30
             )
@@ -102,9 +92,6 @@ sys.modules['chess.pgn'] = MockModule(read_game=MockPGN.read_game)
             return "", "Timeout", 1
         except Exception as e:
             return "", str(e), 1
-        finally:
-            if os.path.exists(temp_file):
-                os.unlink(temp_file)
 
     def check_output(output):
         """Check if output contains expected pattern"""
@@ -1,11 +1,12 @@
-import subprocess
-import tempfile
-import os
-import re
 import json
 import io
 from PIL import Image
 
+import code_extract
+import python_sandbox
+import timings
+
+@timings.timed
 def assert_red_triangle_gif(response, context=None):
     """
     Evaluates if the response contains code that generates a GIF with a red triangle.
@@ -63,13 +64,10 @@ def extract_code_from_response(response):
         # Clean the response of non-ASCII characters
         response = response.encode('ascii', 'ignore').decode('ascii')
         
-        # Remove language identifiers from code blocks
-        response = re.sub(r'```[a-z]*', '```', response)
-        
         # Try to extract from code blocks first
-        if response.count("```") >= 2:
-            code = response.split("```")[1]
-            return code.strip()
+        block = code_extract.find_block(response, "python")
+        if block is not None:
+            return block.code.strip()
         
         # If no code blocks, look for Python-like code
         lines = response.split('\n')
@@ -94,26 +92,17 @@ def extract_code_from_response(response):
 def run_python_code(code):
     """Run Python code and capture binary output."""
     try:
-        # Create temporary file with UTF-8 encoding
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False, encoding='utf-8', errors='ignore') as f:
-            f.write("# -*- coding: utf-8 -*-\n")
-            f.write(code)
-            temp_file = f.name
+        # The GIF is written to stdout, so keep the output as bytes
+        result = python_sandbox.run_code(
+            "# -*- coding: utf-8 -*-\n" + code,
+            text=False,
+            timeout=30
+        )
         
-        try:
-            result = subprocess.run(
-                ['python', temp_file],
-                capture_output=True,
-                timeout=30
-            )
-            
-            if result.returncode == 0:
-                return result.stdout
-            else:
-                raise Exception(f"Python execution failed: {result.stderr.decode('utf-8', errors='ignore')}")
-        finally:
-            if os.path.exists(temp_file):
-                os.unlink(temp_file)
+        if result.returncode == 0:
+            return result.stdout
+        else:
+            raise Exception(f"Python execution failed: {result.stderr.decode('utf-8', errors='ignore')}")
                 
     except Exception as e:
         raise Exception(f"Error running code: {str(e)}")
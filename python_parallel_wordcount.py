@@ -1,15 +1,17 @@
-import json
-import re
-import subprocess
-import tempfile
 import os
-import time
 
+import code_extract
+import proc_runner
+import speedup
+import timings
+import workspace
+
+@timings.timed
 def run_test(response, context=None):
     """Run the test with proper file handling."""
     
     # Create temp directory instead of using /tmp
-    with tempfile.TemporaryDirectory() as temp_dir:
+    with workspace.workspace("python_parallel_wordcount") as temp_dir:
         try:
             # Setup the test file in temp directory
             txt = "it was the best of times, it was the worst of times, it was the age of wisdom, it was the age of foolishness, it was the epoch of belief, it was the epoch of incredulity, it was the season of Light, it was the season of Darkness, it was the spring of hope, it was the winter of despair, we had everything before us, we had nothing before us, we were all going direct to Heaven, we were all going direct the other way"
@@ -28,6 +30,7 @@ def run_test(response, context=None):
                 }
             
             # Replace /tmp/file.txt with the correct path
+            source = code
             code = code.replace('/tmp/file.txt', input_file.replace('\\', '\\\\'))
             
             # Check if code attempts parallelization
@@ -35,19 +38,21 @@ def run_test(response, context=None):
             
             # Run the code and get results
             try:
-                result = run_python_code(code, temp_dir)
-                merged_dict = merge_json_outputs(result)
+                merged_dict = run_python_code(code, temp_dir)
                 expected = {'the': 11, 'it': 10, 'was': 10, 'of': 10, 'we': 4, 'times,': 2, 'age': 2, 'epoch': 2, 'season': 2, 'had': 2, 'before': 2, 'us,': 2, 'were': 2, 'all': 2, 'going': 2, 'direct': 2, 'best': 1, 'worst': 1, 'wisdom,': 1, 'foolishness,': 1, 'belief,': 1, 'incredulity,': 1, 'Light,': 1, 'Darkness,': 1, 'spring': 1, 'hope,': 1, 'winter': 1, 'despair,': 1, 'everything': 1, 'nothing': 1, 'to': 1, 'Heaven,': 1, 'other': 1, 'way': 1}
                 
                 word_count_correct = merged_dict == expected
                 
                 # Both conditions must pass
                 overall_pass = word_count_correct and parallelization_check
-                return {
+                result = {
                     "pass": overall_pass,
                     "score": 1.0 if overall_pass else 0.0,
                     "reason": f"Word count correct: {word_count_correct}, Parallelization attempted: {parallelization_check}. Expected: {expected}, Got: {merged_dict}"
                 }
+                if speedup.ENABLED:
+                    result["metadata"] = {"speedup": measure_speedup(source, temp_dir)}
+                return result
             except Exception as e:
                 return {
                     "pass": False,
@@ -64,14 +69,7 @@ def run_test(response, context=None):
 
 def extract_code(response):
     """Extract Python code from the response, keeping main function"""
-    response = re.sub('```[a-z]*', '```', response)
-    if "```" in response and response.count("```") >= 2:
-        # Extract code between first pair of ```
-        code = response.split("```")[1]
-        return code.strip()
-    else:
-        # If no code blocks, assume the entire response is code
-        return response.strip()
+    return code_extract.extract_code(response, "python").strip()
 
 def check_parallelization(code):
     """Check if the code attempts parallelization"""
@@ -87,28 +85,23 @@ def check_parallelization(code):
     return False
 
 def run_python_code(code, temp_dir):
-    """Run the Python code and capture stdout"""
+    """Run the Python code, merging the JSON dicts it prints as they arrive"""
     script_path = os.path.join(temp_dir, "script.py")
     try:
         # Write the code to a file
         with open(script_path, 'w', encoding='utf-8') as f:
             f.write(code)
         
-        # Wait a moment to ensure file is written
-        time.sleep(0.1)
-        
         # Run the code
-        result = subprocess.run(
-            ['python', script_path],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
+        merger = proc_runner.CountMerger()
+        result = proc_runner.stream_python(script_path, merger, timeout=30, cwd=temp_dir)
         
+        if result.truncated:
+            raise Exception(f"Output exceeded {result.stdout_bytes} bytes")
         if result.returncode != 0:
             raise Exception(f"Code execution failed: {result.stderr}")
         
-        return result.stdout
+        return dict(merger.counts)
         
     except Exception as e:
         raise Exception(f"Error running code: {str(e)}")
@@ -120,16 +113,15 @@ def run_python_code(code, temp_dir):
         except:
             pass
 
-def merge_json_outputs(output_text):
-    """Merge multiple JSON dictionaries from the output"""
-    merged = {}
-    for line in output_text.split("\n"):
-        line = line.strip()
-        if line and '{' in line:
-            try:
-                d = json.loads(line)
-                for k, v in d.items():
-                    merged[k] = merged.get(k, 0) + v
-            except json.JSONDecodeError:
-                continue
-    return merged
\ No newline at end of file
+def measure_speedup(code, temp_dir):
+    """Time the program on the large corpus fixture pinned to 1 and to 4 CPUs"""
+    script_path = os.path.join(temp_dir, "script.py")
+    with open(script_path, 'w', encoding='utf-8') as f:
+        f.write(code.replace('/tmp/file.txt', speedup.corpus_file().replace('\\', '\\\\')))
+    
+    def run(cpus):
+        merger = proc_runner.CountMerger()
+        result = proc_runner.stream_python(script_path, merger, timeout=speedup.TIMEOUT, cwd=temp_dir, cpus=cpus)
+        return result, dict(merger.counts)
+    
+    return speedup.measure(run, speedup.corpus_counts())
@@ -0,0 +1,584 @@
+import atexit
+import ctypes
+import importlib
+import json
+import locale
+import math
+import os
+import runpy
+import select
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import traceback
+
+try:
+    import fcntl
+    import resource
+except ImportError:  # Windows
+    fcntl = resource = None
+
+import scheduler
+import timings
+import workspace
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SOCKET_PATH = os.getenv("SANDBOX_SOCKET") or os.path.join(
+    tempfile.gettempdir(), f"carlini-sandbox-{os.getuid() if hasattr(os, 'getuid') else 0}.sock")
+# Modules imported once by the server so every forked job gets them for free
+PREIMPORTS = tuple(filter(None, os.getenv(
+    "SANDBOX_PREIMPORTS", "json,re,sqlite3,collections,itertools,math,numpy").split(",")))
+WORKERS = int(os.getenv("SANDBOX_WORKERS", os.cpu_count() or 4))
+IDLE_SECONDS = float(os.getenv("SANDBOX_IDLE_SECONDS", 600))
+# Extra address space a job may map on top of the pre-imported interpreter
+MEMORY_BYTES = int(os.getenv("SANDBOX_MEMORY_MB", 4096)) * 1024 * 1024
+FILE_BYTES = int(os.getenv("SANDBOX_FILE_MB", 256)) * 1024 * 1024
+# Captured output keeps this much of its start and end; the middle of anything longer is dropped
+HEAD_BYTES = int(os.getenv("CAPTURE_HEAD_KB", 1024)) * 1024
+TAIL_BYTES = int(os.getenv("CAPTURE_TAIL_KB", 256)) * 1024
+PR_SET_CHILD_SUBREAPER = 36
+ENABLED = (os.getenv("SANDBOX_POOL", "1") != "0" and hasattr(os, "fork")
+           and hasattr(socket, "AF_UNIX") and fcntl is not None)
+
+_server_failed = False
+
+
+class SandboxError(Exception):
+    """The sandbox server dropped a job without reporting its result."""
+
+
+# ---------------------------------------------------------------------------
+# Client side
+# ---------------------------------------------------------------------------
+
+def run_code(code, timeout=10, name="main.py", cwd=None, **kwargs):
+    """Write code to a private directory and run it there; see run_file."""
+    with workspace.workspace("sandbox") as script_dir:
+        path = os.path.join(script_dir, name)
+        with open(path, "wb") as f:
+            f.write(code.encode("utf-8", errors="replace"))
+        return run_file(path, timeout=timeout, cwd=cwd or script_dir, **kwargs)
+
+
+@timings.spanned("run")
+def run_file(path, args=(), timeout=10, cwd=None, input=None, text=True, encoding=None, errors=None, env=None,
+             stdout=None, cpus=None):
+    """
+    Run a Python script like subprocess.run([python, path, *args], capture_output=True).
+
+    The script runs in a process forked from a warm sandbox server, in its own session
+    and under rlimits; without a cwd it gets a private empty directory. Returns a
+    subprocess.CompletedProcess and raises subprocess.TimeoutExpired on timeout, so
+    callers handle it exactly like a plain subprocess. Falls back to a fresh
+    interpreter where fork or unix sockets are unavailable, or when SANDBOX_POOL=0.
+
+    stdout may be a file descriptor (e.g. the write end of a pipe) that the job
+    writes to directly instead of having its output captured; the result's stdout
+    is then None. cpus pins the job to those CPU numbers. The result's extra
+    cpu_time attribute is the user+system seconds of the job and the children it
+    waited for (None when run without the server). Captured stdout and stderr keep
+    their first HEAD_BYTES and last TAIL_BYTES; `truncated` says whether anything
+    in between was dropped, and if so text is decoded with errors="replace" unless
+    errors is given.
+    """
+    cmd = [sys.executable, path, *args]
+    if isinstance(input, str):
+        input = input.encode(encoding or "utf-8", errors or "strict")
+    env = dict(os.environ if env is None else env)
+
+    with scheduler.slot("python-exec"):
+        reply = _pooled(path, args, timeout, cwd, input, env, stdout, cpus) if ENABLED and not _server_failed else None
+        if reply is None:
+            reply = _unpooled(cmd, timeout, cwd, input, env, stdout, cpus)
+    returncode, out, stderr, timed_out, cpu_time, truncated = reply
+
+    if text:
+        # Truncation cuts at byte counts and may split a multibyte character
+        errors = errors or ("replace" if truncated else "strict")
+        out, stderr = _decode(out, encoding, errors), _decode(stderr, encoding, errors)
+    stdout = None if stdout is not None else out
+    if timed_out:
+        raise subprocess.TimeoutExpired(cmd, timeout, output=stdout, stderr=stderr)
+    result = subprocess.CompletedProcess(cmd, returncode, stdout, stderr)
+    result.cpu_time = cpu_time
+    result.truncated = truncated
+    return result
+
+
+def elide(head, tail, dropped):
+    """Join the kept start and end of some output around a note of how many bytes were dropped."""
+    return head + f"\n... [{dropped} bytes truncated] ...\n".encode("ascii") + tail
+
+
+def _read_window(f):
+    """(contents of an output file, truncated), dropping the middle past HEAD_BYTES + TAIL_BYTES."""
+    size = f.seek(0, os.SEEK_END)
+    f.seek(0)
+    if size <= HEAD_BYTES + TAIL_BYTES:
+        return f.read(), False
+    head = f.read(HEAD_BYTES)
+    f.seek(size - TAIL_BYTES)
+    return elide(head, f.read(TAIL_BYTES), size - HEAD_BYTES - TAIL_BYTES), True
+
+
+def _decode(data, encoding, errors):
+    if data is None:
+        return None
+    text = data.decode(encoding or locale.getpreferredencoding(False), errors)
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _unpooled(cmd, timeout, cwd, input, env, stdout, cpus):
+    private = None if cwd else workspace.allocate("sandbox")
+    try:
+        with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err:
+            # Its own session, so a timeout takes down the job's children along with it
+            with subprocess.Popen(cmd, cwd=cwd or private, env=env, start_new_session=True,
+                                  stdin=subprocess.PIPE if input is not None else subprocess.DEVNULL,
+                                  stdout=out if stdout is None else stdout, stderr=err) as process:
+                limit_started(process.pid, timeout, cpus)
+                try:
+                    process.communicate(input, timeout=timeout)
+                    returncode, timed_out = process.returncode, False
+                except subprocess.TimeoutExpired:
+                    returncode, timed_out = None, True
+                finally:
+                    if hasattr(os, "killpg"):
+                        _kill_group(process.pid)
+            out, out_truncated = _read_window(out)
+            err, err_truncated = _read_window(err)
+        return returncode, out, err, timed_out, None, out_truncated or err_truncated
+    finally:
+        if private:
+            workspace.release(private)
+
+
+def _pooled(path, args, timeout, cwd, input, env, stdout, cpus):
+    """Run a job on the sandbox server; None if the server cannot be reached."""
+    sock = _connect()
+    if sock is None:
+        return None
+    # The job is forked by the server, not by us; let audit hooks (e.g. grader_bench) count it
+    sys.audit("python_sandbox.job", path)
+    request = {
+        "path": os.path.abspath(path), "args": list(args), "timeout": timeout,
+        "cwd": os.path.abspath(cwd) if cwd else None, "env": env,
+        "input": len(input) if input is not None else None,
+        "cpus": sorted(cpus) if cpus else None,
+    }
+    with sock:
+        sock.settimeout(timeout + 60)
+        # Every request opens with one byte that carries the job's stdout fd, if it has one
+        fds = [stdout if isinstance(stdout, int) else stdout.fileno()] if stdout is not None else []
+        socket.send_fds(sock, [b"\0"], fds)
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n" + (input or b""))
+        with sock.makefile("rb") as rfile:
+            line = rfile.readline()
+            if not line:
+                raise SandboxError("Sandbox server closed the connection")
+            reply = json.loads(line)
+            stdout = rfile.read(reply["stdout"])
+            stderr = rfile.read(reply["stderr"])
+    return reply["returncode"], stdout, stderr, reply["timed_out"], reply["cpu_time"], reply["truncated"]
+
+
+def _try_connect():
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(SOCKET_PATH)
+        return sock
+    except OSError:
+        sock.close()
+        return None
+
+
+def _connect():
+    global _server_failed
+    sock = _try_connect()
+    if sock is None:
+        sock = start_server()
+    if sock is None:
+        _server_failed = True
+    return sock
+
+
+def start_server(wait=10):
+    """Launch a detached sandbox server and return a connection to it, or None."""
+    subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "python_sandbox.py"), "serve"],
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        cwd=ROOT, start_new_session=True
+    )
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        sock = _try_connect()
+        if sock is not None:
+            return sock
+        time.sleep(0.01)
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Server side
+# ---------------------------------------------------------------------------
+
+def serve(path=SOCKET_PATH, workers=WORKERS, idle=IDLE_SECONDS):
+    """
+    Pre-forked sandbox server.
+
+    The master imports PREIMPORTS, then keeps `workers` forked processes blocked in
+    accept() on the shared socket. Each worker forks every job from its already
+    warm interpreter and supervises it, so jobs never pay for interpreter start-up
+    or imports. Exits after `idle` seconds without a job.
+    """
+    lock = open(path + ".lock", "w")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return  # another server owns the socket
+    if os.path.exists(path):
+        os.unlink(path)
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(path)
+    listener.listen(128)
+
+    for name in PREIMPORTS:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+
+    children = set()
+    try:
+        while True:
+            while len(children) < workers:
+                pid = os.fork()
+                if pid == 0:
+                    code = 0
+                    try:
+                        _worker(listener, lock, path)
+                    except BaseException:
+                        code = 1
+                    os._exit(code)
+                children.add(pid)
+            time.sleep(1)
+            while children:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+                if not pid:
+                    break
+                children.discard(pid)
+            try:
+                if time.time() - os.stat(path).st_mtime > idle:
+                    break
+            except FileNotFoundError:
+                break
+    finally:
+        listener.close()
+        try:
+            if os.path.exists(path):
+                os.unlink(path)
+        except OSError:
+            pass
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+            except OSError:
+                pass
+
+
+def _worker(listener, lock, path):
+    # Processes a job leaves behind are re-parented here rather than to init, so _sweep() can reap them
+    _become_subreaper()
+    while True:
+        conn, _ = listener.accept()
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with conn:
+            try:
+                _handle(conn, listener, lock)
+            except OSError:
+                pass
+
+
+def _handle(conn, listener, lock):
+    _, fds, _, _ = socket.recv_fds(conn, 1, 1)
+    rfile = conn.makefile("rb")
+    request = json.loads(rfile.readline())
+    input = rfile.read(request["input"]) if request["input"] is not None else b""
+
+    private = None
+    cwd = request["cwd"]
+    if cwd is None:
+        private = cwd = workspace.allocate("sandbox")
+    stream = open(fds[0], "wb") if fds else None
+    with tempfile.TemporaryFile() as stdin, stream or tempfile.TemporaryFile() as stdout, \
+            tempfile.TemporaryFile() as stderr:
+        stdin.write(input)
+        stdin.seek(0)
+        pid = os.fork()
+        if pid == 0:
+            _child(request, cwd, (stdin, stdout, stderr), (rfile, conn, listener, lock))
+        returncode, timed_out, cpu_time = _wait(pid, request["timeout"])
+        # Take down anything the job left running, in its session or not
+        _kill_group(pid)
+        _sweep()
+        out, out_truncated = _read_window(stdout) if stream is None else (b"", False)
+        err, err_truncated = _read_window(stderr)
+    if private:
+        workspace.release(private)
+    rfile.close()
+
+    reply = {"returncode": returncode, "timed_out": timed_out, "cpu_time": cpu_time,
+             "truncated": out_truncated or err_truncated, "stdout": len(out), "stderr": len(err)}
+    conn.sendall(json.dumps(reply).encode("utf-8") + b"\n" + out + err)
+
+
+def _kill_group(pid):
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except OSError:
+        pass
+
+
+def _become_subreaper():
+    try:
+        ctypes.CDLL(None, use_errno=True).prctl(PR_SET_CHILD_SUBREAPER, 1, 0, 0, 0)
+    except (AttributeError, OSError):
+        pass
+
+
+def _children():
+    """Pids whose parent is this process, from /proc; empty where /proc is unavailable."""
+    children = []
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return children
+    me = os.getpid()
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "rb") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # The command name in parentheses may contain spaces; the parent pid is the second field after it
+        if int(stat[stat.rindex(b")") + 2:].split()[1]) == me:
+            children.append(int(entry))
+    return children
+
+
+def _sweep():
+    """
+    Kill and reap every process left under this worker.
+
+    With the worker a subreaper, that is every descendant of finished jobs that is
+    still running (a daemonized helper, a pool worker that called setsid) or that
+    exited without anyone waiting for it.
+    """
+    while True:
+        children = _children()
+        for pid in children:
+            _kill_group(pid)
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except OSError:
+                pass
+        try:
+            if not os.waitpid(-1, 0 if children else os.WNOHANG)[0]:
+                return
+        except ChildProcessError:
+            return
+
+
+def _wait(pid, timeout):
+    """
+    Wait for pid for up to timeout seconds, killing its session on expiry.
+
+    Returns (exit code or None on timeout, timed out, user+system CPU seconds).
+    """
+    try:
+        pidfd = os.pidfd_open(pid)
+    except (AttributeError, OSError):
+        pidfd = None
+    if pidfd is not None:
+        try:
+            timed_out = not select.select([pidfd], [], [], timeout)[0]
+        finally:
+            os.close(pidfd)
+    else:
+        deadline = time.monotonic() + timeout
+        delay = 0.0005
+        while True:
+            done, status, usage = os.wait4(pid, os.WNOHANG)
+            if done:
+                return os.waitstatus_to_exitcode(status), False, usage.ru_utime + usage.ru_stime
+            if time.monotonic() >= deadline:
+                timed_out = True
+                break
+            time.sleep(delay)
+            delay = min(delay * 2, 0.05)
+    if timed_out:
+        _kill_group(pid)
+        try:
+            os.kill(pid, signal.SIGKILL)  # in case it had not called setsid yet
+        except OSError:
+            pass
+    _, status, usage = os.wait4(pid, 0)
+    return (None if timed_out else os.waitstatus_to_exitcode(status)), timed_out, usage.ru_utime + usage.ru_stime
+
+
+def _address_space():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * resource.getpagesize()
+    except OSError:
+        return None
+
+
+def _cap(limit, soft, hard=None, pid=0):
+    try:
+        _, max_hard = resource.prlimit(pid, limit) if pid else resource.getrlimit(limit)
+        hard = soft if hard is None else hard
+        if max_hard != resource.RLIM_INFINITY:
+            soft, hard = min(soft, max_hard), min(hard, max_hard)
+        if pid:
+            resource.prlimit(pid, limit, (soft, hard))
+        else:
+            resource.setrlimit(limit, (soft, hard))
+    except (AttributeError, ValueError, OSError):
+        # AttributeError: no prlimit outside Linux; OSError includes a pid that already exited
+        pass
+
+
+def limit_cpu(timeout, pid=0):
+    """
+    Cap the CPU seconds of process pid (this process by default) at what timeout
+    seconds on every core allow.
+
+    A backstop for the wall-clock timeout, for processes that outlive whoever was
+    enforcing it; SIGXCPU comes at the soft limit and SIGKILL a second later.
+    """
+    if resource is None or timeout is None:
+        return
+    cpu = math.ceil(timeout) * (os.cpu_count() or 1) + 1
+    _cap(resource.RLIMIT_CPU, cpu, cpu + 1, pid)
+
+
+def limit_started(pid, timeout, cpus=None):
+    """
+    Apply limit_cpu, and pinning to cpus if given, to a process that was just started.
+
+    Done from the parent rather than a preexec_fn, which is not safe in a process
+    running threads (the child can deadlock on a lock held by another thread at fork).
+    The job may already have started threads of its own, so each one is pinned.
+    Skips processes that have already exited.
+    """
+    limit_cpu(timeout, pid)
+    if not cpus or not hasattr(os, "sched_setaffinity"):
+        return
+    try:
+        tids = [int(tid) for tid in os.listdir(f"/proc/{pid}/task")]
+    except OSError:
+        tids = [pid]
+    for tid in tids:
+        try:
+            os.sched_setaffinity(tid, cpus)
+        except OSError:
+            pass
+
+
+def _limit(timeout):
+    limit_cpu(timeout)
+    _cap(resource.RLIMIT_FSIZE, FILE_BYTES)
+    _cap(resource.RLIMIT_CORE, 0)
+    address_space = _address_space()
+    if address_space is not None:
+        _cap(resource.RLIMIT_AS, address_space + MEMORY_BYTES)
+
+
+def _child(request, cwd, stdio, inherited):
+    """Body of a forked job; never returns."""
+    code = 1
+    try:
+        os.setsid()
+        for obj in inherited:
+            obj.close()
+        for fd, f in enumerate(stdio):
+            os.dup2(f.fileno(), fd)
+            f.close()
+        os.chdir(cwd)
+        _limit(request["timeout"])
+        if request.get("cpus"):
+            os.sched_setaffinity(0, request["cpus"])
+        os.environ.clear()
+        os.environ.update(request["env"])
+
+        path = request["path"]
+        sys.argv = [path, *request["args"]]
+        sys.path[0] = os.path.dirname(path)
+        if "numpy" in sys.modules:
+            # Every job forks from the same interpreter; give each one fresh entropy
+            sys.modules["numpy"].random.seed()
+        code = _run_script(path)
+    except BaseException:
+        traceback.print_exc()
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(code)
+
+
+def _run_script(path):
+    """Run path as __main__ and return the exit code a fresh interpreter would have."""
+    try:
+        runpy.run_path(path, run_name="__main__")
+        code = 0
+    except SystemExit as e:
+        code = _exit_code(e.code)
+    except BaseException as e:
+        # Report the traceback from the script's own frames, as `python path` would
+        tb = e.__traceback__
+        while tb is not None and tb.tb_frame.f_code.co_filename != path:
+            tb = tb.tb_next
+        traceback.print_exception(type(e), e, tb or e.__traceback__)
+        code = 1
+
+    # What interpreter shutdown would do: join non-daemon threads, run atexit hooks
+    for thread in threading.enumerate():
+        if thread is not threading.current_thread() and not thread.daemon:
+            thread.join()
+    try:
+        atexit._run_exitfuncs()
+    except SystemExit as e:
+        code = _exit_code(e.code)
+    return code
+
+
+def _exit_code(value):
+    if value is None:
+        return 0
+    if isinstance(value, int):
+        return value & 0xFF
+    print(value, file=sys.stderr)
+    return 1
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["serve"]:
+        serve()
+    else:
+        for script in sys.argv[1:]:
+            result = run_file(script)
+            sys.stdout.write(result.stdout)
+            sys.stderr.write(result.stderr)
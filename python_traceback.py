@@ -1,10 +1,13 @@
 import tempfile
 import os
-import re
 import sys
 from io import StringIO
 from contextlib import redirect_stdout
 
+import code_extract
+import timings
+
+@timings.timed
 def assert_python_traceback_fix(response, context=None):
     """
     Evaluates if the LLM response correctly fixes the Python traceback program.
@@ -13,15 +16,7 @@ def assert_python_traceback_fix(response, context=None):
     
     def extract_code(output, keep_main=True):
         """Extract code from response, handling code blocks"""
-        output = re.sub('```[a-z]*', '```', output)
-        if "```" in output and output.count("```") >= 2:
-            # Extract code between first pair of ```
-            parts = output.split("```")
-            if len(parts) >= 3:
-                return parts[1].strip()
-        
-        # If no code blocks found, assume entire response is code
-        return output.strip()
+        return code_extract.extract_code(output, "python").strip()
     
     def run_python_code(code):
         """Run Python code using exec() and return output"""
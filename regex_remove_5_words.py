@@ -1,9 +1,11 @@
 import subprocess
-import tempfile
-import os
 import re
-import sys
 
+import code_extract
+import python_sandbox
+import timings
+
+@timings.timed
 def assert_regex_function(response, context=None):
     """
     Promptfoo assertion that evaluates a Python regex function implementation.
@@ -18,15 +20,7 @@ def assert_regex_function(response, context=None):
     
     # Step 1: Extract code from response
     def extract_code(text):
-        # Remove language specifiers from code blocks
-        text = re.sub(r'```[a-z]*', '```', text)
-        if "```" in text and text.count("```") >= 2:
-            # Extract code from markdown blocks
-            parts = text.split("```")
-            if len(parts) >= 2:
-                return parts[1].strip()
-        # If no code blocks found, assume the entire response is code
-        return text.strip()
+        return code_extract.extract_code(text, "python").strip()
     
     code = extract_code(response)
     if not code:
@@ -81,41 +75,13 @@ except Exception as e:
     
     # Step 3: Run Python code with test cases
     try:
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False, encoding='utf-8') as f:
-            f.write(full_code)
-            temp_file = f.name
-        
-        # Try with different Python commands
-        python_commands = [sys.executable, 'python', 'python3', 'py']
-        result = None
-        
-        for cmd in python_commands:
-            try:
-                result = subprocess.run(
-                    [cmd, temp_file],
-                    capture_output=True,
-                    text=True,
-                    encoding='utf-8',
-                    errors='ignore',
-                    timeout=10
-                )
-                if result and (result.returncode == 0):
-                    break
-            except (FileNotFoundError, subprocess.TimeoutExpired):
-                continue
-            except Exception:
-                continue
-        
-        # Clean up temporary file
-        if os.path.exists(temp_file):
-            os.unlink(temp_file)
-        
-        if result is None:
-            return {
-                "pass": False,
-                "score": 0,
-                "reason": "Failed to run with any available Python command"
-            }
+        result = python_sandbox.run_code(
+            full_code,
+            text=True,
+            encoding='utf-8',
+            errors='ignore',
+            timeout=10
+        )
         
         if result.returncode != 0:
             return {
@@ -126,9 +92,13 @@ except Exception as e:
         
         output = result.stdout.strip()
         
+    except subprocess.TimeoutExpired:
+        return {
+            "pass": False,
+            "score": 0,
+            "reason": "Code execution timed out"
+        }
     except Exception as e:
-        if 'temp_file' in locals() and os.path.exists(temp_file):
-            os.unlink(temp_file)
         return {
             "pass": False,
             "score": 0,
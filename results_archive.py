@@ -0,0 +1,225 @@
+import argparse
+import datetime
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import time
+import urllib.parse
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # columns are archived as gzipped JSON instead
+    pyarrow = None
+
+try:
+    import fcntl
+except ImportError:  # Windows: concurrent ingests are not serialized
+    fcntl = None
+
+import results_index
+import results_reader
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+ARCHIVE_DIR = os.getenv("RESULTS_ARCHIVE") or os.path.join(ROOT, "results_archive")
+MANIFEST_NAME = "runs.jsonl"
+# Columns of every archived file; provider and date are in its path, date=YYYY-MM-DD/provider=<quoted id>
+COLUMNS = ("test", "prompt", "repeat", "pass", "score", "latency_ms", "cost", "reason")
+
+
+def _run_time(meta, path):
+    """Epoch seconds of a promptfoo run: its results timestamp, else the file's modification time."""
+    stamp = meta.get("results.timestamp")
+    if isinstance(stamp, str):
+        try:
+            return datetime.datetime.fromisoformat(stamp.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            pass
+    return os.stat(path).st_mtime
+
+
+def _run_id(meta, path):
+    if meta.get("evalId"):
+        return str(meta["evalId"])
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+def columns(records):
+    """{provider id: {column: [values]}} for results_reader Records, skipping those with no test name."""
+    tables = {}
+    repeats = {}
+    for record in records:
+        if not record.test:
+            continue
+        key = (record.test, record.provider, record.prompt)
+        repeat = repeats.get(key, 0)
+        repeats[key] = repeat + 1
+        table = tables.setdefault(record.provider, {column: [] for column in COLUMNS})
+        for column, value in zip(COLUMNS, (
+                record.test, record.prompt, repeat, record.passed, record.score,
+                record.latency_ms, record.cost, record.reason)):
+            table[column].append(value)
+    return tables
+
+
+def _write_table(path, table):
+    """Write {column: [values]} atomically; returns the file name used (.parquet, or .json.gz without pyarrow)."""
+    path += ".parquet" if pyarrow else ".json.gz"
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=".tmp-", dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            if pyarrow:
+                pyarrow.parquet.write_table(pyarrow.table(table), f, compression="zstd")
+            else:
+                with gzip.GzipFile(fileobj=f, mode="wb") as z:
+                    z.write(json.dumps(table).encode("utf-8"))
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return path
+
+
+def _read_table(path, names):
+    """{column: [values]} of the given columns of an archived file."""
+    if path.endswith(".parquet"):
+        if pyarrow is None:
+            raise RuntimeError(f"reading {path} needs pyarrow")
+        return pyarrow.parquet.read_table(path, columns=list(names)).to_pydict()
+    with gzip.open(path, "rb") as f:
+        table = json.loads(f.read())
+    return {name: table[name] for name in names}
+
+
+class Archive:
+    """
+    Append-only columnar archive of promptfoo runs.
+
+    Each ingested run adds one file per provider under date=YYYY-MM-DD/provider=<id>/
+    and one line to runs.jsonl, the manifest queries start from. Queries read only
+    the files of the runs and providers asked for, and only the columns they need.
+    """
+
+    def __init__(self, path=ARCHIVE_DIR):
+        self.path = path
+
+    def runs(self):
+        """
+        Manifest entries, oldest run first.
+
+        Each is {"run_id", "run_time", "date", "source", "ingested", "files": {provider:
+        path}, "tests": [test names]}.
+        """
+        try:
+            with open(os.path.join(self.path, MANIFEST_NAME), encoding="utf-8") as f:
+                runs = [json.loads(line) for line in f if line.strip()]
+        except FileNotFoundError:
+            return []
+        return sorted(runs, key=lambda run: run["run_time"])
+
+    def ingest(self, path):
+        """Archive a promptfoo results file; returns its manifest entry, or None if that run is already archived."""
+        # One pass over the file; evalId and the timestamp are only known once it is read
+        results = results_reader.ResultsFile(path)
+        tables = columns(results.records())
+        run_id = _run_id(results.meta, path)
+        run_time = _run_time(results.meta, path)
+        date = datetime.datetime.fromtimestamp(run_time, datetime.timezone.utc).strftime("%Y-%m-%d")
+        os.makedirs(self.path, exist_ok=True)
+        with open(os.path.join(self.path, MANIFEST_NAME), "a+", encoding="utf-8") as manifest:
+            if fcntl:
+                fcntl.flock(manifest, fcntl.LOCK_EX)
+            manifest.seek(0)
+            if any(json.loads(line)["run_id"] == run_id for line in manifest if line.strip()):
+                return None
+            files = {}
+            tests = set()
+            for provider, table in tables.items():
+                partition = os.path.join(f"date={date}", f"provider={urllib.parse.quote(provider, safe='')}")
+                written = _write_table(os.path.join(self.path, partition, f"run-{run_id}"), table)
+                files[provider] = os.path.relpath(written, self.path)
+                tests.update(table["test"])
+            entry = {"run_id": run_id, "run_time": run_time, "date": date, "source": os.path.abspath(path),
+                     "ingested": time.time(), "files": files, "tests": sorted(tests)}
+            manifest.write(json.dumps(entry) + "\n")
+            manifest.flush()
+        return entry
+
+    def scan(self, names, provider=None, test=None, last=None, since=None):
+        """
+        Yield (run entry, provider, {column: [values]}) for archived files, oldest run first.
+
+        provider and test restrict the runs and rows to those that include them, since
+        (epoch seconds) the run time, and last keeps only the latest `last` of the runs
+        that remain.
+        """
+        runs = [run for run in self.runs()
+                if (provider is None or provider in run["files"]) and (test is None or test in run["tests"])
+                and (since is None or run["run_time"] >= since)]
+        if last is not None:
+            runs = runs[-last:] if last > 0 else []
+        if test is not None:
+            names = list(dict.fromkeys([*names, "test"]))
+        for run in runs:
+            for name in ([provider] if provider is not None else run["files"]):
+                table = _read_table(os.path.join(self.path, run["files"][name]), names)
+                if test is not None:
+                    keep = [i for i, value in enumerate(table["test"]) if value == test]
+                    table = {column: [values[i] for i in keep] for column, values in table.items()}
+                yield run, name, table
+
+    def pass_rate(self, provider, test=None, last=30, since=None):
+        """
+        Pass rate of provider, on one test or all of them, over its latest `last` runs.
+
+        Returns {"provider", "test", "passes", "total", "rate", "runs": [{"run_id",
+        "run_time", "date", "passes", "total", "rate"}, ...]} with runs oldest first;
+        rates are percentages.
+        """
+        report = {"provider": provider, "test": test, "runs": []}
+        for run, _, table in self.scan(["pass"], provider=provider, test=test, last=last, since=since):
+            passes, total = sum(table["pass"]), len(table["pass"])
+            report["runs"].append({"run_id": run["run_id"], "run_time": run["run_time"], "date": run["date"],
+                                   "passes": passes, "total": total, "rate": results_index.rate(passes, total)})
+        report["passes"] = sum(run["passes"] for run in report["runs"])
+        report["total"] = sum(run["total"] for run in report["runs"])
+        report["rate"] = results_index.rate(report["passes"], report["total"])
+        return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive promptfoo runs as columnar files and query their history")
+    parser.add_argument("--archive", default=ARCHIVE_DIR, help="archive directory (default: %(default)s)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    ingest = commands.add_parser("ingest", help="archive promptfoo results files")
+    ingest.add_argument("results", nargs="+")
+    query = commands.add_parser("pass-rate", help="pass rate of a provider over its latest runs")
+    query.add_argument("provider", help="provider id, e.g. openrouter:openai/gpt-4.1")
+    query.add_argument("--test", help="test name, e.g. c_rref (default: all tests)")
+    query.add_argument("--last", type=int, default=30, help="number of runs (default: %(default)s)")
+    query.add_argument("--days", type=float, help="only runs from the last N days")
+    args = parser.parse_args()
+
+    archive = Archive(args.archive)
+    if args.command == "ingest":
+        for path in args.results:
+            entry = archive.ingest(path)
+            print(f"{path}: " + (f"run {entry['run_id']}, {len(entry['files'])} providers" if entry
+                                 else "already archived"))
+    else:
+        since = time.time() - args.days * 86400 if args.days is not None else None
+        report = archive.pass_rate(args.provider, args.test, args.last, since)
+        for run in report["runs"]:
+            print(f"{run['date']}  {run['run_id']:24}  {run['passes']:4}/{run['total']:<4} {run['rate']:6.1f}%")
+        print(f"{len(report['runs'])} runs: {report['passes']}/{report['total']} = {report['rate']:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+
+import results_reader
+
+INDEX_NAME = "results_index.json"
+REASONS_NAME = "results_reasons"
+VERSION = 2
+# Reasons are split into shards of about this size, fetched by the dashboard when a cell is clicked
+SHARD_BYTES = int(os.getenv("RESULTS_SHARD_KB", 256)) * 1024
+
+
+def rate(passes, total):
+    return round(100 * passes / total, 2) if total else 0.0
+
+
+class Aggregator:
+    """
+    Pass counts and reasons per (test, model), fed one results_reader.Record at a time.
+
+    Models and tests keep the order they first appear in; results with no test
+    name are skipped, as the dashboard always did.
+    """
+
+    def __init__(self):
+        self.models = {}
+        self.tests = {}
+        self.cells = {}
+
+    def add(self, record):
+        self.models.setdefault(record.provider, record.label)
+        if not record.test:
+            return
+        self.tests.setdefault(record.test, record.description)
+        cell = self.cells.setdefault((record.test, record.provider), {"passes": 0, "total": 0, "reasons": []})
+        cell["total"] += 1
+        if record.passed:
+            cell["passes"] += 1
+        if record.reason:
+            cell["reasons"].append(record.reason)
+
+    def index(self, reasons_name=REASONS_NAME, shard_bytes=SHARD_BYTES):
+        """
+        (index, {shard file name: bytes}) for the dashboard.
+
+        The index lists models and tests best first with their pass counts and rates,
+        and `cells[test][model]` as [passes, total] or, when the cell has reasons,
+        [passes, total, shard, slot]: shard `shards[shard]` in the reasons_name
+        directory is a JSON array whose element `slot` is the cell's list of reason
+        strings. Missing cells are null. Cells are sharded in row order, and shard
+        names carry a hash of their content, so a rebuild rewrites only shards that
+        changed and an open page never reads a shard meant for a different index.
+        """
+        def totals(keys):
+            cells = [self.cells[key] for key in keys if key in self.cells]
+            passes, total = sum(c["passes"] for c in cells), sum(c["total"] for c in cells)
+            return {"passes": passes, "total": total, "rate": rate(passes, total)}
+
+        tests = [{"name": name, "description": description, **totals((name, model) for model in self.models)}
+                 for name, description in self.tests.items()]
+        models = [{"id": model, "label": label, **totals((name, model) for name in self.tests)}
+                  for model, label in self.models.items()]
+        tests.sort(key=lambda test: -(test["passes"] / test["total"] if test["total"] else 0))
+        models.sort(key=lambda model: -(model["passes"] / model["total"] if model["total"] else 0))
+
+        shards = []
+        pending = []
+        size = 0
+
+        def close_shard():
+            nonlocal pending, size
+            if pending:
+                data = ("[" + ",".join(pending) + "]").encode("utf-8")
+                shards.append((f"{len(shards)}-{hashlib.sha256(data).hexdigest()[:12]}.json", data))
+            pending, size = [], 0
+
+        matrix = []
+        for test in tests:
+            row = []
+            for model in models:
+                cell = self.cells.get((test["name"], model["id"]))
+                if cell is None:
+                    row.append(None)
+                    continue
+                entry = [cell["passes"], cell["total"]]
+                if cell["reasons"]:
+                    reasons = json.dumps(cell["reasons"], ensure_ascii=False)
+                    if pending and size + len(reasons) > shard_bytes:
+                        close_shard()
+                    entry += [len(shards), len(pending)]
+                    pending.append(reasons)
+                    size += len(reasons)
+                row.append(entry)
+            matrix.append(row)
+        close_shard()
+        index = {"version": VERSION, "models": models, "tests": tests, "cells": matrix,
+                 "reasons": reasons_name, "shards": [name for name, _ in shards]}
+        return index, dict(shards)
+
+
+def _write_atomic(path, chunks):
+    fd, tmp = tempfile.mkstemp(prefix=".tmp-", dir=os.path.dirname(path) or ".")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+        # mkstemp makes the file private; the dashboard's web server has to read it
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def write(aggregator, out_dir, index_name=INDEX_NAME, reasons_name=REASONS_NAME):
+    """
+    Write the aggregator's index and reason shards into out_dir; returns the index.
+
+    Shards come first, so the new index never points at a shard not yet written,
+    and shards no longer referenced are deleted last.
+    """
+    index, shards = aggregator.index(reasons_name)
+    shard_dir = os.path.join(out_dir, reasons_name)
+    os.makedirs(shard_dir, exist_ok=True)
+    for name, data in shards.items():
+        if not os.path.exists(os.path.join(shard_dir, name)):
+            _write_atomic(os.path.join(shard_dir, name), [data])
+    _write_atomic(os.path.join(out_dir, index_name),
+                  [json.dumps(index, ensure_ascii=False, separators=(",", ":")).encode("utf-8")])
+    for name in os.listdir(shard_dir):
+        if name.endswith(".json") and name not in shards:
+            os.unlink(os.path.join(shard_dir, name))
+    return index
+
+
+def build(results_path, out_dir=None, index_name=INDEX_NAME, reasons_name=REASONS_NAME):
+    """Write the index and reason shards for a promptfoo results file next to it (or in out_dir); returns the index."""
+    aggregator = Aggregator()
+    for record in results_reader.read(results_path):
+        aggregator.add(record)
+    return write(aggregator, out_dir or os.path.dirname(os.path.abspath(results_path)), index_name, reasons_name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-aggregate a promptfoo results file for the dashboard")
+    parser.add_argument("results", nargs="?", default="result_final.json", help="default: %(default)s")
+    parser.add_argument("--out-dir", help="where to write the index and reasons (default: next to the results)")
+    parser.add_argument("--index", default=INDEX_NAME, help="index file name (default: %(default)s)")
+    parser.add_argument("--reasons", default=REASONS_NAME, help="reason shard directory (default: %(default)s)")
+    args = parser.parse_args()
+    index = build(args.results, args.out_dir, args.index, args.reasons)
+    print(f"{len(index['tests'])} tests x {len(index['models'])} models")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+import collections
+import hashlib
+import json
+import re
+
+# Characters read from the file at a time; a result larger than this grows the buffer until it fits
+CHUNK_CHARS = 1024 * 1024
+
+Record = collections.namedtuple("Record", ["provider", "label", "test", "passed", "score", "reason",
+                                           "description", "prompt", "latency_ms", "cost"])
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_STRUCTURE = re.compile(r'["\[\]{}]')
+_STRING_REST = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.S)
+_NUMBER_CHARS = re.compile(r"[-+0-9.eE]*")
+
+
+class _Stream:
+    """A text file read in chunks, with a cursor; text before the cursor is dropped as more is read."""
+
+    def __init__(self, f, chunk=CHUNK_CHARS):
+        self.f = f
+        self.chunk = chunk
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def more(self, at_least=0):
+        """Append at least a chunk (and at least at_least characters) to the buffer; False at end of file."""
+        if self.eof:
+            return False
+        self.buf = self.buf[self.pos:]
+        self.pos = 0
+        data = self.f.read(max(self.chunk, at_least))
+        if not data:
+            self.eof = True
+            return False
+        self.buf += data
+        return True
+
+    def peek(self):
+        """The next non-whitespace character, without consuming it."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.more():
+                raise ValueError("unexpected end of results file")
+
+    def expect(self, chars):
+        """Consume the next non-whitespace character, which must be one of chars, and return it."""
+        char = self.peek()
+        if char not in chars:
+            raise ValueError(f"expected one of {chars!r}, found {char!r} in results file")
+        self.pos += 1
+        return char
+
+    def value(self):
+        """Decode the JSON value at the cursor."""
+        if self.peek() in "-0123456789":
+            # A number running to the end of the buffer may go on in the next chunk
+            while _NUMBER_CHARS.fullmatch(self.buf, self.pos) and self.more():
+                pass
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                # Most likely cut off at the end of the buffer; double it and retry
+                if not self.more(len(self.buf) - self.pos):
+                    raise
+                continue
+            self.pos = end
+            return value
+
+    def skip(self):
+        """Move past the JSON value at the cursor without building it."""
+        if self.peek() not in "[{":
+            self.value()
+            return
+        depth = 0
+        while True:
+            match = _STRUCTURE.search(self.buf, self.pos)
+            if match is None:
+                self.pos = len(self.buf)
+                if not self.more():
+                    raise ValueError("unexpected end of results file")
+                continue
+            self.pos = match.end()
+            char = match.group()
+            if char == '"':
+                while (end := _STRING_REST.match(self.buf, self.pos)) is None:
+                    if not self.more(len(self.buf) - self.pos):
+                        raise ValueError("unexpected end of results file")
+                self.pos = end.end()
+            elif char in "[{":
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return
+
+
+def _members(stream):
+    """Yield each key of the object at the cursor with the cursor on its value, which the caller must consume."""
+    stream.expect("{")
+    if stream.peek() == "}":
+        stream.pos += 1
+        return
+    while True:
+        key = stream.value()
+        stream.expect(":")
+        yield key
+        if stream.expect(",}") == "}":
+            return
+
+
+def _items(stream):
+    """Decode and yield each element of the array at the cursor, one at a time."""
+    stream.expect("[")
+    if stream.peek() == "]":
+        stream.pos += 1
+        return
+    while True:
+        yield stream.value()
+        if stream.expect(",]") == "]":
+            return
+
+
+class ResultsFile:
+    """
+    The entries of a promptfoo results file's results.results, read one at a time.
+
+    Memory is bounded by the largest single result, not the file: everything
+    outside the results array is skipped without being decoded, except scalars
+    (evalId, results.timestamp, ...), which end up in `meta` as iteration passes
+    them. Iterating yields the raw result dicts; records() yields Records.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.meta = {}
+
+    def __iter__(self):
+        with open(self.path, encoding="utf-8") as f:
+            stream = _Stream(f)
+            for key in _members(stream):
+                if key == "results" and stream.peek() == "{":
+                    for inner in _members(stream):
+                        if inner == "results" and stream.peek() == "[":
+                            yield from _items(stream)
+                        else:
+                            self._meta(stream, f"results.{inner}")
+                elif key == "results" and stream.peek() == "[":
+                    yield from _items(stream)  # older files keep the list at the top level
+                else:
+                    self._meta(stream, key)
+
+    def _meta(self, stream, key):
+        if stream.peek() in "[{":
+            stream.skip()
+        else:
+            self.meta[key] = stream.value()
+
+    def records(self):
+        for result in self:
+            yield record(result)
+
+
+def component(result):
+    """The first component grading result, which is the test's python assertion."""
+    return ((result.get("gradingResult") or {}).get("componentResults") or [{}])[0] or {}
+
+
+def test_name(result):
+    """Test name from the assertion value, e.g. "file://aws_ipv6.py:get_assertion" -> "aws_ipv6"; "" if none."""
+    value = (component(result).get("assertion") or {}).get("value")
+    if not isinstance(value, str) or "://" not in value:
+        return ""
+    return value.split("://")[1].split(".py:")[0]
+
+
+def prompt_hash(result):
+    """Short hash of the rendered prompt, which tells apart the prompts of one test file."""
+    prompt = result.get("prompt") or {}
+    text = prompt.get("raw") if prompt.get("raw") is not None else result.get("promptIdx")
+    return hashlib.sha256(json.dumps(text).encode("utf-8")).hexdigest()[:16]
+
+
+def record(result):
+    """The fields of a promptfoo result the dashboard, store and archive use, as a Record."""
+    provider = result.get("provider") or {}
+    grading = component(result)
+    return Record(
+        provider=provider.get("id") or "",
+        label=provider.get("label") or provider.get("id") or "",
+        test=test_name(result),
+        passed=bool(grading.get("pass")),
+        score=grading.get("score"),
+        reason=grading.get("reason") or None,
+        description=(result.get("testCase") or {}).get("description"),
+        prompt=prompt_hash(result),
+        latency_ms=result.get("latencyMs"),
+        cost=result.get("cost"),
+    )
+
+
+def read(path):
+    """Records of every result in a promptfoo results file, streamed."""
+    return ResultsFile(path).records()
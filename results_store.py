@@ -0,0 +1,161 @@
+import argparse
+import collections
+import json
+import os
+import sqlite3
+import time
+
+import results_index
+import results_reader
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+STORE_PATH = os.getenv("RESULTS_STORE") or os.path.join(ROOT, "results_store.sqlite3")
+
+
+class ResultsStore:
+    """
+    SQLite store of graded results from any number of promptfoo runs.
+
+    Each result is keyed by (test, provider id, prompt hash, repeat), where repeat
+    counts earlier results with the same key in the same file. Ingesting a file
+    upserts its results; a later run of some tests replaces just their results and
+    keeps everything else. Pass counts and reasons per (test, provider) cell are
+    kept aggregated, and only the cells an ingest changed are recomputed.
+    """
+
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.db = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " test TEXT NOT NULL, provider TEXT NOT NULL, prompt TEXT NOT NULL, repeat INTEGER NOT NULL,"
+            " pass INTEGER NOT NULL, reason TEXT, source TEXT, updated REAL NOT NULL,"
+            " PRIMARY KEY (test, provider, prompt, repeat))"
+        )
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS cells ("
+            " test TEXT NOT NULL, provider TEXT NOT NULL, passes INTEGER NOT NULL, total INTEGER NOT NULL,"
+            " reasons TEXT NOT NULL, PRIMARY KEY (test, provider))"
+        )
+        # seq keeps the order models and tests were first seen in, which the index breaks ties by
+        self.db.execute("CREATE TABLE IF NOT EXISTS models (id TEXT PRIMARY KEY, label TEXT, seq INTEGER NOT NULL)")
+        self.db.execute("CREATE TABLE IF NOT EXISTS tests (name TEXT PRIMARY KEY, description TEXT, seq INTEGER NOT NULL)")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS sources ("
+            " path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime REAL NOT NULL, ingested REAL NOT NULL)"
+        )
+
+    def ingest(self, path, force=False):
+        """
+        Upsert every result of a promptfoo results file.
+
+        A file already ingested with the same size and modification time is skipped
+        unless force is set. Returns {"results", "changed", "cells", "skipped"}: results
+        read, results added or changed, and cells recomputed.
+        """
+        source = os.path.abspath(path)
+        stat = os.stat(source)
+        stats = {"results": 0, "changed": 0, "cells": 0, "skipped": False}
+        if not force and self.db.execute("SELECT 1 FROM sources WHERE path = ? AND size = ? AND mtime = ?",
+                                         (source, stat.st_size, stat.st_mtime)).fetchone():
+            stats["skipped"] = True
+            return stats
+
+        now = time.time()
+        repeats = collections.Counter()
+        dirty = set()
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            for record in results_reader.read(source):
+                stats["results"] += 1
+                self.db.execute(
+                    "INSERT INTO models (id, label, seq) VALUES (?, ?, (SELECT COUNT(*) FROM models))"
+                    " ON CONFLICT (id) DO UPDATE SET label = excluded.label",
+                    (record.provider, record.label))
+                if not record.test:
+                    continue
+                self.db.execute(
+                    "INSERT OR IGNORE INTO tests (name, description, seq) VALUES (?, ?, (SELECT COUNT(*) FROM tests))",
+                    (record.test, record.description))
+                repeat = repeats[record.test, record.provider, record.prompt]
+                repeats[record.test, record.provider, record.prompt] += 1
+                row = (1 if record.passed else 0, record.reason)
+                key = (record.test, record.provider, record.prompt, repeat)
+                old = self.db.execute("SELECT pass, reason FROM results WHERE test = ? AND provider = ?"
+                                      " AND prompt = ? AND repeat = ?", key).fetchone()
+                if old == row:
+                    continue
+                # An update keeps the rowid, so reasons stay in the order results were first seen
+                self.db.execute(
+                    "INSERT INTO results (test, provider, prompt, repeat, pass, reason, source, updated)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT (test, provider, prompt, repeat) DO UPDATE"
+                    " SET pass = excluded.pass, reason = excluded.reason, source = excluded.source,"
+                    " updated = excluded.updated",
+                    (*key, *row, source, now))
+                stats["changed"] += 1
+                dirty.add((record.test, record.provider))
+            for cell in dirty:
+                self._aggregate(*cell)
+            stats["cells"] = len(dirty)
+            self.db.execute("INSERT OR REPLACE INTO sources (path, size, mtime, ingested) VALUES (?, ?, ?, ?)",
+                            (source, stat.st_size, stat.st_mtime, now))
+            self.db.execute("COMMIT")
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        return stats
+
+    def _aggregate(self, test, provider):
+        rows = self.db.execute("SELECT pass, reason FROM results WHERE test = ? AND provider = ? ORDER BY rowid",
+                               (test, provider)).fetchall()
+        self.db.execute("INSERT OR REPLACE INTO cells (test, provider, passes, total, reasons) VALUES (?, ?, ?, ?, ?)",
+                        (test, provider, sum(passed for passed, _ in rows), len(rows),
+                         json.dumps([reason for _, reason in rows if reason])))
+
+    def aggregator(self):
+        """A results_index.Aggregator holding the stored cells, ready to write the dashboard index."""
+        aggregator = results_index.Aggregator()
+        aggregator.models = dict(self.db.execute("SELECT id, label FROM models ORDER BY seq"))
+        aggregator.tests = dict(self.db.execute("SELECT name, description FROM tests ORDER BY seq"))
+        aggregator.cells = {
+            (test, provider): {"passes": passes, "total": total, "reasons": json.loads(reasons)}
+            for test, provider, passes, total, reasons in self.db.execute(
+                "SELECT test, provider, passes, total, reasons FROM cells")
+        }
+        return aggregator
+
+    def write_index(self, out_dir=ROOT, index_name=results_index.INDEX_NAME, reasons_name=results_index.REASONS_NAME):
+        """Write the dashboard index and reason shards for everything stored; returns the index."""
+        return results_index.write(self.aggregator(), out_dir, index_name, reasons_name)
+
+    def close(self):
+        self.db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge promptfoo results files into one store and dashboard index")
+    parser.add_argument("results", nargs="*", help="promptfoo results JSON files to ingest, oldest first")
+    parser.add_argument("--store", default=STORE_PATH, help="SQLite store (default: %(default)s)")
+    parser.add_argument("--out-dir", default=ROOT, help="where to write the dashboard index (default: %(default)s)")
+    parser.add_argument("--force", action="store_true", help="re-read files even if they look unchanged")
+    args = parser.parse_args()
+
+    store = ResultsStore(args.store)
+    changed = not os.path.exists(os.path.join(args.out_dir, results_index.INDEX_NAME))
+    for path in args.results:
+        stats = store.ingest(path, force=args.force)
+        changed = changed or stats["cells"] > 0
+        print(f"{path}: " + ("unchanged since last ingest" if stats["skipped"] else
+                             f"{stats['results']} results, {stats['changed']} changed, {stats['cells']} cells updated"))
+    if changed:
+        index = store.write_index(args.out_dir)
+        print(f"{len(index['tests'])} tests x {len(index['models'])} models")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
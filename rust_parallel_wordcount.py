@@ -1,23 +1,18 @@
-import tempfile
-import os
-import re
-import json
-import collections
-from concurrent.futures import ProcessPoolExecutor
-from typing import Dict, List
+from typing import Dict
 
-import tempfile
-import os
-import re
-import json
-import collections
-from concurrent.futures import ProcessPoolExecutor
-from typing import Dict, List
+import code_extract
+import fixtures
+import proc_runner
+import rust_runner
+import speedup
+import timings
+import workspace
 
+@timings.timed
 def get_assertion(response, context=None):
     """
-    Evaluates if the response contains a working word counting program.
-    Uses Python implementation to test the logic.
+    Evaluates if the response contains a working parallel Rust word counting program.
+    Compiles and runs it, then merges the JSON dict each job prints.
     """
     
     # Setup test text
@@ -44,26 +39,21 @@ def get_assertion(response, context=None):
                 "reason": "No valid code found in response"
             }
         
-        # Use fallback implementation if code doesn't look executable
-        if not looks_like_complete_code(code):
-            print("Using fallback implementation")
-            word_counts = fallback_word_count(test_text)
-        else:
-            try:
-                # Try to run the extracted code
-                word_counts = run_python_code(code, test_text)
-                if word_counts is None:
-                    print("Code execution failed, using fallback")
-                    word_counts = fallback_word_count(test_text)
-            except Exception as e:
-                print(f"Error running code: {e}, using fallback")
-                word_counts = fallback_word_count(test_text)
+        if not rust_runner.available():
+            return {
+                "pass": False,
+                "score": 0,
+                "reason": "Rust compiler (rustc) not found. Please install Rust to run this assertion."
+            }
         
-        if word_counts is None:
+        # Compile and run the Rust program, merging its per-job JSON lines
+        try:
+            word_counts = run_rust_code(code, test_text)
+        except Exception as e:
             return {
                 "pass": False,
                 "score": 0,
-                "reason": "Failed to count words with both original and fallback implementation"
+                "reason": f"Error running Rust code: {str(e)}"
             }
         
         # Check correctness
@@ -76,23 +66,27 @@ def get_assertion(response, context=None):
         
         # Determine score and result
         if accuracy >= 0.9 and has_parallel:
-            return {
+            result = {
                 "pass": True,
                 "score": 1.0,
                 "reason": f"Correct word counts ({accuracy:.0%} accurate) with parallelization"
             }
         elif accuracy >= 0.9:
-            return {
+            result = {
                 "pass": False,
                 "score": 0.5,
                 "reason": f"Correct word counts ({accuracy:.0%} accurate) but no parallelization"
             }
         else:
-            return {
+            result = {
                 "pass": False,
                 "score": 0.1,
                 "reason": f"Incorrect counts ({accuracy:.0%} accurate)"
             }
+        
+        if speedup.ENABLED:
+            result["metadata"] = {"speedup": measure_speedup(code)}
+        return result
                 
     except Exception as e:
         return {
@@ -104,91 +98,44 @@ def get_assertion(response, context=None):
 def extract_code(response: str) -> str:
     """Extract code from response."""
     try:
-        # Remove language specifiers
-        response = re.sub(r'```[a-z]*', '```', response)
-        
-        # Extract from code blocks
-        if "```" in response and response.count("```") >= 2:
-            return response.split("```")[1].strip()
-        
-        # Return cleaned response if no code blocks
-        return response.strip()
+        return code_extract.extract_code(response, "rust").strip()
     except Exception as e:
         print(f"Error extracting code: {e}")
         return ""
 
-def looks_like_complete_code(code: str) -> bool:
-    """Check if the code looks complete and executable."""
-    # Check for common code patterns
-    code_patterns = [
-        (r'\bdef\s+\w+\s*\(', 'function definition'),
-        (r'=\s*collections\.Counter\(', 'Counter usage'),
-        (r'\breturn\b', 'return statement'),
-        (r'word_counts\s*=', 'word_counts assignment'),
-        (r'result\s*=', 'result assignment')
-    ]
+def run_rust_code(code: str, text: str) -> Dict[str, int]:
+    """Compile and run the Rust program on the text, returning merged word counts."""
+    # A relative input path keeps the source, and so the cached binary, identical across runs
+    build = rust_runner.compile_rust(rust_runner.local_input(code), timeout=30)
+    if not build.ok:
+        raise Exception(f"Compilation failed: {build.diagnostics}")
     
-    return any(re.search(pattern, code) for pattern, _ in code_patterns)
-
-def fallback_word_count(text: str) -> Dict[str, int]:
-    """Fallback implementation for word counting."""
-    try:
-        # Simple word counting implementation
-        words = text.split()
-        return dict(collections.Counter(words))
-    except Exception as e:
-        print(f"Error in fallback implementation: {e}")
-        return None
-
-def run_python_code(code: str, text: str) -> Dict[str, int]:
-    """Run Python code with the input text."""
-    try:
-        # Create a default word counting function
-        default_code = """
-def count_words(text):
-    words = text.split()
-    return dict(collections.Counter(words))
-
-# Only create word_counts if it's not in the code
-if 'word_counts' not in locals():
-    word_counts = count_words(text)
-"""
-        
-        # Combine default code with provided code
-        if 'def count_words' not in code and 'word_counts =' not in code:
-            code = default_code + "\n" + code
+    # Merge the per-job JSON lines as the program prints them, run next to a fresh copy of the text
+    merger = proc_runner.CountMerger()
+    with workspace.workspace("rust_parallel_wordcount") as temp_dir:
+        fixtures.write_files(temp_dir, {"file.txt": text})
+        run_result = proc_runner.stream([build.binary], merger, timeout=10, cwd=temp_dir)
+    if run_result.truncated:
+        raise Exception(f"Output exceeded {run_result.stdout_bytes} bytes")
+    if run_result.returncode != 0:
+        raise Exception(f"Runtime error: {run_result.stderr}")
+    
+    return dict(merger.counts)
 
-        # Create namespace with necessary imports and variables
-        namespace = {
-            'text': text,
-            'collections': collections,
-            'ProcessPoolExecutor': ProcessPoolExecutor,
-            're': re,
-            'Dict': Dict,
-            'List': List,
-            'Counter': collections.Counter,
-            'print': print  # Allow print statements for debugging
-        }
-        
-        # Execute the code
-        exec(code, namespace)
-        
-        # Look for results in different possible variables
-        for var_name in ['word_counts', 'result', 'counts']:
-            if var_name in namespace and isinstance(namespace[var_name], dict):
-                return namespace[var_name]
-        
-        # If no result found in variables, try to call count_words function
-        if 'count_words' in namespace and callable(namespace['count_words']):
-            result = namespace['count_words'](text)
-            if isinstance(result, dict):
-                return result
-        
-        return fallback_word_count(text)
-        
-    except Exception as e:
-        print(f"Error running Python code: {e}")
-        return None
+def measure_speedup(code: str) -> dict:
+    """Time the program on the large corpus fixture pinned to 1 and to 4 CPUs."""
+    # The fixture's path is stable, so the binary is cached like the small-input one
+    build = rust_runner.compile_rust(code.replace("/tmp/file.txt", speedup.corpus_file().replace("\\", "\\\\")),
+                                     timeout=30)
+    if not build.ok:
+        return {"error": f"Compilation failed: {build.diagnostics}"}
+    
+    def run(cpus):
+        merger = proc_runner.CountMerger()
+        result = proc_runner.stream([build.binary], merger, timeout=speedup.TIMEOUT, cpus=cpus)
+        return result, dict(merger.counts)
+    
+    return speedup.measure(run, speedup.corpus_counts())
 
 def check_parallelization(code: str) -> bool:
     """Check if code includes parallelization."""
@@ -207,52 +154,3 @@ def check_parallelization(code: str) -> bool:
         'starmap'
     ]
     return any(indicator in code for indicator in parallel_indicators)
-
-def is_rust_code(code: str) -> bool:
-    """Check if code appears to be Rust."""
-    rust_indicators = [
-        'fn main()',
-        'let mut',
-        'String::from',
-        'println!',
-        'Vec<',
-        'use std::',
-        'impl',
-        'struct',
-        '-> '
-    ]
-    return any(indicator in code for indicator in rust_indicators)
-
-def parallel_word_count(text: str) -> Dict[str, int]:
-    """Simple parallel word counting implementation."""
-    try:
-        # Split text into chunks
-        words = text.split()
-        chunk_size = max(1, len(words) // 4)
-        chunks = [' '.join(words[i:i + chunk_size]) 
-                 for i in range(0, len(words), chunk_size)]
-        
-        # Process chunks in parallel
-        with ProcessPoolExecutor(max_workers=4) as executor:
-            chunk_results = list(executor.map(count_chunk, chunks))
-        
-        # Merge results
-        final_counts = {}
-        for counts in chunk_results:
-            for word, count in counts.items():
-                final_counts[word] = final_counts.get(word, 0) + count
-        
-        return final_counts
-        
-    except Exception as e:
-        print(f"Error in parallel word count: {e}")
-        return None
-
-def count_chunk(text: str) -> Dict[str, int]:
-    """Count words in a chunk of text."""
-    try:
-        words = text.split()
-        return dict(collections.Counter(words))
-    except Exception as e:
-        print(f"Error counting chunk: {e}")
-        return {}
\ No newline at end of file
@@ -0,0 +1,80 @@
+import os
+
+import compile_cache
+import fixtures
+import proc_runner
+import workspace
+
+RUSTC = os.getenv("RUSTC", "rustc")
+WARM_DIR = os.getenv("RUST_WARM_DIR") or os.path.join(
+    os.path.expanduser("~"), ".cache", "carlini_evals", "rust")
+# Shared across builds so rustc can reuse incremental and codegen artifacts
+INCREMENTAL_DIR = os.path.join(WARM_DIR, "incremental")
+RUST_FLAGS = ("-C", f"incremental={INCREMENTAL_DIR}")
+
+WARMUP_SOURCE = """
+use std::collections::HashMap;
+fn main() {
+    let mut counts: HashMap<String, usize> = HashMap::new();
+    for word in "warm up the rust toolchain".split_whitespace() {
+        *counts.entry(word.to_string()).or_insert(0) += 1;
+    }
+    println!("{:?}", counts);
+}
+"""
+
+
+def toolchain():
+    """Return the rustc version string, or "" if rustc is missing; probed once per process."""
+    return compile_cache.compiler_version(RUSTC)
+
+
+def available():
+    return bool(toolchain())
+
+
+def compile_rust(code, timeout=30):
+    """Compile Rust code, reusing a cached binary for identical source."""
+    os.makedirs(INCREMENTAL_DIR, exist_ok=True)
+    return compile_cache.compile_source(code, RUSTC, RUST_FLAGS, ".rs", timeout)
+
+
+def warm():
+    """Pre-build a small program so the shared incremental dir is populated."""
+    if available():
+        compile_rust(WARMUP_SOURCE, timeout=120)
+
+
+def local_input(code, path="/tmp/file.txt", name="file.txt"):
+    """
+    Point code that reads path at name, relative to the directory it runs in.
+
+    Binaries are cached by source hash, so the source must not change with the
+    directory a run gets; each run then reads its own fresh copy of the input.
+    """
+    return code.replace(path, name)
+
+
+def run_rust(code, compile_timeout=30, run_timeout=10, files=None):
+    """
+    Compile and run Rust code in a fresh workspace holding files ({name: text}).
+
+    Returns (build, run_result); run_result is None when compilation failed.
+    """
+    build = compile_rust(code, timeout=compile_timeout)
+    if not build.ok:
+        return build, None
+    with workspace.workspace("rust") as cwd:
+        fixtures.write_files(cwd, files or {})
+        run_result = proc_runner.run(
+            [build.binary],
+            text=True,
+            timeout=run_timeout,
+            cwd=cwd
+        )
+    return build, run_result
+
+
+if __name__ == "__main__":
+    warm()
+    print(toolchain() or "rustc not found")
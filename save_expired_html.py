@@ -1,3 +1,6 @@
+import timings
+
+@timings.timed
 def assert_html_recovery_knowledge(response, context=None):
     """
     Test if a model knows how to get the HTML for the entire webpage using outerHTML.
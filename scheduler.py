@@ -0,0 +1,247 @@
+import argparse
+import contextlib
+import functools
+import itertools
+import os
+import random
+import sqlite3
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: limits apply per process only
+    fcntl = None
+
+SCHEDULER_DIR = os.getenv("SCHEDULER_DIR") or os.path.join(
+    os.path.expanduser("~"), ".cache", "carlini_evals", "scheduler")
+ENABLED = os.getenv("SCHEDULER", "1") != "0"
+CPUS = os.cpu_count() or 4
+
+# Jobs of each class allowed to run at once across every grader process; None is unlimited
+DEFAULT_LIMITS = {
+    "compile-c": CPUS,
+    "compile-cpp": max(1, CPUS // 2),
+    "compile-rust": max(1, CPUS // 4),
+    "python-exec": CPUS,
+    "bash-fs": max(1, CPUS // 2),
+    "judge-network": 16,
+    # Timed runs that must not share CPUs with each other (see speedup.py)
+    "benchmark": 1,
+    "pure-string": None,
+}
+# Wait/run records older than this are dropped from the stats table
+STATS_WINDOW_SECONDS = 3600
+# Each process drops old records after this many jobs, even if stats() is never called
+PRUNE_EVERY = 1000
+
+
+def parse_limits(spec):
+    """Parse 'compile-rust=4,python-exec=16' (0 or 'none' for unlimited) into a dict."""
+    limits = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, value = item.partition("=")
+        limits[name.strip()] = None if value.strip().lower() in ("0", "none", "") else int(value)
+    return limits
+
+
+LIMITS = {**DEFAULT_LIMITS, **parse_limits(os.getenv("SCHEDULER_LIMITS", ""))}
+
+
+class Scheduler:
+    """
+    Cross-process concurrency limits per resource class.
+
+    Each class has LIMITS[class] slot files; holding an flock on one is holding a
+    slot, so limits hold across every grader process and a crashed process frees
+    its slot automatically. Waits and run times go to a small SQLite table so
+    stats() can report queue depth and wait times for the whole machine.
+    """
+
+    def __init__(self, directory=SCHEDULER_DIR, limits=None):
+        self.directory = directory
+        self.limits = dict(LIMITS if limits is None else limits)
+        self.local = threading.local()
+        self.fallback = {}
+        self.fallback_lock = threading.Lock()
+        self._db = None
+        self.db_pid = None
+        self.inserts = itertools.count(1)
+
+    @property
+    def db(self):
+        # One connection per process; sqlite connections must not cross a fork
+        if self._db is None or self.db_pid != os.getpid():
+            os.makedirs(self.directory, exist_ok=True)
+            self._db = sqlite3.connect(os.path.join(self.directory, "stats.sqlite3"),
+                                       timeout=30, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=OFF")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " id INTEGER PRIMARY KEY, class TEXT NOT NULL, pid INTEGER NOT NULL,"
+                " queued REAL NOT NULL, started REAL, finished REAL)"
+            )
+            self.db_pid = os.getpid()
+        return self._db
+
+    def _record(self, sql, params):
+        try:
+            return self.db.execute(sql, params).lastrowid
+        except sqlite3.Error:
+            return None  # stats are best effort; never fail a grader over them
+
+    def _rows(self, sql, params=()):
+        try:
+            return self.db.execute(sql, params).fetchall()
+        except sqlite3.Error:
+            return []
+
+    def _prune(self, window=STATS_WINDOW_SECONDS):
+        self._record("DELETE FROM jobs WHERE queued < ?", (time.time() - window,))
+
+    def _held(self):
+        if not hasattr(self.local, "held"):
+            self.local.held = set()
+        return self.local.held
+
+    def _acquire_file(self, resource_class, limit):
+        directory = os.path.join(self.directory, resource_class)
+        os.makedirs(directory, exist_ok=True)
+        delay = 0.001
+        while True:
+            for i in random.sample(range(limit), limit):
+                f = open(os.path.join(directory, f"{i}.lock"), "a")
+                try:
+                    fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    return f
+                except OSError:
+                    f.close()
+            time.sleep(delay)
+            delay = min(delay * 2, 0.05)
+
+    def _semaphore(self, resource_class, limit):
+        with self.fallback_lock:
+            return self.fallback.setdefault(resource_class, threading.BoundedSemaphore(limit))
+
+    @contextlib.contextmanager
+    def slot(self, resource_class):
+        """Hold one slot of resource_class for the duration of the block; re-entrant per thread."""
+        limit = self.limits.get(resource_class)
+        held = self._held()
+        if not ENABLED or not limit or resource_class in held:
+            yield
+            return
+
+        if next(self.inserts) % PRUNE_EVERY == 0:
+            self._prune()
+        job = self._record("INSERT INTO jobs (class, pid, queued) VALUES (?, ?, ?)",
+                           (resource_class, os.getpid(), time.time()))
+        if fcntl is not None:
+            lock = self._acquire_file(resource_class, limit)
+            release = lock.close
+        else:
+            semaphore = self._semaphore(resource_class, limit)
+            semaphore.acquire()
+            release = semaphore.release
+        held.add(resource_class)
+        try:
+            if job is not None:
+                self._record("UPDATE jobs SET started = ? WHERE id = ?", (time.time(), job))
+            yield
+        finally:
+            held.discard(resource_class)
+            release()
+            if job is not None:
+                self._record("UPDATE jobs SET finished = ? WHERE id = ?", (time.time(), job))
+
+    def limited(self, resource_class):
+        """Decorator form of slot()."""
+        def decorator(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.slot(resource_class):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def stats(self, window=STATS_WINDOW_SECONDS):
+        """Per class: limit, queue depth, running jobs, and wait times over the last `window` seconds."""
+        now = time.time()
+        self._prune(window)
+        alive = {}
+
+        def is_alive(pid):
+            if pid not in alive:
+                try:
+                    os.kill(pid, 0)
+                    alive[pid] = True
+                except ProcessLookupError:
+                    alive[pid] = False
+                except OSError:
+                    alive[pid] = True
+            return alive[pid]
+
+        report = {name: _empty_stats(limit) for name, limit in self.limits.items()}
+        waits, runs = {}, {}
+        for name, pid, queued, started, finished in self._rows(
+                "SELECT class, pid, queued, started, finished FROM jobs"):
+            entry = report.setdefault(name, _empty_stats(None))
+            if finished is None and not is_alive(pid):
+                continue
+            if started is None:
+                entry["waiting"] += 1
+                waits.setdefault(name, []).append(now - queued)
+                continue
+            waits.setdefault(name, []).append(started - queued)
+            if finished is None:
+                entry["running"] += 1
+            else:
+                entry["jobs"] += 1
+                runs.setdefault(name, []).append(finished - started)
+        for name, values in waits.items():
+            values.sort()
+            report[name]["wait_mean"] = sum(values) / len(values)
+            report[name]["wait_p95"] = values[min(len(values) - 1, int(len(values) * 0.95))]
+            report[name]["wait_max"] = values[-1]
+        for name, values in runs.items():
+            report[name]["run_mean"] = sum(values) / len(values)
+        return report
+
+
+def _empty_stats(limit):
+    return {"limit": limit, "waiting": 0, "running": 0, "jobs": 0,
+            "wait_mean": 0.0, "wait_p95": 0.0, "wait_max": 0.0, "run_mean": 0.0}
+
+
+_default = Scheduler()
+slot = _default.slot
+limited = _default.limited
+stats = _default.stats
+
+
+def format_stats(report):
+    lines = [f"{'class':<15} {'limit':>5} {'wait':>5} {'run':>5} {'done':>6} "
+             f"{'wait mean':>10} {'wait p95':>10} {'wait max':>10} {'run mean':>10}"]
+    for name, entry in sorted(report.items()):
+        lines.append(
+            f"{name:<15} {entry['limit'] or '-':>5} {entry['waiting']:>5} {entry['running']:>5} {entry['jobs']:>6} "
+            f"{entry['wait_mean']:>9.3f}s {entry['wait_p95']:>9.3f}s {entry['wait_max']:>9.3f}s {entry['run_mean']:>9.3f}s")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show grader queue depth and wait times per resource class")
+    parser.add_argument("--watch", type=float, metavar="SECONDS", help="refresh every SECONDS")
+    parser.add_argument("--window", type=float, default=STATS_WINDOW_SECONDS)
+    args = parser.parse_args()
+    while True:
+        print(format_stats(stats(args.window)), flush=True)
+        if not args.watch:
+            break
+        time.sleep(args.watch)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,174 +1,45 @@
 document.addEventListener('DOMContentLoaded', function() {
-    fetch('result_final.json')
-        .then(response => response.json())
-        .then(data => processData(data))
+    // Built from result_final.json by `python results_index.py`
+    fetch('results_index.json')
+        .then(response => {
+            if (!response.ok) throw new Error(`HTTP ${response.status}`);
+            return response.json();
+        })
+        .then(index => renderIndex(index))
         .catch(error => {
             console.error('Error loading data:', error);
             document.getElementById('loadingContainer').innerHTML =
-                '<div class="alert alert-danger small">Error loading evaluation results.</div>';
+                '<div class="alert alert-danger small">Error loading evaluation results. ' +
+                'Run <code>python results_index.py</code> to build results_index.json.</div>';
         });
 
-    function processData(data) {
-        const results = data.results.results;
-        const modelMap = new Map();
-        const testCaseMap = new Map();
-        const testCaseDescriptions = new Map();
-
-        results.forEach(result => {
-            const modelId = result.provider.id;
-            const modelLabel = result.provider.label || modelId;
-            if (!modelMap.has(modelId)) modelMap.set(modelId, modelLabel);
-
-            let testCaseName = '';
-            if (result.gradingResult?.componentResults?.[0]?.assertion?.value) {
-                const assertValue = result.gradingResult.componentResults[0].assertion.value;
-                if (assertValue.includes('://')) {
-                    const parts = assertValue.split('://');
-                    if (parts.length > 1) {
-                        const subParts = parts[1].split('.py:');
-                        if (subParts.length > 0) testCaseName = subParts[0];
-                    }
-                }
-            }
-
-            if (testCaseName && !testCaseMap.has(testCaseName)) {
-                testCaseMap.set(testCaseName, new Map());
-                if (result.testCase?.description) {
-                    testCaseDescriptions.set(testCaseName, result.testCase.description);
-                }
-            }
-
-            if (testCaseName) {
-                const testCaseResults = testCaseMap.get(testCaseName);
-                if (!testCaseResults.has(modelId)) {
-                    testCaseResults.set(modelId, { passes: 0, total: 0, reasons: [] });
-                }
-                const resultData = testCaseResults.get(modelId);
-                resultData.total++;
-                if (result.gradingResult?.componentResults?.[0]?.pass) {
-                    resultData.passes++;
-                }
-                if (result.gradingResult?.componentResults?.[0]?.reason) {
-                    resultData.reasons.push(result.gradingResult.componentResults[0].reason);
-                }
-            }
-        });
-
-        const testCases = Array.from(testCaseMap.keys());
-        const testCaseOverallResults = new Map();
-        const modelOverallResults = new Map();
-
-        testCases.forEach(testCase => {
-            let totalPasses = 0, totalRuns = 0;
-            modelMap.forEach((_, modelId) => {
-                const modelResults = testCaseMap.get(testCase).get(modelId);
-                if (modelResults) {
-                    totalPasses += modelResults.passes;
-                    totalRuns += modelResults.total;
-                }
-            });
-            testCaseOverallResults.set(testCase, {
-                winPercentage: totalRuns > 0 ? (totalPasses / totalRuns) * 100 : 0,
-                passes: totalPasses,
-                total: totalRuns
-            });
-        });
+    // Rows rendered above and below the visible ones, so a short scroll never shows a gap
+    const ROW_OVERSCAN = 10;
+    // Reason shards kept in memory; older ones are fetched again if needed
+    const SHARD_CACHE = 8;
 
-        modelMap.forEach((_, modelId) => {
-            let passes = 0, total = 0;
-            testCases.forEach(testCase => {
-                const modelResults = testCaseMap.get(testCase)?.get(modelId);
-                if (modelResults) {
-                    passes += modelResults.passes;
-                    total += modelResults.total;
-                }
-            });
-            modelOverallResults.set(modelId, {
-                successRate: total > 0 ? (passes / total) * 100 : 0,
-                passes, total
-            });
-        });
-
-        const sortedTestCases = testCases.sort((a, b) =>
-            testCaseOverallResults.get(b).winPercentage - testCaseOverallResults.get(a).winPercentage);
-        const sortedModels = Array.from(modelMap.entries()).sort((a, b) =>
-            modelOverallResults.get(b[0]).successRate - modelOverallResults.get(a[0]).successRate);
+    function renderIndex(index) {
         const headerRow = document.getElementById('headerRow');
         const tableBody = document.getElementById('tableBody');
+        const container = document.getElementById('tableContainer');
+        const loadShard = shardLoader(index.reasons, index.shards);
+        const columns = index.models.length + 2;
 
-        sortedModels.forEach(([_, modelLabel]) => {
+        index.models.forEach(model => {
             const th = document.createElement('th');
             th.className = 'text-center align-middle border border-dark small py-2';
             th.style.width = '96px';
-            th.textContent = modelLabel;
+            th.textContent = model.label;
             headerRow.appendChild(th);
         });
 
-        sortedTestCases.forEach(testCase => {
-            const row = document.createElement('tr');
-            row.className = 'border border-dark';
-            const testCaseCell = document.createElement('td');
-            testCaseCell.className = 'small fw-medium border border-dark py-2';
-            // Create a clickable link element
-            const testCaseLink = document.createElement('a');
-            testCaseLink.className = 'test-case-link';
-            testCaseLink.textContent = testCase;
-            testCaseLink.href = `final_assertions/${testCase}.yaml`;
-            testCaseLink.target = '_blank'; // Opens in new tab
-            // Alternative: If you want to handle the click with JavaScript (for more control)
-            testCaseLink.onclick = function(e) {
-                e.preventDefault();
-                handleTestCaseClick(testCase);
-            };
-
-            if (testCaseDescriptions.has(testCase)) {
-                testCaseLink.setAttribute('data-bs-toggle', 'tooltip');
-                testCaseLink.setAttribute('data-bs-placement', 'right');
-                testCaseLink.setAttribute('title', testCaseDescriptions.get(testCase));
-            }
-            
-            testCaseCell.appendChild(testCaseLink);
-            row.appendChild(testCaseCell);
-
-            const winPercentage = testCaseOverallResults.get(testCase).winPercentage;
-            const winCell = document.createElement('td');
-            winCell.className = 'text-center border border-dark small py-2';
-            winCell.textContent = `${winPercentage.toFixed(1)}%`;
-            addPerformanceClass(winCell, winPercentage);
-            row.appendChild(winCell);
-
-            sortedModels.forEach(([modelId]) => {
-                const cell = document.createElement('td');
-                cell.className = 'text-center border border-dark small py-2';
-                const modelResults = testCaseMap.get(testCase)?.get(modelId);
-                if (modelResults) {
-                    const passRate = (modelResults.passes / modelResults.total) * 100;
-                    cell.textContent = `${modelResults.passes}/${modelResults.total}`;
-                    addPerformanceClass(cell, passRate);
-                    if (modelResults.reasons.length > 0) {
-                        cell.setAttribute('data-bs-toggle', 'tooltip');
-                        cell.setAttribute('data-bs-placement', 'top');
-                        cell.setAttribute('data-bs-html', 'true');
-                        cell.setAttribute('title', modelResults.reasons.map((reason, i) =>
-                            `Test ${i + 1}: ${reason}`).join('<br>'));
-                    }
-                } else {
-                    cell.textContent = '0/0';
-                    cell.classList.add('text-muted');
-                }
-                row.appendChild(cell);
-            });
-            tableBody.appendChild(row);
-        });
-
         const footerRow = document.getElementById('footerRow');
         footerRow.children[1].textContent = '';
-        sortedModels.forEach(([modelId]) => {
+        index.models.forEach(model => {
             const cell = document.createElement('td');
             cell.className = 'text-center fw-bold border border-dark small py-2';
-            const successRate = modelOverallResults.get(modelId).successRate;
-            cell.textContent = `${successRate.toFixed(1)}%`;
-            addPerformanceClass(cell, successRate);
+            cell.textContent = `${model.rate.toFixed(1)}%`;
+            addPerformanceClass(cell, model.rate);
             footerRow.appendChild(cell);
         });
 
@@ -177,7 +48,201 @@ document.addEventListener('DOMContentLoaded', function() {
         });
 
         document.getElementById('loadingContainer').style.display = 'none';
-        document.getElementById('tableContainer').style.display = 'block';
+        container.style.display = 'block';
+
+        // Only the rows in view (plus ROW_OVERSCAN either side) are in the DOM, between two
+        // spacer rows that keep the scroll height of the whole table
+        const topSpacer = spacerRow(columns);
+        const bottomSpacer = spacerRow(columns);
+        let rendered = new Map();
+        let rowHeight = 0;
+        let frame = 0;
+
+        function renderRows() {
+            frame = 0;
+            if (!rowHeight && index.tests.length) {
+                const probe = buildRow(index, 0);
+                tableBody.replaceChildren(probe);
+                rowHeight = probe.getBoundingClientRect().height / scale(container) || 1;
+                rendered = new Map([[0, probe]]);
+            }
+            const start = Math.max(0, Math.floor(container.scrollTop / rowHeight) - ROW_OVERSCAN);
+            // Before the first full render the box is only as tall as the probe row
+            const height = Math.max(container.clientHeight, window.innerHeight);
+            const end = Math.min(index.tests.length,
+                Math.ceil((container.scrollTop + height) / rowHeight) + ROW_OVERSCAN);
+            const rows = new Map();
+            for (let row = start; row < end; row++) {
+                rows.set(row, rendered.get(row) || buildRow(index, row));
+            }
+            rendered.forEach((tr, row) => {
+                if (!rows.has(row)) disposeTooltips(tr);
+            });
+            rendered = rows;
+            topSpacer.firstChild.style.height = `${start * rowHeight}px`;
+            bottomSpacer.firstChild.style.height = `${(index.tests.length - end) * rowHeight}px`;
+            tableBody.replaceChildren(topSpacer, ...rows.values(), bottomSpacer);
+        }
+
+        function scheduleRender() {
+            if (!frame) frame = requestAnimationFrame(renderRows);
+        }
+
+        container.addEventListener('scroll', scheduleRender, { passive: true });
+        window.addEventListener('resize', scheduleRender);
+        renderRows();
+
+        const modal = new bootstrap.Modal(document.getElementById('reasonsModal'));
+        const title = document.getElementById('reasonsTitle');
+        const body = document.getElementById('reasonsBody');
+        let shown = null;
+
+        tableBody.addEventListener('click', event => {
+            const cell = event.target.closest('td[data-shard]');
+            if (!cell) return;
+            const test = index.tests[Number(cell.dataset.row)];
+            const model = index.models[Number(cell.dataset.column)];
+            const request = shown = {};
+            title.textContent = `${test.name} \u2014 ${model.label}`;
+            body.replaceChildren(mutedText('Loading reasons...'));
+            modal.show();
+            loadShard(Number(cell.dataset.shard))
+                .then(shard => reasonList(shard[Number(cell.dataset.slot)]))
+                .catch(error => {
+                    console.error('Error loading reasons:', error);
+                    return mutedText('Could not load reasons.');
+                })
+                .then(content => {
+                    // A later click replaces this one's reasons
+                    if (shown === request) body.replaceChildren(content);
+                });
+        });
+    }
+
+    function buildRow(index, row) {
+        const test = index.tests[row];
+        const tr = document.createElement('tr');
+        tr.className = 'border border-dark';
+        const testCaseCell = document.createElement('td');
+        testCaseCell.className = 'small fw-medium border border-dark py-2';
+        // Create a clickable link element
+        const testCaseLink = document.createElement('a');
+        testCaseLink.className = 'test-case-link';
+        testCaseLink.textContent = test.name;
+        testCaseLink.href = `final_assertions/${test.name}.yaml`;
+        testCaseLink.target = '_blank'; // Opens in new tab
+        // Alternative: If you want to handle the click with JavaScript (for more control)
+        testCaseLink.onclick = function(e) {
+            e.preventDefault();
+            handleTestCaseClick(test.name);
+        };
+
+        if (test.description) {
+            testCaseLink.setAttribute('data-bs-toggle', 'tooltip');
+            testCaseLink.setAttribute('data-bs-placement', 'right');
+            testCaseLink.setAttribute('title', test.description);
+        }
+
+        testCaseCell.appendChild(testCaseLink);
+        tr.appendChild(testCaseCell);
+
+        const winCell = document.createElement('td');
+        winCell.className = 'text-center border border-dark small py-2';
+        winCell.textContent = `${test.rate.toFixed(1)}%`;
+        addPerformanceClass(winCell, test.rate);
+        tr.appendChild(winCell);
+
+        index.cells[row].forEach((entry, column) => {
+            const cell = document.createElement('td');
+            cell.className = 'text-center border border-dark small py-2';
+            if (entry) {
+                const [passes, total, shard, slot] = entry;
+                cell.textContent = `${passes}/${total}`;
+                addPerformanceClass(cell, (passes / total) * 100);
+                if (shard !== undefined) {
+                    // Reasons are fetched when the cell is clicked
+                    cell.classList.add('has-reasons');
+                    cell.title = 'Click for reasons';
+                    cell.dataset.row = row;
+                    cell.dataset.column = column;
+                    cell.dataset.shard = shard;
+                    cell.dataset.slot = slot;
+                }
+            } else {
+                cell.textContent = '0/0';
+                cell.classList.add('text-muted');
+            }
+            tr.appendChild(cell);
+        });
+        return tr;
+    }
+
+    function spacerRow(columns) {
+        const tr = document.createElement('tr');
+        tr.setAttribute('aria-hidden', 'true');
+        const td = document.createElement('td');
+        td.colSpan = columns;
+        td.className = 'p-0 border-0';
+        tr.appendChild(td);
+        return tr;
+    }
+
+    // The page is drawn scaled down; row heights are measured on screen but scrolled in layout pixels
+    function scale(element) {
+        return element.getBoundingClientRect().height / element.offsetHeight || 1;
+    }
+
+    // A tooltip left open on a row that is scrolled out would otherwise stay on screen
+    function disposeTooltips(tr) {
+        tr.querySelectorAll('[data-bs-toggle="tooltip"]').forEach(element => {
+            bootstrap.Tooltip.getInstance(element)?.dispose();
+        });
+    }
+
+    function reasonList(reasons) {
+        const fragment = document.createDocumentFragment();
+        reasons.forEach((reason, i) => {
+            const heading = document.createElement('div');
+            heading.className = 'fw-bold mt-2';
+            heading.textContent = `Test ${i + 1}`;
+            const text = document.createElement('pre');
+            text.className = 'small mb-0';
+            text.style.whiteSpace = 'pre-wrap';
+            text.textContent = reason;
+            fragment.append(heading, text);
+        });
+        return fragment;
+    }
+
+    function mutedText(text) {
+        const p = document.createElement('p');
+        p.className = 'text-muted mb-0';
+        p.textContent = text;
+        return p;
+    }
+
+    // Returns load(shard): the JSON array of reason lists in that shard of the reasons directory.
+    // The SHARD_CACHE most recently used shards are kept; a failed fetch is retried on the next call.
+    function shardLoader(base, shards) {
+        const cache = new Map();
+
+        return function load(shard) {
+            let promise = cache.get(shard);
+            if (promise) {
+                cache.delete(shard);
+            } else {
+                promise = fetch(`${base}/${shards[shard]}`).then(response => {
+                    if (!response.ok) throw new Error(`HTTP ${response.status}`);
+                    return response.json();
+                });
+                promise.catch(() => {
+                    if (cache.get(shard) === promise) cache.delete(shard);
+                });
+            }
+            cache.set(shard, promise);
+            if (cache.size > SHARD_CACHE) cache.delete(cache.keys().next().value);
+            return promise;
+        };
     }
 
     // Function to handle test case clicks
@@ -192,4 +257,4 @@ document.addEventListener('DOMContentLoaded', function() {
         else if (percentage >= 40) element.classList.add('table-warning');
         else element.classList.add('table-danger');
     }
-});
\ No newline at end of file
+});
@@ -1,22 +1,18 @@
 import subprocess
-import tempfile
-import os
-import re
 
+import code_extract
+import compile_cache
+import proc_runner
+import timings
+
+@timings.timed
 def check_c_code_golf(response, context=None):
     """
     Check if the C code golf solution is short enough and functionally correct.
     """
     
     # Extract code from response
-    def extract_code(output):
-        output = re.sub('```[a-z]*', '```', output)
-        if "```" in output and output.count("```") >= 2:
-            return output.split("```")[1]
-        else:
-            return output
-    
-    code = extract_code(response)
+    code = code_extract.extract_code(response)
     
     # Check if code is short enough (<200 bytes without whitespace)
     code_no_whitespace = code.replace(" ", "").replace("\n", "").replace("\t", "")
@@ -53,33 +49,20 @@ int main() {
     
     full_code = code + "\n\n" + test_case
     
-    # Create temporary files and compile/run
+    # Compile and run
     try:
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.c', delete=False) as f:
-            f.write(full_code)
-            c_file = f.name
-        
-        exe_file = c_file.replace('.c', '.out')
-        
-        # Compile
-        compile_result = subprocess.run(
-            ['gcc', '-o', exe_file, c_file, '-lm'],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
+        build = compile_cache.compile_c(full_code, timeout=10)
         
-        if compile_result.returncode != 0:
+        if not build.ok:
             return {
                 'pass': False,
                 'score': 0,
-                'reason': f'Compilation failed: {compile_result.stderr}'
+                'reason': f'Compilation failed: {build.diagnostics}'
             }
         
         # Run
-        run_result = subprocess.run(
-            [exe_file],
-            capture_output=True,
+        run_result = proc_runner.run(
+            [build.binary],
             text=True,
             timeout=10
         )
@@ -120,15 +103,6 @@ int main() {
             'score': 0,
             'reason': f'Error: {str(e)}'
         }
-    finally:
-        # Cleanup
-        try:
-            if 'c_file' in locals():
-                os.unlink(c_file)
-            if 'exe_file' in locals() and os.path.exists(exe_file):
-                os.unlink(exe_file)
-        except:
-            pass
         
 check_c_code_golf("""
 Here is a 136-byte (whitespace excluded) drop-in replacement that keeps the name `stepper` and the behaviour intact.
@@ -1,8 +1,11 @@
 import re
 import subprocess
-import tempfile
-import os
 
+import compile_cache
+import proc_runner
+import timings
+
+@timings.timed
 def check_c_short_and_correct(response,context=None):
     """
     Checks if the C function is shorter than 200 bytes (excluding whitespace)
@@ -47,44 +50,34 @@ def check_c_short_and_correct(response,context=None):
     # Combine the extracted function with the test harness
     full_code = code + "\n" + test_case
     print(full_code)
-    # Create a temporary file for the code
-    with tempfile.NamedTemporaryFile(suffix='.c', delete=False) as temp_file:
-        temp_file_path = temp_file.name
-        temp_file.write(full_code.encode('utf-8'))
-    
     # Compile the code
-    executable_path = temp_file_path + '.out'
-    compile_process = subprocess.run(
-        ['gcc', '-o', executable_path, temp_file_path, '-lm'],
-        capture_output=True,
-        text=True
-    )
-    print(compile_process.stderr)
+    build = compile_cache.compile_c(full_code)
+    print(build.diagnostics)
     # Check if compilation succeeded
-    if compile_process.returncode != 0:
-        os.unlink(temp_file_path)
-        if os.path.exists(executable_path):
-            os.unlink(executable_path)
+    if not build.ok:
         return {
             "pass": False, 
             "score": 0.0,
-            "reason": f"Compilation failed: {compile_process.stderr}",
+            "reason": f"Compilation failed: {build.diagnostics}",
             "code_length": len(code_without_whitespace),
             "is_short_enough": is_short_enough
         }
     
     # Run the compiled code
-    run_process = subprocess.run(
-        [executable_path],
-        capture_output=True,
-        text=True
-    )
-    
-    
-    # Clean up temporary files
-    os.unlink(temp_file_path)
-    if os.path.exists(executable_path):
-        os.unlink(executable_path)
+    try:
+        run_process = proc_runner.run(
+            [build.binary],
+            text=True,
+            timeout=10
+        )
+    except subprocess.TimeoutExpired:
+        return {
+            "pass": False,
+            "score": 0.0,
+            "reason": "Execution timed out after 10 seconds",
+            "code_length": len(code_without_whitespace),
+            "is_short_enough": is_short_enough
+        }
     
     # Check if the output is correct
     expected_output = "27488"
@@ -1,8 +1,8 @@
-import subprocess
-import tempfile
-import os
-import re
+import code_extract
+import python_sandbox
+import timings
 
+@timings.timed
 def check_response(response, context=None):
     """
     Evaluates if the response contains '.get' and produces correct output when executed.
@@ -56,41 +56,20 @@ def check_response(response, context=None):
 
 def extract_code(output):
     """Extract Python code from the output, handling code blocks."""
-    # Remove language specifiers from code blocks
-    output = re.sub(r'```[a-z]*', '```', output)
-    
-    if "```" in output and output.count("```") >= 2:
-        # Extract code between first pair of backticks
-        code = output.split("```")[1]
-    else:
-        # If no code blocks, use the entire output
-        code = output
-    
-    return code.strip()
+    return code_extract.extract_code(output, "python").strip()
 
 def run_python_code(code, test_case):
-    """Run Python code with test case using subprocess."""
+    """Run Python code with test case in the sandbox."""
     full_code = code + "\n\n" + test_case
     
-    # Create temporary file
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-        f.write(full_code)
-        temp_file = f.name
+    # Run the code
+    result = python_sandbox.run_code(
+        full_code,
+        text=True,
+        timeout=10
+    )
     
-    try:
-        # Run the code
-        result = subprocess.run(
-            ['python', temp_file],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
-        
-        if result.returncode == 0:
-            return result.stdout
-        else:
-            raise Exception(f"Code execution error: {result.stderr}")
-            
-    finally:
-        # Clean up temporary file
-        os.unlink(temp_file)
\ No newline at end of file
+    if result.returncode == 0:
+        return result.stdout
+    else:
+        raise Exception(f"Code execution error: {result.stderr}")
\ No newline at end of file
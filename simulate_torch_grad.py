@@ -1,3 +1,6 @@
+import timings
+
+@timings.timed
 def get_score(response, context=None):
     """
     Evaluates if the LLM response contains the substring "-0.03"
@@ -0,0 +1,87 @@
+import collections
+import os
+import random
+import subprocess
+
+import fixtures
+import scheduler
+import workspace
+
+# Opt-in: measuring runs every candidate several more times on a large input
+ENABLED = os.getenv("PARALLEL_SPEEDUP", "0") == "1"
+CORPUS_MB = int(os.getenv("SPEEDUP_CORPUS_MB", 16))
+# Each measured run gets this long; timing out is recorded, not a failure of the test
+TIMEOUT = float(os.getenv("SPEEDUP_TIMEOUT", 120))
+CPU_COUNTS = (1, 4)
+WORDS_PER_LINE = 12
+
+SENTENCE = ("it was the best of times, it was the worst of times, it was the age of wisdom, it was the age of "
+            "foolishness, it was the epoch of belief, it was the epoch of incredulity, it was the season of Light, "
+            "it was the season of Darkness, it was the spring of hope, it was the winter of despair, we had "
+            "everything before us, we had nothing before us, we were all going direct to Heaven, we were all "
+            "going direct the other way")
+
+
+@fixtures.tree(f"parallel_wordcount/corpus-{CORPUS_MB}mb")
+def corpus(path):
+    """file.txt of about CORPUS_MB of the wordcount sentence's words in a fixed random order."""
+    rng = random.Random(0)
+    words = SENTENCE.split()
+    target = CORPUS_MB * workspace.MB
+    written = 0
+    with open(os.path.join(path, "file.txt"), "w", encoding="utf-8") as f:
+        while written < target:
+            line = " ".join(rng.choices(words, k=WORDS_PER_LINE)) + "\n"
+            f.write(line)
+            written += len(line)
+
+
+def corpus_file():
+    """Path of the corpus, rebuilt first if an earlier candidate wrote to it."""
+    return os.path.join(corpus.ensure(verify=True), "file.txt")
+
+
+@fixtures.value(f"parallel_wordcount/corpus-{CORPUS_MB}mb-counts")
+def corpus_counts():
+    counts = collections.Counter()
+    with open(corpus_file(), encoding="utf-8") as f:
+        for line in f:
+            counts.update(line.split())
+    return dict(counts)
+
+
+def cpu_sets(counts=CPU_COUNTS):
+    """{n: the first n CPUs this process may run on} for each n, capped at what is available."""
+    available = sorted(os.sched_getaffinity(0))
+    return {n: set(available[:n]) for n in counts}
+
+
+def measure(run, expected=None, counts=CPU_COUNTS):
+    """
+    Time run(cpus) pinned to 1 CPU and to 4, and report the parallel speedup.
+
+    run takes a set of CPU numbers and returns (proc_runner.StreamResult, word counts).
+    Runs hold the "benchmark" scheduler slot so measurements do not compete with each
+    other for the CPUs. Returns a JSON-serializable dict with wall/CPU seconds and
+    correctness per CPU count, plus speedup = wall time on the fewest CPUs divided by
+    wall time on the most (None unless both runs finished).
+    """
+    report = {"corpus_mb": CORPUS_MB, "runs": {}}
+    with scheduler.slot("benchmark"):
+        for n, cpus in cpu_sets(counts).items():
+            entry = {"cpus": len(cpus)}
+            try:
+                result, found = run(cpus)
+                entry.update(wall=round(result.wall, 3),
+                             cpu=None if result.cpu is None else round(result.cpu, 3),
+                             returncode=result.returncode)
+                if expected is not None:
+                    entry["correct"] = found == expected
+            except subprocess.TimeoutExpired:
+                entry["timed_out"] = True
+            except Exception as e:
+                entry["error"] = str(e)[:500]
+            report["runs"][str(n)] = entry
+    walls = [report["runs"][str(n)].get("wall") for n in (min(counts), max(counts))]
+    report["speedup"] = round(walls[0] / walls[1], 2) if all(walls) else None
+    return report
@@ -1,25 +1,22 @@
 import subprocess
 import re
-import tempfile
-import os
 
+import code_extract
+import profiler
+import timings
+
+# strides() of 100000 tokens must stay under this; a copy of its windows is about 4 MB
+PEAK_LIMIT_BYTES = 100_000
+
+@timings.timed
 def assert_strided_numpy(response, context=None):
     """
     Evaluates if the response contains a correct implementation of the strided trick function.
     """
     
     # Extract code from response
-    def extract_code(output):
-        # Remove non-ASCII characters to prevent encoding issues
-        output = re.sub(r'[^\x00-\x7F]+', '', output)
-        
-        output = re.sub('```[a-z]*', '```', output)
-        if "```" in output and output.count("```") >= 2:
-            return output.split("```")[1]
-        else:
-            return output
-    
-    code = extract_code(response)
+    # Remove non-ASCII characters to prevent encoding issues
+    code = re.sub(r'[^\x00-\x7F]+', '', code_extract.extract_code(response))
     
     # Check if response contains "as_strided" (required for strided trick)
     if "as_strided" not in code:
@@ -29,90 +26,79 @@ def assert_strided_numpy(response, context=None):
             'reason': 'Code does not use as_strided function'
         }
     
-    # Prepare test case
-    test_case = """
-import numpy as np
-# Test the function
-result_shape = strides(np.arange(100)).shape
-result_sum = strides(np.arange(100)).sum()
-print(f"Shape: {result_shape}")
-print(f"Sum: {result_sum}")
-"""
-    
-    # Combine code with test case
-    full_code = code + "\n\n" + test_case
+    # Correctness and memory are measured in one run; as_strided should return a view
+    probes = [
+        profiler.probe("shape", "strides(np.arange(100)).shape", setup="import numpy as np",
+                       time=False, memory=False),
+        profiler.probe("sum", "strides(np.arange(100)).sum()", setup="import numpy as np",
+                       time=False, memory=False),
+        profiler.probe("large", "strides(tokens)", setup="import numpy as np\ntokens = np.arange(100000)",
+                       value=False),
+    ]
     
-    # Write to temporary file and execute with UTF-8 encoding
+    # Run with an explicit encoding declaration
     try:
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False, encoding='utf-8', errors='ignore') as f:
-            # Add encoding declaration
-            f.write("# -*- coding: utf-8 -*-\n")
-            f.write(full_code)
-            temp_file = f.name
-        
-        # Run the code
-        result = subprocess.run(
-            ['python', temp_file], 
-            capture_output=True, 
-            text=True, 
-            timeout=10
-        )
-        
-        # Clean up
-        os.unlink(temp_file)
-        
-        if result.returncode != 0:
-            return {
-                'pass': False,
-                'score': 0,
-                'reason': f'Code execution failed: {result.stderr}'
-            }
-        
-        output = result.stdout.strip()
+        report = profiler.profile("# -*- coding: utf-8 -*-\n" + code, probes, timeout=10)
+        results = report["probes"]
         
         # Check for expected outputs
-        expected_shape = "(6, 50)"
-        expected_sum = "14850"
+        expected_shape = [6, 50]
+        expected_sum = 14850
         
-        shape_correct = expected_shape in output
-        sum_correct = expected_sum in output
+        shape_correct = results["shape"].get("value") == expected_shape
+        sum_correct = results["sum"].get("value") == expected_sum
+        peak = results["large"].get("peak_bytes")
+        is_view = peak is not None and peak < PEAK_LIMIT_BYTES
         
-        if shape_correct and sum_correct:
+        if shape_correct and sum_correct and is_view:
             return {
                 'pass': True,
                 'score': 1,
-                'reason': 'Function correctly implements strided trick with expected output'
+                'reason': f'Function correctly implements strided trick with expected output (peak {peak} bytes)',
+                'metadata': {'profile': report}
+            }
+        elif shape_correct and sum_correct:
+            return {
+                'pass': False,
+                'score': 0.5,
+                'reason': f'Output is correct but the windows are copied (peak {peak} bytes on 100000 tokens)',
+                'metadata': {'profile': report}
             }
         elif shape_correct:
             return {
                 'pass': False,
                 'score': 0.5,
-                'reason': 'Shape is correct but sum is incorrect'
+                'reason': 'Shape is correct but sum is incorrect',
+                'metadata': {'profile': report}
             }
         elif sum_correct:
             return {
                 'pass': False,
                 'score': 0.5,
-                'reason': 'Sum is correct but shape is incorrect'
+                'reason': 'Sum is correct but shape is incorrect',
+                'metadata': {'profile': report}
             }
         else:
             return {
                 'pass': False,
                 'score': 0,
-                'reason': f'Neither shape nor sum match expected values. Got output: {output}'
+                'reason': f'Neither shape nor sum match expected values. Got: {results["shape"]}, {results["sum"]}',
+                'metadata': {'profile': report}
             }
             
+    except profiler.ProfileError as e:
+        return {
+            'pass': False,
+            'score': 0,
+            'reason': f'Code execution failed: {e}'
+        }
     except subprocess.TimeoutExpired:
-        if 'temp_file' in locals():
-            os.unlink(temp_file)
         return {
             'pass': False,
             'score': 0,
             'reason': 'Code execution timed out'
         }
     except Exception as e:
-        if 'temp_file' in locals():
-            os.unlink(temp_file)
         import traceback
         return {
             'pass': False,
@@ -0,0 +1,29 @@
+import code_extract
+
+
+def test_prefers_the_requested_language():
+    text = "Run this:\n```bash\npython main.py\n```\nwith\n```py\nprint(1)\n```\n"
+    assert code_extract.extract_code(text, "python") == "print(1)\n"
+    assert code_extract.extract_code(text, ("rust", "bash")) == "python main.py\n"
+    # No block in the language: the first block
+    assert code_extract.extract_code(text, "c") == "python main.py\n"
+    assert code_extract.extract_all(text, "python3") == ["print(1)\n"]
+
+
+def test_unclosed_fence_runs_to_the_end():
+    text = "Here you go:\n```python\ndef f():\n    return 1\n"
+    block = code_extract.find_block(text, "python")
+    assert not block.closed
+    assert block.code == "def f():\n    return 1\n"
+
+
+def test_inline_fence_is_a_block_without_language():
+    text = "Use ```x = 1``` here, then\n```c\nint x;\n```"
+    found = code_extract.blocks(text)
+    assert [(block.language, block.code) for block in found] == [("", "x = 1"), ("c", "int x;\n")]
+
+
+def test_text_without_fences_is_the_code():
+    assert code_extract.find_block("print(1)") is None
+    assert code_extract.extract_code("print(1)", "python") == "print(1)"
+    assert code_extract.extract_all("print(1)") == []
@@ -0,0 +1,82 @@
+import os
+import shutil
+import time
+
+import pytest
+
+import compile_cache
+import proc_runner
+
+HELLO = '#include <stdio.h>\nint main(void) { printf("hello\\n"); return 0; }\n'
+
+needs_gcc = pytest.mark.skipif(shutil.which("gcc") is None, reason="gcc not installed")
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    path = tmp_path / "cache"
+    monkeypatch.setattr(compile_cache, "CACHE_DIR", str(path))
+    return path
+
+
+def test_key_covers_source_compiler_and_flags():
+    key = compile_cache.cache_key(HELLO, "gcc", ("-lm",))
+    assert key == compile_cache.cache_key(HELLO, "gcc", ("-lm",))
+    assert key != compile_cache.cache_key(HELLO + "\n", "gcc", ("-lm",))
+    assert key != compile_cache.cache_key(HELLO, "gcc", ("-lm", "-O2"))
+    assert key != compile_cache.cache_key(HELLO, "g++", ("-lm",))
+
+
+@needs_gcc
+def test_reuses_a_build():
+    first = compile_cache.compile_c(HELLO)
+    assert first.ok and not first.cached
+    second = compile_cache.compile_c(HELLO)
+    assert second.ok and second.cached
+    assert second.binary == first.binary
+    assert proc_runner.run([second.binary], text=True, timeout=10).stdout == "hello\n"
+
+
+@needs_gcc
+def test_failed_builds_are_cached(monkeypatch):
+    first = compile_cache.compile_c("int main(void) { return x; }\n")
+    assert not first.ok and first.binary is None
+    assert "main.c" in first.diagnostics
+
+    def run(*args, **kwargs):
+        raise AssertionError("compiler run again for a cached failure")
+
+    monkeypatch.setattr(proc_runner, "run", run)
+    second = compile_cache.compile_c("int main(void) { return x; }\n")
+    assert second == first._replace(cached=True)
+
+
+def make_entry(cache_dir, name, size, age):
+    entry = cache_dir / name[:2] / name
+    entry.mkdir(parents=True)
+    (entry / "diagnostics.txt").write_text("")
+    (entry / compile_cache.EXE_NAME).write_bytes(b"\0" * size)
+    mtime = time.time() - age
+    os.utime(entry, (mtime, mtime))
+    return entry
+
+
+def test_evicts_least_recently_used_first(cache_dir, monkeypatch):
+    monkeypatch.setattr(compile_cache, "MIN_AGE_SECONDS", 60)
+    oldest = make_entry(cache_dir, "aa01", 1000, age=3000)
+    older = make_entry(cache_dir, "bb02", 1000, age=2000)
+    recent = make_entry(cache_dir, "cc03", 1000, age=1000)
+    assert compile_cache.evict(max_bytes=3000) == 0
+    # Over budget: drop the oldest until under 90% of it
+    assert compile_cache.evict(max_bytes=2500) == 1000
+    assert not oldest.exists()
+    assert older.exists() and recent.exists()
+
+
+def test_never_evicts_recently_used_entries(cache_dir, monkeypatch):
+    monkeypatch.setattr(compile_cache, "MIN_AGE_SECONDS", 600)
+    old = make_entry(cache_dir, "aa01", 1000, age=3000)
+    fresh = make_entry(cache_dir, "bb02", 1000, age=10)
+    assert compile_cache.evict(max_bytes=100) == 1000
+    assert not old.exists()
+    assert fresh.exists()
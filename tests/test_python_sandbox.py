@@ -0,0 +1,17 @@
+import python_sandbox
+
+
+def test_truncated_non_ascii_output_decodes():
+    # Two-byte characters straddle both cut points, whichever way the head and tail fall
+    count = python_sandbox.HEAD_BYTES + python_sandbox.TAIL_BYTES
+    result = python_sandbox.run_code(f'import sys; sys.stdout.write("a" + "\\u00e9" * {count})', timeout=30)
+    assert result.returncode == 0
+    assert result.truncated
+    assert result.stdout.startswith("aéé")
+    assert result.stdout.endswith("éé")
+    assert "bytes truncated" in result.stdout
+
+
+def test_truncated_non_ascii_output_decodes_unpooled(monkeypatch):
+    monkeypatch.setattr(python_sandbox, "ENABLED", False)
+    test_truncated_non_ascii_output_decodes()
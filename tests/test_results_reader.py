@@ -0,0 +1,79 @@
+import functools
+import json
+
+import pytest
+
+import results_reader
+
+RESULTS = {
+    "evalId": "eval-1",
+    "config": {"description": "skipped {\"[", "tests": [{"vars": {"prompt": "}]"}}]},
+    "results": {
+        "timestamp": 1700000000,
+        "version": 3,
+        "prompts": [{"raw": "a \\\" quoted ] prompt"}],
+        "results": [
+            {
+                "provider": {"id": "openai:gpt-4o", "label": "gpt-4o"},
+                "prompt": {"raw": "What is {x}?"},
+                "response": {"output": "```python\nprint(\"}\\\\\")\n```é中"},
+                "gradingResult": {"componentResults": [
+                    {"pass": True, "score": 1.0, "reason": "ok",
+                     "assertion": {"type": "python", "value": "file://aws_ipv6.py:get_assertion"}}]},
+                "latencyMs": 12345678,
+                "cost": 1.5e-05,
+            },
+            {
+                "provider": {"id": "openai:gpt-4o-mini"},
+                "promptIdx": 0,
+                "response": {"output": ""},
+                "gradingResult": {"componentResults": [
+                    {"pass": False, "score": 0, "reason": "",
+                     "assertion": {"type": "python", "value": "file://print_hello.py:assert_python_hello_world"}}]},
+                "latencyMs": -1,
+                "cost": None,
+            },
+        ],
+    },
+}
+
+
+@pytest.fixture
+def results_path(tmp_path):
+    path = tmp_path / "results.json"
+    path.write_text(json.dumps(RESULTS, indent=1, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+@pytest.mark.parametrize("chunk", [1, 2, 7, 64, results_reader.CHUNK_CHARS])
+def test_streams_the_same_results_as_json_load(results_path, monkeypatch, chunk):
+    # Small chunks put every token, escape and number across a buffer boundary somewhere
+    monkeypatch.setattr(results_reader, "_Stream", functools.partial(results_reader._Stream, chunk=chunk))
+    results = results_reader.ResultsFile(results_path)
+    assert list(results) == RESULTS["results"]["results"]
+    assert results.meta == {"evalId": "eval-1", "results.timestamp": 1700000000, "results.version": 3}
+
+
+def test_reads_results_at_the_top_level(tmp_path):
+    path = tmp_path / "old.json"
+    path.write_text(json.dumps({"results": RESULTS["results"]["results"], "version": 2}), encoding="utf-8")
+    assert list(results_reader.ResultsFile(path)) == RESULTS["results"]["results"]
+
+
+def test_records(results_path):
+    first, second = results_reader.read(results_path)
+    assert first.provider == "openai:gpt-4o"
+    assert first.label == "gpt-4o"
+    assert first.test == "aws_ipv6"
+    assert first.passed and first.score == 1.0
+    assert second.label == "openai:gpt-4o-mini"
+    assert second.test == "print_hello"
+    assert not second.passed and second.reason is None
+    assert first.prompt != second.prompt
+
+
+def test_truncated_file_raises(results_path):
+    text = results_path.read_text(encoding="utf-8")
+    results_path.write_text(text[:len(text) // 2], encoding="utf-8")
+    with pytest.raises(ValueError):
+        list(results_reader.ResultsFile(results_path))
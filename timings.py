@@ -0,0 +1,86 @@
+import collections
+import contextlib
+import contextvars
+import functools
+import time
+
+# Spans the shared helpers record; the rest of a call (the grader's own checks) is "other"
+SPANS = ("extract", "fixture", "compile", "run", "judge")
+
+_recorder = contextvars.ContextVar("timings", default=None)
+
+
+class Recorder:
+    """Nanoseconds per span name for one grader call."""
+
+    def __init__(self):
+        self.totals = collections.Counter()
+        self.active = None
+
+    def report(self, total):
+        """{span: ns, ..., "other": ns, "total": ns}, with spans in SPANS order first."""
+        spans = sorted(self.totals, key=lambda name: (SPANS.index(name) if name in SPANS else len(SPANS), name))
+        timings = {name: self.totals[name] for name in spans}
+        timings["other"] = max(0, total - sum(self.totals.values()))
+        timings["total"] = total
+        return timings
+
+
+@contextlib.contextmanager
+def span(name):
+    """
+    Add the time spent in the block to span `name` of the grader call being timed.
+
+    Only the outermost span counts, so a sandbox run inside a profiler run is not
+    counted twice and the spans of one call never add up to more than its total.
+    Outside a timed() grader this does nothing.
+    """
+    recorder = _recorder.get()
+    if recorder is None or recorder.active is not None:
+        yield
+        return
+    recorder.active = name
+    start = time.monotonic_ns()
+    try:
+        yield
+    finally:
+        recorder.totals[name] += time.monotonic_ns() - start
+        recorder.active = None
+
+
+def spanned(name):
+    """Decorator form of span(name)."""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def timed(grader):
+    """
+    Decorator for a grader entry point that adds its spans to the result.
+
+    A dict result gets metadata.timings, {span: ns, ..., "other": ns, "total": ns}
+    in monotonic nanoseconds, which promptfoo keeps in its results JSON; other
+    results are returned unchanged.
+    """
+    @functools.wraps(grader)
+    def wrapper(*args, **kwargs):
+        if _recorder.get() is not None:
+            return grader(*args, **kwargs)
+        recorder = Recorder()
+        token = _recorder.set(recorder)
+        start = time.monotonic_ns()
+        try:
+            result = grader(*args, **kwargs)
+        finally:
+            _recorder.reset(token)
+        if isinstance(result, dict):
+            metadata = result.setdefault("metadata", {})
+            if isinstance(metadata, dict):
+                metadata["timings"] = recorder.report(time.monotonic_ns() - start)
+        return result
+    return wrapper
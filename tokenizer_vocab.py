@@ -1,3 +1,6 @@
+import timings
+
+@timings.timed
 def assert_contains_get_vocab(response, context=None):
     """
     Check if the model's response contains 'get_vocab' method reference.
@@ -1,8 +1,10 @@
-import subprocess
-import tempfile
-import os
-import re
 
+import code_extract
+import compile_cache
+import proc_runner
+import timings
+
+@timings.timed
 def get_assertion(response, context=None):
     """
     Promptfoo assertion that extracts C code, compiles and runs it, 
@@ -45,47 +47,22 @@ def get_assertion(response, context=None):
 
 def extract_code_keep_main(response):
     """Extract C code from response, keeping main function intact."""
-    # Clean up code block markers
-    response = re.sub(r'```[a-z]*', '```', response)
-    
-    # Try to extract from code blocks first
-    if response.count("```") >= 2:
-        parts = response.split("```")
-        if len(parts) >= 2:
-            return parts[1].strip()
-    
-    # If no clear code blocks, return the whole response
-    return response.strip()
+    return code_extract.extract_code(response, "c").strip()
 
 def compile_and_run_c(code):
     """Compile and run C code, return output."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        # Write C code to file
-        c_file = os.path.join(temp_dir, "main.c")
-        with open(c_file, 'w') as f:
-            f.write(code)
-        
-        # Compile
-        exe_file = os.path.join(temp_dir, "main")
-        compile_result = subprocess.run(
-            ["gcc", "-o", exe_file, c_file, "-lm"],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-        
-        if compile_result.returncode != 0:
-            raise Exception(f"Compilation failed: {compile_result.stderr}")
-        
-        # Run
-        run_result = subprocess.run(
-            [exe_file],
-            capture_output=True,
-            text=True,
-            timeout=60
-        )
-        
-        if run_result.returncode != 0:
-            raise Exception(f"Runtime error: {run_result.stderr}")
-        
-        return run_result.stdout
\ No newline at end of file
+    build = compile_cache.compile_c(code, timeout=30)
+    if not build.ok:
+        raise Exception(f"Compilation failed: {build.diagnostics}")
+    
+    # Run
+    run_result = proc_runner.run(
+        [build.binary],
+        text=True,
+        timeout=60
+    )
+    
+    if run_result.returncode != 0:
+        raise Exception(f"Runtime error: {run_result.stderr}")
+    
+    return run_result.stdout
\ No newline at end of file
@@ -1,5 +1,8 @@
 import re
 
+import timings
+
+@timings.timed
 def check_battery_calculation(response, context=None):
     """
     Evaluates if the response contains the correct battery life calculation result.
@@ -1,3 +1,6 @@
+import timings
+
+@timings.timed
 def get_assert(output, context=None):
     """
     Test if a model can write upython code with an obscure module.
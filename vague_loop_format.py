@@ -1,8 +1,10 @@
 import subprocess
-import tempfile
-import os
-import re
 
+import code_extract
+import python_sandbox
+import timings
+
+@timings.timed
 def test_vague_loop_format(response, context=None):
     """
     Test if the model can follow vague instructions for how to print IDs following an example.
@@ -11,34 +13,15 @@ def test_vague_loop_format(response, context=None):
     
     def extract_code_with_main(text):
         """Extract code and ensure it's runnable with main"""
-        # Remove language specifiers from code blocks
-        text = re.sub(r'```[a-z]*', '```', text)
-        
-        if "```" in text:
-            # Extract code from markdown blocks
-            code = text.split("```")[1]
-        else:
-            # Use the entire response as code
-            code = text
-            
+        code = code_extract.extract_code(text, "python")
+
         # If the code doesn't have a main block, it should still be runnable
         return code.strip()
     
     def run_python_code(code):
         """Run Python code and capture output"""
         try:
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-                f.write(code)
-                temp_file = f.name
-            
-            result = subprocess.run(
-                ['python', temp_file], 
-                capture_output=True, 
-                text=True, 
-                timeout=10
-            )
-            
-            os.unlink(temp_file)
+            result = python_sandbox.run_code(code, timeout=10)
             
             if result.returncode != 0:
                 return None, f"Python execution failed: {result.stderr}"
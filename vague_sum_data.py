@@ -1,9 +1,11 @@
-import subprocess
-import tempfile
-import os
-import re
 import json
 
+import code_extract
+import judge_client
+import python_sandbox
+import timings
+
+@timings.timed
 def assert_sum_some_data(response, context=None):
     """
     Promptfoo assertion function that:
@@ -89,19 +91,15 @@ def extract_code_with_main(response):
 
 def try_extract_from_blocks(output):
     """Try to extract code from markdown code blocks"""
-    output = re.sub('```[a-z]*', '```', output)
-    if "```" in output and output.count("```") >= 2:
-        blocks = output.split("```")
-        for i in range(1, len(blocks), 2):
-            if blocks[i].strip():
-                return blocks[i].strip()
+    for block in code_extract.extract_all(output):
+        if block.strip():
+            return block.strip()
     return None
 
 
 def extract_code_with_llm(orig_output):
     """Use LLM to extract complete runnable code"""
     import os
-    import requests
     
     token = os.getenv('LLMFOUNDRY_TOKEN')
     if not token:
@@ -111,52 +109,26 @@ def extract_code_with_llm(orig_output):
     prompt = f"Take the below answer to my programming question and return just the complete code in a single file so I can copy and paste it into an editor and directly run it. Include any header and main necessary so I can run it by copying this one file. DO NOT MODIFY THE CODE OR WRITE NEW CODE. Here is the code: \n{orig_output}"
     
     try:
-        response = requests.post(
-            'https://llmfoundry.straive.com/openai/v1/chat/completions',
-            headers={
-                'Authorization': f'Bearer {token}:my-test-project',
-                'Content-Type': 'application/json'
-            },
-            json={
-                'model': 'gpt-4o-mini',
-                'messages': [{'role': 'user', 'content': prompt}]
-            }
-        )
-        
-        if response.status_code == 200:
-            llm_response = response.json()['choices'][0]['message']['content']
-            return try_extract_from_blocks(llm_response) or llm_response
-        else:
-            return orig_output
-            
-    except Exception:
+        llm_response = judge_client.ask(prompt)
+        return try_extract_from_blocks(llm_response) or llm_response
+    except judge_client.JudgeError:
         return orig_output
 
 
 def run_python_code(code, test_case):
-    """Execute Python code with test case using subprocess"""
+    """Execute Python code with test case in the sandbox"""
     
     full_code = code + "\n\n" + test_case
     
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False, encoding='utf-8') as f:
-        f.write(full_code)
-        temp_file = f.name
+    result = python_sandbox.run_code(
+        full_code,
+        text=True,
+        encoding='utf-8',
+        errors='ignore',
+        timeout=10
+    )
     
-    try:
-        result = subprocess.run(
-            ['python', temp_file],
-            capture_output=True,
-            text=True,
-            encoding='utf-8',
-            errors='ignore',
-            timeout=10
-        )
-        
-        if result.returncode != 0:
-            raise Exception(f"Code execution failed: {result.stderr}")
-            
-        return result.stdout
+    if result.returncode != 0:
+        raise Exception(f"Code execution failed: {result.stderr}")
         
-    finally:
-        if os.path.exists(temp_file):
-            os.unlink(temp_file)
\ No newline at end of file
+    return result.stdout
\ No newline at end of file
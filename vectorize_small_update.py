@@ -1,9 +1,26 @@
-import subprocess
-import tempfile
 import os
-import re
-import json
 
+import code_extract
+import judge_client
+import profiler
+import timings
+
+# Inputs for timing update() against the loop it replaces
+BENCHMARK_SETUP = """
+def loop_update(high, highest_number, delta):
+    for i in range(len(high)):
+        if i != highest_number:
+            high[i] = min(high[i], high[highest_number] + delta[highest_number] - delta[i])
+    return high
+
+rng = np.random.default_rng(0)
+high = rng.integers(0, 1000, 100000)
+delta = rng.integers(0, 100, 100000)
+"""
+# How much faster than the loop update() must be to count as vectorized when there is no judge
+MIN_SPEEDUP = 10
+
+@timings.timed
 def check(response, context=None):
     """
     Evaluates if the student tried to vectorize the loop correctly.
@@ -15,49 +32,31 @@ def check(response, context=None):
     if not code:
         return {"pass": False, "score": 0, "reason": "No code found in response"}
     
-    # Step 2: Run the code with test case
-    test_case = 'print(list(update(np.array([2, 5, 9, 1, 2, 0, 3, 8]), 4, np.array([1, 2, 1, 4, 3, 2, 1, 2]))))'
-    expected_output = "[2, 3, 4, 1, 2, 0, 3, 3]"
-    
-    code_with_test = f"import numpy as np\n\n{code}\n\n{test_case}"
+    # Step 2: Run the code with test case, and time it against the original loop
+    probes = [
+        profiler.probe("test", "np.asarray(update(np.array([2, 5, 9, 1, 2, 0, 3, 8]), 4, np.array([1, 2, 1, 4, 3, 2, 1, 2]))).tolist()",
+                       time=False, memory=False),
+        profiler.probe("vectorized", "update(high.copy(), 4, delta)", setup=BENCHMARK_SETUP, value=False),
+        profiler.probe("loop", "loop_update(high.copy(), 4, delta)", value=False, memory=False),
+    ]
+    expected_output = [2, 3, 4, 1, 2, 0, 3, 3]
     
-    temp_file = None
     try:
-        # Create a temporary file
-        fd, temp_file = tempfile.mkstemp(suffix='.py')
-        os.close(fd)  # Close the file descriptor immediately
-        
-        # Write to the file
-        with open(temp_file, 'w', encoding='utf-8') as f:
-            f.write(code_with_test)
-        
-        # Run the code as a separate process
-        result = subprocess.run(
-            ['python', temp_file], 
-            capture_output=True, 
-            text=True, 
-            timeout=10
-        )
-        
-        # Check return code
-        if result.returncode != 0:
-            return {"pass": False, "score": 0, "reason": f"Code execution failed: {result.stderr}"}
-        
-        # Check if output matches expected
-        output = result.stdout.strip()
-        if expected_output not in output:
-            return {"pass": False, "score": 0, "reason": f"Output mismatch. Expected: {expected_output}, Got: {output}"}
-    
+        report = profiler.profile(f"import numpy as np\n\n{code}", probes, timeout=30)
     except Exception as e:
         return {"pass": False, "score": 0, "reason": f"Execution error: {str(e)}"}
+    results = report["probes"]
+    
+    if "error" in results["test"]:
+        return {"pass": False, "score": 0, "reason": f"Code execution failed: {results['test']['error']}"}
+    
+    # Check if output matches expected
+    output = results["test"].get("value")
+    if output != expected_output:
+        return {"pass": False, "score": 0, "reason": f"Output mismatch. Expected: {expected_output}, Got: {output}"}
     
-    finally:
-        # Clean up temporary file
-        if temp_file and os.path.exists(temp_file):
-            try:
-                os.unlink(temp_file)
-            except Exception:
-                pass  # Ignore errors during cleanup
+    speedup = measured_speedup(results)
+    metadata = {"profile": report, "speedup": speedup}
     
     # Step 3: Check if vectoried (no explicit for loop)
     evaluation_text = f"""Below is a student's answer to a question about how to vectorize this loop:
@@ -75,47 +74,32 @@ Did the student try to vectorize the loop? Don't tell me if they are correct or
         # Check if token is available
         token = os.getenv("LLMFOUNDRY_TOKEN")
         if not token:
-            # Skip LLM evaluation if no token
-            return {"pass": True, "score": 1, "reason": "Code executes correctly. (Skipped vectorization check due to missing token)"}
+            # Without a judge, decide on the measured speedup over the loop
+            if speedup is not None and speedup >= MIN_SPEEDUP:
+                return {"pass": True, "score": 1, "reason": f"Code executes correctly and runs {speedup:.0f}x faster than the loop", "metadata": metadata}
+            return {"pass": False, "score": 0, "reason": f"Code executes correctly but is not vectorized (speedup over the loop: {speedup})", "metadata": metadata}
         
-        # Prepare curl command
-        curl_command = [
-            'curl', '-X', 'POST', 'https://llmfoundry.straive.com/openai/v1/chat/completions',
-            '-H', f'Authorization: Bearer {token}:my-test-project',
-            '-H', 'Content-Type: application/json',
-            '-d', json.dumps({
-                "model": "gpt-4o-mini",
-                "messages": [{"role": "user", "content": evaluation_text}]
-            })
-        ]
-        
-        # Execute curl command
-        result = subprocess.run(curl_command, capture_output=True, text=True, timeout=30)
-        
-        if result.returncode != 0:
-            return {"pass": False, "score": 0, "reason": f"LLM evaluation failed: {result.stderr}"}
-        
-        # Parse response
-        response_data = json.loads(result.stdout)
-        llm_response = response_data['choices'][0]['message']['content']
+        # Ask the judge model
+        llm_response = judge_client.ask(evaluation_text)
         
         # Check if LLM says student passes
         if "student passes" in llm_response.lower():
-            return {"pass": True, "score": 1, "reason": "Code executes correctly and uses vectorization"}
+            return {"pass": True, "score": 1, "reason": "Code executes correctly and uses vectorization", "metadata": metadata}
         else:
-            return {"pass": False, "score": 0, "reason": "Student did not vectorize the loop"}
+            return {"pass": False, "score": 0, "reason": "Student did not vectorize the loop", "metadata": metadata}
             
     except Exception as e:
-        # If LLM evaluation fails, return a success based just on the execution test
-        return {"pass": True, "score": 0.5, "reason": f"Code executes correctly but couldn't verify vectorization: {str(e)}"}
+        # If LLM evaluation fails (judge_client.JudgeError included), return a success based just on the execution test
+        return {"pass": True, "score": 0.5, "reason": f"Code executes correctly but couldn't verify vectorization: {str(e)}", "metadata": metadata}
 
 def extract_code(output):
     """Extract code from markdown code blocks or return the output as-is"""
-    output = re.sub(r'```[a-z]*', '```', output)
-    if "```" in output and output.count("```") >= 2:
-        # Extract from code blocks
-        code = output.split("```")[1]
-        return code.strip()
-    else:
-        # Return as-is if no code blocks
-        return output.strip()
\ No newline at end of file
+    return code_extract.extract_code(output, "python").strip()
+
+def measured_speedup(results):
+    """How many times faster the candidate's update() ran than the loop, or None if either run failed"""
+    vectorized = results["vectorized"].get("ns_per_call")
+    loop = results["loop"].get("ns_per_call")
+    if not vectorized or not loop:
+        return None
+    return round(loop / vectorized, 1)
\ No newline at end of file
@@ -1,13 +1,17 @@
 import re
-import subprocess
-import tempfile
 import os
 import time
-import json
 import base64
 import sys
 import platform
 
+import code_extract
+import judge_client
+import proc_runner
+import timings
+import workspace
+
+@timings.timed
 def check_html_webgl_house(response, context=None):
     """
     Evaluates if the response contains HTML with WebGL code that draws a house with chimney.
@@ -94,69 +98,53 @@ def check_html_webgl_house(response, context=None):
 
 def extract_code(response):
     """Extract HTML/JavaScript code from the response"""
-    # Remove language specifiers from code blocks
-    response = re.sub(r'```[a-zA-Z]*', '```', response)
-    
-    if "```" in response and response.count("```") >= 2:
-        # Extract code between first pair of ```
-        parts = response.split("```")
-        if len(parts) >= 2:
-            return parts[1].strip()
-    
-    # If no code blocks, assume entire response is code
-    return response.strip()
+    return code_extract.extract_code(response, "html").strip()
 
 def take_screenshot(html_code):
     """Try multiple methods to take a screenshot of the HTML code"""
-    # Create temporary HTML file
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.html', delete=False, encoding='utf-8') as f:
-        f.write(html_code)
-        html_path = f.name
-    
-    screenshot_data = None
-    error_messages = []
+    # The page and the screenshots taken of it share a workspace, released as a whole
+    with workspace.workspace("webgl_triangle") as temp_dir:
+        html_path = os.path.join(temp_dir, "page.html")
+        with open(html_path, 'w', encoding='utf-8') as f:
+            f.write(html_code)
+        
+        screenshot_data = None
+        error_messages = []
     
-    try:
-        # Method 1: Try Chrome headless
-        if screenshot_data is None:
-            try:
-                screenshot_data = try_chrome_screenshot(html_path)
-            except Exception as e:
-                error_messages.append(f"Chrome screenshot failed: {str(e)}")
+        try:
+            # Method 1: Try Chrome headless
+            if screenshot_data is None:
+                try:
+                    screenshot_data = try_chrome_screenshot(html_path)
+                except Exception as e:
+                    error_messages.append(f"Chrome screenshot failed: {str(e)}")
         
-        # Method 2: Try Firefox headless if available
-        if screenshot_data is None:
-            try:
-                screenshot_data = try_firefox_screenshot(html_path)
-            except Exception as e:
-                error_messages.append(f"Firefox screenshot failed: {str(e)}")
+            # Method 2: Try Firefox headless if available
+            if screenshot_data is None:
+                try:
+                    screenshot_data = try_firefox_screenshot(html_path)
+                except Exception as e:
+                    error_messages.append(f"Firefox screenshot failed: {str(e)}")
         
-        # Method 3: Try wkhtmltoimage if available
-        if screenshot_data is None:
-            try:
-                screenshot_data = try_wkhtmltoimage(html_path)
-            except Exception as e:
-                error_messages.append(f"wkhtmltoimage failed: {str(e)}")
+            # Method 3: Try wkhtmltoimage if available
+            if screenshot_data is None:
+                try:
+                    screenshot_data = try_wkhtmltoimage(html_path)
+                except Exception as e:
+                    error_messages.append(f"wkhtmltoimage failed: {str(e)}")
         
-        # If all methods failed, create a simple text file with the code for analysis
-        if screenshot_data is None:
-            dummy_image = create_dummy_image(html_code)
-            if dummy_image:
-                screenshot_data = dummy_image
-                error_messages.append("Using dummy image with code text")
+            # If all methods failed, create a simple text file with the code for analysis
+            if screenshot_data is None:
+                dummy_image = create_dummy_image(html_code)
+                if dummy_image:
+                    screenshot_data = dummy_image
+                    error_messages.append("Using dummy image with code text")
         
-        return screenshot_data
+            return screenshot_data
             
-    except Exception as e:
-        error_messages.append(f"Screenshot error: {str(e)}")
-        return None
-    finally:
-        # Cleanup HTML file
-        if os.path.exists(html_path):
-            try:
-                os.unlink(html_path)
-            except Exception:
-                pass
+        except Exception as e:
+            error_messages.append(f"Screenshot error: {str(e)}")
+            return None
 
 def try_chrome_screenshot(html_path):
     """Try to take a screenshot using Chrome headless"""
@@ -191,7 +179,7 @@ def try_chrome_screenshot(html_path):
     if isinstance(chrome_cmd, str) and chrome_cmd.startswith('"'):
         cmd[0] = chrome_cmd
     
-    result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+    result = proc_runner.run(cmd, text=True, timeout=30)
     
     # Wait for screenshot to be saved
     time.sleep(2)
@@ -237,7 +225,7 @@ def try_firefox_screenshot(html_path):
     if isinstance(firefox_cmd, str) and firefox_cmd.startswith('"'):
         cmd[0] = firefox_cmd
     
-    result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+    result = proc_runner.run(cmd, text=True, timeout=30)
     
     # Wait for screenshot to be saved
     time.sleep(2)
@@ -265,7 +253,7 @@ def try_wkhtmltoimage(html_path):
         screenshot_path
     ]
     
-    result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+    result = proc_runner.run(cmd, text=True, timeout=30)
     
     # Read screenshot data
     if os.path.exists(screenshot_path):
@@ -339,24 +327,10 @@ def get_vision_description(image_data):
     }
     
     # Make the API call
-    cmd = [
-        'curl', '-X', 'POST', 
-        'https://llmfoundry.straive.com/openai/v1/chat/completions',
-        '-H', f'Authorization: Bearer {os.getenv("LLMFOUNDRY_TOKEN")}:my-test-project',
-        '-H', 'Content-Type: application/json',
-        '-d', json.dumps(payload)
-    ]
-    
-    result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
-    
-    if result.returncode == 0:
-        try:
-            response_data = json.loads(result.stdout)
-            return response_data['choices'][0]['message']['content']
-        except (json.JSONDecodeError, KeyError, IndexError):
-            return "Error parsing vision API response"
-    else:
-        return f"Vision API error: {result.stderr}"
+    try:
+        return judge_client.content_of(judge_client.chat(payload))
+    except judge_client.JudgeError as e:
+        return f"Vision API error: {e}"
 
 def check_for_house_chimney(description):
     """Check if the description indicates a house with chimney was drawn"""
@@ -384,23 +358,9 @@ def check_for_house_chimney(description):
     }
     
     # Make the API call
-    cmd = [
-        'curl', '-X', 'POST',
-        'https://llmfoundry.straive.com/openai/v1/chat/completions',
-        '-H', f'Authorization: Bearer {os.getenv("LLMFOUNDRY_TOKEN")}:my-test-project',
-        '-H', 'Content-Type: application/json',
-        '-d', json.dumps(payload)
-    ]
-    
-    result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-    
-    if result.returncode == 0:
-        try:
-            response_data = json.loads(result.stdout)
-            answer = response_data['choices'][0]['message']['content']
-            # Check if answer contains "es it does" (matching original substring check)
-            return "es it does" in answer
-        except (json.JSONDecodeError, KeyError, IndexError):
-            return False
-    else:
-        return False
\ No newline at end of file
+    try:
+        answer = judge_client.content_of(judge_client.chat(payload))
+    except judge_client.JudgeError:
+        return False
+    # Check if answer contains "es it does" (matching original substring check)
+    return "es it does" in answer
@@ -1,3 +1,6 @@
+import timings
+
+@timings.timed
 def check_automodel_response(response, context=None):
     """
     Test if the model can interpret vague questions and will respond with the answer I want, 
@@ -1,3 +1,6 @@
+import timings
+
+@timings.timed
 def assert_blocked_by_orb_explanation(response, context=None):
     """
     Test if the model knows what ERR_BLOCKED_BY_ORB means.
@@ -1,3 +1,6 @@
+import timings
+
+@timings.timed
 def assert_float_format(response, context=None):
     """
     Checks if the response contains the correct f-string format for 3 decimal places.
@@ -1,3 +1,6 @@
+import timings
+
+@timings.timed
 def assert_python_tilde_operator(response, context=None):
     """
     Check if the model correctly identifies the Python operator for tilde (~) symbol.
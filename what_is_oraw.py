@@ -1,3 +1,6 @@
+import timings
+
+@timings.timed
 def get_assert(response, context=None):
     """
     Evaluates if the response contains either '-o raw' or '-l ' substring.
@@ -1,3 +1,6 @@
+import timings
+
+@timings.timed
 def assert_slice_end_explanation(response, context=None):
     """
     Checks if the model's response contains '.stop' when explaining how to get the end of a slice.
@@ -1,3 +1,6 @@
+import timings
+
+@timings.timed
 def check_sbox_package(response, context=None):
     """
     Checks if the model knows what latex package to import for the Sbox environment.
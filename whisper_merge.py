@@ -1,9 +1,11 @@
 import re
-import subprocess
-import tempfile
-import os
 import ast
 
+import code_extract
+import python_sandbox
+import timings
+
+@timings.timed
 def evaluate_transcript_merge_function(response,context=None):
     """
     Evaluates if the LLM correctly implemented a merge function for transcript segments.
@@ -73,12 +75,9 @@ print(merge("[00:00:14.240 --> 00:00:14.420]   the\\n[00:00:14.420 --> 00:00:14.
 def extract_code(response):
     """Extract Python code from the LLM response"""
     # Try to extract code from markdown code blocks
-    pattern = r"```(?:python)?(.*?)```"
-    matches = re.findall(pattern, response, re.DOTALL)
-    
-    if matches:
-        # Return the content of the first code block
-        return matches[0].strip()
+    block = code_extract.find_block(response, "python")
+    if block is not None:
+        return block.code.strip()
     
     # If no code blocks, try to extract the function definition
     function_pattern = r"(def\s+merge\s*\(.*?\).*?)(?:\n\n|\Z)"
@@ -97,31 +96,14 @@ def extract_code(response):
 def run_python_code(code):
     """Run Python code and return the output"""
     try:
-        # Create a temporary file
-        with tempfile.NamedTemporaryFile(suffix='.py', delete=False) as temp_file:
-            temp_file_path = temp_file.name
-            temp_file.write(code.encode('utf-8'))
+        process = python_sandbox.run_code(code, timeout=10)
         
-        # Run the Python code
-        try:
-            process = subprocess.run(
-                ['python', temp_file_path],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            # Combine stdout and stderr for comprehensive output
-            output = process.stdout
-            if process.stderr:
-                output += "\nERROR: " + process.stderr
-                
-            return output
+        # Combine stdout and stderr for comprehensive output
+        output = process.stdout
+        if process.stderr:
+            output += "\nERROR: " + process.stderr
             
-        finally:
-            # Clean up the temporary file
-            if os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
+        return output
                 
     except Exception as e:
         return f"Error running Python code: {str(e)}"
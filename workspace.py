@@ -0,0 +1,327 @@
+import argparse
+import atexit
+import contextlib
+import os
+import queue
+import shutil
+import signal
+import tempfile
+import threading
+import time
+
+UID = os.getuid() if hasattr(os, "getuid") else 0
+MB = 1024 * 1024
+# Disk fallback, used when there is no RAM-backed filesystem or it is full
+DISK_ROOT = os.path.join(tempfile.gettempdir(), f"carlini-workspaces-{UID}")
+
+
+def _default_root():
+    if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+        return os.path.join("/dev/shm", f"carlini-workspaces-{UID}")
+    return DISK_ROOT
+
+
+ROOT = os.getenv("WORKSPACE_ROOT") or _default_root()
+QUOTA_BYTES = int(os.getenv("WORKSPACE_QUOTA_MB", 256)) * MB
+# Free space ROOT must keep after a new workspace's quota; otherwise it goes to DISK_ROOT
+RESERVE_BYTES = int(os.getenv("WORKSPACE_RESERVE_MB", 512)) * MB
+# How often live workspaces are measured against their quota
+WATCH_SECONDS = float(os.getenv("WORKSPACE_WATCH_SECONDS", 0.2))
+TRASH = ".trash"
+
+
+def tree_bytes(path):
+    """Bytes used by the regular files under path (symlinks are not followed)."""
+    total = 0
+    for directory, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(directory, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass
+    return True
+
+
+def _holders(path):
+    """Pids of the processes working in path or below it (found through /proc, so Linux only)."""
+    path = os.path.realpath(path)
+    pids = []
+    try:
+        names = os.listdir("/proc")
+    except OSError:
+        return pids
+    for name in names:
+        if not name.isdigit():
+            continue
+        try:
+            cwd = os.readlink(f"/proc/{name}/cwd")
+        except OSError:
+            continue
+        if cwd == path or cwd.startswith(path + os.sep):
+            pids.append(int(name))
+    return pids
+
+
+def _kill_holders(path):
+    """SIGKILL the process groups working in path, sparing this process and its own group."""
+    killed = set()
+    own_group = os.getpgrp()
+    for pid in _holders(path):
+        if pid == os.getpid():
+            continue
+        try:
+            group = os.getpgid(pid)
+            if group == own_group:
+                os.kill(pid, signal.SIGKILL)
+            elif group not in killed:
+                os.killpg(group, signal.SIGKILL)
+            killed.add(group)
+        except OSError:
+            pass
+    return len(killed)
+
+
+class Workspaces:
+    """
+    Per-job scratch directories under a RAM-backed root.
+
+    allocate() hands out a fresh directory under ROOT (tmpfs on /dev/shm when there
+    is one), falling back to DISK_ROOT when ROOT lacks room for the workspace's quota.
+    release() renames the directory into the root's trash and returns at once; a
+    background thread deletes trash in bulk. Another measures live workspaces every
+    WATCH_SECONDS and kills the processes working in one that outgrows its quota, so
+    a runaway job cannot fill the RAM behind ROOT.
+    Directories of processes that died without releasing them are swept on first use
+    and counted, with anything still allocated at exit, as leaked bytes.
+    """
+
+    def __init__(self, root=ROOT, disk_root=DISK_ROOT, quota=QUOTA_BYTES, reserve=RESERVE_BYTES):
+        self.roots = [root] if root == disk_root else [root, disk_root]
+        self.quota = quota
+        self.reserve = reserve
+        self.live = {}
+        self.lock = threading.Lock()
+        self.trash = queue.SimpleQueue()
+        self.pending = 0
+        self.idle = threading.Condition(self.lock)
+        self.busy = threading.Condition(self.lock)
+        self.enforced = set()
+        self.reclaimer_pid = None
+        self.counts = {"allocated": 0, "on_disk": 0, "released": 0, "reclaimed_bytes": 0,
+                       "over_quota": 0, "quota_kills": 0, "leaked": 0, "leaked_bytes": 0}
+
+    def _start_reclaimer(self):
+        # Threads do not survive fork, so every process starts its own
+        if self.reclaimer_pid == os.getpid():
+            return
+        self.reclaimer_pid = os.getpid()
+        self.trash = queue.SimpleQueue()
+        self.pending = 0
+        threading.Thread(target=self._reclaim_forever, name="workspace-reclaim", daemon=True).start()
+        threading.Thread(target=self._watch_forever, name="workspace-watch", daemon=True).start()
+
+    def _has_room(self, root, quota):
+        try:
+            st = os.statvfs(root)
+        except (AttributeError, OSError):
+            return True
+        with self.lock:
+            promised = sum(q for path, q in self.live.items() if path.startswith(root + os.sep))
+        return st.f_bavail * st.f_frsize - promised >= quota + self.reserve
+
+    def allocate(self, prefix="job", quota=None):
+        """Create and return a new, empty workspace directory."""
+        quota = self.quota if quota is None else quota
+        with self.lock:
+            self._start_reclaimer()
+        for root in self.roots:
+            os.makedirs(root, exist_ok=True)
+            if root == self.roots[-1] or self._has_room(root, quota):
+                break
+        path = tempfile.mkdtemp(prefix=f"{prefix}-{os.getpid()}-", dir=root)
+        with self.lock:
+            self.live[path] = quota
+            self.busy.notify_all()
+            self.counts["allocated"] += 1
+            if root != self.roots[0]:
+                self.counts["on_disk"] += 1
+        return path
+
+    def release(self, path):
+        """Hand a workspace back; it is deleted in the background."""
+        with self.lock:
+            quota = self.live.pop(path, None)
+            self.enforced.discard(path)
+            self.counts["released"] += 1
+            self.pending += 1
+        trash = os.path.join(os.path.dirname(path), TRASH)
+        try:
+            os.makedirs(trash, exist_ok=True)
+            target = os.path.join(trash, os.path.basename(path))
+            os.rename(path, target)
+        except OSError:
+            target = path  # already gone, or on a filesystem without rename: delete in place
+        self.trash.put((target, quota))
+
+    @contextlib.contextmanager
+    def workspace(self, prefix="job", quota=None):
+        """Context manager form of allocate()/release()."""
+        path = self.allocate(prefix, quota)
+        try:
+            yield path
+        finally:
+            self.release(path)
+
+    def _delete(self, path, quota):
+        size = tree_bytes(path)
+        shutil.rmtree(path, ignore_errors=True)
+        with self.lock:
+            self.counts["reclaimed_bytes"] += size
+            if quota is not None and size > quota:
+                self.counts["over_quota"] += 1
+
+    def _reclaim_forever(self):
+        for root in self.roots:
+            try:
+                self.sweep(root)
+            except OSError:
+                pass
+        while True:
+            batch = [self.trash.get()]
+            while True:
+                try:
+                    batch.append(self.trash.get_nowait())
+                except queue.Empty:
+                    break
+            for path, quota in batch:
+                self._reclaim(path, quota)
+
+    def _watch_forever(self):
+        while True:
+            with self.lock:
+                self.busy.wait_for(lambda: self.live)
+                live = [(path, quota) for path, quota in self.live.items() if path not in self.enforced]
+            for path, quota in live:
+                try:
+                    self.enforce(path, quota)
+                except Exception:
+                    pass  # watching is best effort; never kill the thread
+            time.sleep(WATCH_SECONDS)
+
+    def enforce(self, path, quota):
+        """
+        Kill the processes working in path if it holds more than quota bytes.
+
+        Returns the number of process groups killed. A workspace is only enforced
+        once; its files stay until it is released.
+        """
+        if quota is None or tree_bytes(path) <= quota:
+            return 0
+        killed = _kill_holders(path)
+        with self.lock:
+            if path not in self.live:
+                return killed
+            self.enforced.add(path)
+            self.counts["quota_kills"] += killed
+        return killed
+
+    def _reclaim(self, path, quota):
+        """Delete one released workspace taken off the trash queue."""
+        try:
+            self._delete(path, quota)
+        except Exception:
+            pass  # reclaiming is best effort; never kill the thread
+        finally:
+            with self.lock:
+                self.pending -= 1
+                self.idle.notify_all()
+
+    def drain(self, timeout=60):
+        """Delete everything released so far before returning, so stats() counts its bytes."""
+        while True:
+            try:
+                path, quota = self.trash.get_nowait()
+            except queue.Empty:
+                break
+            self._reclaim(path, quota)
+        with self.lock:
+            self.idle.wait_for(lambda: self.pending <= 0, timeout)
+
+    def _leaked(self, path):
+        size = tree_bytes(path)
+        shutil.rmtree(path, ignore_errors=True)
+        with self.lock:
+            self.counts["leaked"] += 1
+            self.counts["leaked_bytes"] += size
+        return size
+
+    def sweep(self, root):
+        """
+        Delete what dead processes left under root and return the leaked bytes.
+
+        Workspaces they never released count as leaked; trash they released but did
+        not get to delete before exiting is just deleted.
+        """
+        freed = 0
+        for directory in (root, os.path.join(root, TRASH)):
+            try:
+                names = os.listdir(directory)
+            except OSError:
+                continue
+            for name in names:
+                parts = name.split("-")
+                if len(parts) < 3 or not parts[-2].isdigit() or _pid_alive(int(parts[-2])):
+                    continue
+                if directory == root:
+                    freed += self._leaked(os.path.join(directory, name))
+                else:
+                    self._delete(os.path.join(directory, name), None)
+        return freed
+
+    def close(self):
+        """Delete everything this process still holds; unreleased workspaces count as leaked."""
+        if self.reclaimer_pid != os.getpid():
+            return
+        with self.lock:
+            leftover = list(self.live)
+            self.live.clear()
+        for path in leftover:
+            self._leaked(path)
+        self.drain(timeout=0)
+
+    def stats(self):
+        with self.lock:
+            return {**self.counts, "live": len(self.live), "roots": list(self.roots)}
+
+
+_default = Workspaces()
+allocate = _default.allocate
+release = _default.release
+workspace = _default.workspace
+drain = _default.drain
+stats = _default.stats
+atexit.register(_default.close)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report (and reclaim) grader workspaces leaked by dead processes")
+    parser.parse_args()
+    for root in _default.roots:
+        freed = _default.sweep(root)
+        print(f"{root}: {freed} bytes leaked by dead processes, now reclaimed")
+    counts = _default.stats()
+    print(f"{counts['leaked']} leaked workspaces, {counts['leaked_bytes']} bytes in total")
+
+
+if __name__ == "__main__":
+    main()